@@ -0,0 +1,185 @@
+"""Measure the memory cost of the member and message cache policies.
+
+Usage: python benchmarks/cache_memory.py [members] [messages]
+
+Each policy runs in a fresh process that builds a synthetic guild through
+discord.py's own parsing code: every member is delivered as if the guild had
+been chunked, then a stream of messages is parsed. The report shows the RSS
+growth per 10k members (and per 10k messages for the message cache) so the
+cheapest policy that still serves the bot's features can be picked.
+"""
+import asyncio
+import gc
+import multiprocessing
+import sys
+
+import discord
+import psutil
+from discord.guild import Guild
+from discord.member import Member
+from discord.state import ConnectionState
+
+MEMBER_POLICIES = {
+    'all': discord.MemberCacheFlags.all,
+    'voice': lambda: discord.MemberCacheFlags(voice=True, joined=False),
+    'none': discord.MemberCacheFlags.none
+}
+
+MESSAGE_POLICIES = {
+    'default (1000)': 1000,
+    '5000': 5000,
+    'disabled': None
+}
+
+GUILD_ID = 1 << 40
+CHANNEL_ID = GUILD_ID + 1
+
+
+def member_payload(index):
+    return {
+        'user': {
+            'id': str((1 << 50) + index),
+            'username': f'member{index}',
+            'discriminator': '0',
+            'global_name': f'Member {index}',
+            'avatar': None
+        },
+        'roles': [],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'nick': None,
+        'deaf': False,
+        'mute': False,
+        'flags': 0
+    }
+
+
+def message_payload(index, members):
+    member = member_payload(index % members)
+    return {
+        'id': str((1 << 55) + index),
+        'channel_id': str(CHANNEL_ID),
+        'guild_id': str(GUILD_ID),
+        'author': member.pop('user'),
+        'member': member,
+        'content': f'!8ball will this benchmark finish soon? #{index}',
+        'timestamp': '2024-01-01T00:00:00+00:00',
+        'edited_timestamp': None,
+        'tts': False,
+        'mention_everyone': False,
+        'mentions': [],
+        'mention_roles': [],
+        'attachments': [],
+        'embeds': [],
+        'pinned': False,
+        'type': 0
+    }
+
+
+def guild_payload(members):
+    return {
+        'id': str(GUILD_ID),
+        'name': 'Benchmark Guild',
+        'member_count': members,
+        'roles': [{
+            'id': str(GUILD_ID), 'name': '@everyone', 'permissions': '0', 'position': 0,
+            'color': 0, 'hoist': False, 'managed': False, 'mentionable': False
+        }],
+        'channels': [{
+            'id': str(CHANNEL_ID), 'type': 0, 'name': 'general', 'position': 0, 'permission_overwrites': []
+        }],
+        'members': []
+    }
+
+
+def rss():
+    return psutil.Process().memory_info().rss
+
+
+async def build(member_flags, max_messages, members, messages, result):
+    intents = discord.Intents.default()
+    intents.members = True
+    intents.message_content = True
+    state = ConnectionState(
+        dispatch=lambda *args: None,
+        handlers={},
+        hooks={},
+        http=None,
+        intents=intents,
+        member_cache_flags=member_flags,
+        max_messages=max_messages
+    )
+    # ConnectionState only creates the message cache on READY
+    state.clear()
+
+    guild = Guild(data=guild_payload(members), state=state)
+    state._add_guild(guild)
+
+    # Deliver members in 1000-member chunks, caching them the way discord.py's
+    # chunk requests do, so transient payloads stay small
+    before = rss()
+    for start in range(0, members, 1000):
+        chunk = [member_payload(index) for index in range(start, min(start + 1000, members))]
+        for data in chunk:
+            member = Member(data=data, guild=guild, state=state)
+            if state.member_cache_flags.joined:
+                guild._add_member(member)
+    gc.collect()
+    result['members'] = rss() - before
+    result['cached_members'] = len(guild.members)
+
+    before = rss()
+    for index in range(messages):
+        state.parse_message_create(message_payload(index, members))
+    gc.collect()
+    result['messages'] = rss() - before
+    result['cached_messages'] = len(state._messages) if state._messages is not None else 0
+
+
+def worker(member_policy, message_policy, members, messages, queue):
+    result = {}
+    asyncio.run(build(
+        MEMBER_POLICIES[member_policy](),
+        MESSAGE_POLICIES[message_policy],
+        members,
+        messages,
+        result
+    ))
+    queue.put(result)
+
+
+def measure(member_policy, message_policy, members, messages):
+    queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=worker, args=(member_policy, message_policy, members, messages, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def main():
+    members = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    messages = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    mb = 1024 * 1024
+
+    print(f"Member cache ({members} members delivered)")
+    print(f"{'policy':<16} {'cached':>8} {'RSS':>9} {'per 10k':>9}")
+    for policy in MEMBER_POLICIES:
+        result = measure(policy, 'disabled', members, 0)
+        print(
+            f"{policy:<16} {result['cached_members']:>8} {result['members'] / mb:>7.1f}MB "
+            f"{result['members'] / mb * 10000 / members:>7.2f}MB"
+        )
+
+    print()
+    print(f"Message cache ({messages} messages delivered, member cache 'none')")
+    print(f"{'policy':<16} {'cached':>8} {'RSS':>9} {'per 10k':>9}")
+    for policy in MESSAGE_POLICIES:
+        result = measure('none', policy, 1000, messages)
+        print(
+            f"{policy:<16} {result['cached_messages']:>8} {result['messages'] / mb:>7.1f}MB "
+            f"{result['messages'] / mb * 10000 / messages:>7.2f}MB"
+        )
+
+
+if __name__ == '__main__':
+    main()
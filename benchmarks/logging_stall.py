@@ -0,0 +1,120 @@
+"""Measure event-loop stalls caused by logging, with and without the queue.
+
+Usage: python benchmarks/logging_stall.py [records_per_burst] [bursts] [write_ms]
+
+A ticker coroutine wakes up every millisecond and records how late it was
+while another coroutine emits bursts of structured log records. The log
+file's flush is slowed down by ``write_ms`` per record (default 1ms), the
+latency of a busy disk or network volume, so the measurement is dominated
+by handler I/O rather than by creating the records. The report compares
+direct file/stream handlers with the queue-based pipeline, including how
+long each ``logger.info`` call held the loop.
+"""
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logs import setup_logging
+
+TICK = 0.001
+
+
+def slow_down(handler, write_ms):
+    """Make every flush of a file handler take ``write_ms`` longer."""
+    flush = handler.flush
+    
+    def slow_flush():
+        flush()
+        time.sleep(write_ms / 1000)
+    
+    handler.flush = slow_flush
+
+
+async def measure(records_per_burst, bursts):
+    logger = logging.getLogger('benchmark')
+    lags = []
+    emits = []
+    done = asyncio.Event()
+    
+    async def ticker():
+        while not done.is_set():
+            expected = time.perf_counter() + TICK
+            await asyncio.sleep(TICK)
+            lags.append(max(0.0, time.perf_counter() - expected))
+    
+    async def producer():
+        for burst in range(bursts):
+            for i in range(records_per_burst):
+                emit_start = time.perf_counter()
+                logger.info(
+                    f"Command ping completed ({burst}/{i})",
+                    extra={'guild_id': 1234, 'command': 'ping', 'latency_ms': 12.5}
+                )
+                emits.append(time.perf_counter() - emit_start)
+            await asyncio.sleep(TICK)
+        done.set()
+    
+    start = time.perf_counter()
+    await asyncio.gather(ticker(), producer())
+    elapsed = time.perf_counter() - start
+    
+    lags.sort()
+    emits.sort()
+    return {
+        'elapsed': elapsed,
+        'max': lags[-1],
+        'p99': lags[int(len(lags) * 0.99) - 1],
+        'mean': statistics.fmean(lags),
+        'emit_p99': emits[int(len(emits) * 0.99) - 1]
+    }
+
+
+def run(mode, records_per_burst, bursts, write_ms, directory):
+    stderr = sys.stderr
+    sys.stderr = open(os.devnull, 'w')  # Keep the stream handler's output out of the report
+    try:
+        listener = setup_logging(
+            log_file=os.path.join(directory, f'{mode}.log'),
+            json_format=True,
+            use_queue=(mode == 'queue')
+        )
+        handlers = listener.handlers if listener is not None else logging.getLogger().handlers
+        for handler in handlers:
+            if isinstance(handler, logging.FileHandler):
+                slow_down(handler, write_ms)
+        result = asyncio.run(measure(records_per_burst, bursts))
+        if listener is not None:
+            listener.stop()
+    finally:
+        for handler in list(logging.getLogger().handlers):
+            handler.close()
+            logging.getLogger().removeHandler(handler)
+        sys.stderr.close()
+        sys.stderr = stderr
+    return result
+
+
+def main():
+    records_per_burst = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bursts = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    write_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 1.0
+    
+    with tempfile.TemporaryDirectory() as directory:
+        print(f"{records_per_burst} records x {bursts} bursts, {write_ms:g}ms per file write")
+        print(f"{'mode':<8} {'elapsed':>9} {'max stall':>10} {'p99 stall':>10} {'mean lag':>9} {'p99 emit':>9}")
+        for mode in ('direct', 'queue'):
+            result = run(mode, records_per_burst, bursts, write_ms, directory)
+            print(
+                f"{mode:<8} {result['elapsed']:>8.2f}s {result['max'] * 1000:>8.2f}ms "
+                f"{result['p99'] * 1000:>8.2f}ms {result['mean'] * 1000:>7.2f}ms {result['emit_p99'] * 1000:>7.3f}ms"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,512 @@
+"""Replay synthetic traffic against the bot through a fake gateway and REST API.
+
+Usage: python benchmarks/replay.py [--scenarios joins,clicks,storms,selects,mute,8ball,clear] [--events 200] [--rate 50]
+
+A local aiohttp server plays both Discord's gateway (HELLO, READY, one
+GUILD_CREATE, then the replayed dispatches) and its REST API (canned
+responses for the routes the cogs use). The real DiscordBot connects to it
+with all of its extensions loaded, and each scenario sends ``--events``
+events at ``--rate`` per second:
+
+- joins:  GUILD_MEMBER_ADD waves, answered by the welcome message
+- clicks: role button clicks on the persistent role menu
+- storms: bursts of three role button clicks by one member
+- selects: multi-role choices from the role select menus
+- mute:   !mute of distinct members by moderators
+- 8ball:  !8ball spam from distinct members
+- clear:  !clear 20 in distinct channels
+
+An event counts as handled when the bot sends the message or interaction
+response it causes. The report shows throughput, p50/p99 latency from the
+gateway send to that request, REST requests per event and the process RSS.
+The fake server shares the bot's process and event loop, so compare numbers
+between runs on the same machine rather than with production.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+
+import psutil
+from aiohttp import web
+
+# Configure the bot before it is imported: throwaway state, no metrics server,
+# and a gateway URL from the fake REST API (only used when SHARD_COUNT is unset)
+STATE_DIR = tempfile.mkdtemp(prefix='bot-replay-')
+os.environ['DATABASE_PATH'] = os.path.join(STATE_DIR, 'bot.db')
+os.environ['LOG_FILE'] = os.path.join(STATE_DIR, 'bot.log')
+os.environ['METRICS_ENABLED'] = 'false'
+os.environ['COMMAND_SYNC'] = 'off'
+os.environ.pop('SHARD_COUNT', None)
+os.environ.pop('SHARD_IDS', None)
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import discord
+import bot as bot_module
+from config import Config
+from utils.role_cache import role_custom_id
+
+DISCORD_EPOCH = 1420070400000
+GUILD_ID = 1 << 50
+BOT_ID = GUILD_ID + 1
+EVERYONE_PERMISSIONS = (1 << 10) | (1 << 11) | (1 << 14) | (1 << 16)  # View, send, embed links, history
+ADMINISTRATOR = 1 << 3
+
+SCENARIOS = ('joins', 'clicks', 'storms', 'selects', 'mute', '8ball', 'clear')
+
+
+class Snowflakes:
+    """Unique snowflakes carrying the current time, as Discord's do."""
+
+    def __init__(self):
+        self.counter = 0
+
+    def next(self):
+        self.counter += 1
+        return ((int(time.time() * 1000) - DISCORD_EPOCH) << 22) + (self.counter & 0x3fffff)
+
+
+def user_payload(user_id, name, bot=False):
+    return {'id': str(user_id), 'username': name, 'discriminator': '0', 'global_name': name, 'avatar': None, 'bot': bot}
+
+
+def member_payload(user_id, name, roles=(), bot=False):
+    return {
+        'user': user_payload(user_id, name, bot),
+        'roles': [str(role_id) for role_id in roles],
+        'joined_at': '2024-01-01T00:00:00+00:00',
+        'nick': None,
+        'deaf': False,
+        'mute': False,
+        'flags': 0
+    }
+
+
+def role_payload(role_id, name, position, permissions=0):
+    return {
+        'id': str(role_id), 'name': name, 'permissions': str(permissions), 'position': position,
+        'color': 0, 'hoist': False, 'managed': False, 'mentionable': False
+    }
+
+
+def channel_payload(channel_id, name, position):
+    return {'id': str(channel_id), 'type': 0, 'name': name, 'position': position, 'permission_overwrites': []}
+
+
+class Guild:
+    """The synthetic guild: moderators, regular members, role menu roles and channels."""
+
+    def __init__(self, snowflakes, members, channels):
+        self.snowflakes = snowflakes
+        self.moderator_role = snowflakes.next()
+        self.menu_roles = {}  # custom_id -> role id
+        self.general = snowflakes.next()
+        self.channels = [snowflakes.next() for _ in range(channels)]
+        self.moderators = [snowflakes.next() for _ in range(members)]
+        self.members = [snowflakes.next() for _ in range(members)]
+        self.panel_message = snowflakes.next()
+        for category in Config.ROLE_CATEGORIES.values():
+            for role_name in category['roles']:
+                self.menu_roles[role_custom_id(role_name)] = snowflakes.next()
+
+    def payload(self):
+        roles = [
+            role_payload(GUILD_ID, '@everyone', 0, EVERYONE_PERMISSIONS),
+            role_payload(self.moderator_role, 'Moderator', 2, ADMINISTRATOR)
+        ]
+        for category in Config.ROLE_CATEGORIES.values():
+            for role_name in category['roles']:
+                roles.append(role_payload(self.menu_roles[role_custom_id(role_name)], role_name, 1))
+
+        members = [member_payload(BOT_ID, 'Replay Bot', [self.moderator_role], bot=True)]
+        members.extend(member_payload(user_id, f'mod{index}', [self.moderator_role]) for index, user_id in enumerate(self.moderators))
+        members.extend(member_payload(user_id, f'member{index}') for index, user_id in enumerate(self.members))
+
+        channels = [channel_payload(self.general, 'general', 0)]
+        channels.extend(channel_payload(channel_id, f'clear-{index}', index + 1) for index, channel_id in enumerate(self.channels))
+
+        return {
+            'id': str(GUILD_ID),
+            'name': 'Replay Guild',
+            'owner_id': str(self.moderators[0]),
+            'member_count': len(members),
+            'large': False,
+            'unavailable': False,
+            'features': [],
+            'emojis': [],
+            'stickers': [],
+            'roles': roles,
+            'channels': channels,
+            'threads': [],
+            'members': members,
+            'presences': [],
+            'voice_states': [],
+            'stage_instances': [],
+            'guild_scheduled_events': []
+        }
+
+    def message(self, channel_id, author_id, name, content, roles=()):
+        member = member_payload(author_id, name, roles)
+        return {
+            'id': str(self.snowflakes.next()),
+            'channel_id': str(channel_id),
+            'guild_id': str(GUILD_ID),
+            'author': member.pop('user'),
+            'member': member,
+            'content': content,
+            'timestamp': discord.utils.utcnow().isoformat(),
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': [],
+            'pinned': False,
+            'type': 0
+        }
+
+
+def component_interaction(guild, index, component):
+    """A member's component interaction on the role panel, keyed by its interaction id."""
+    interaction_id = guild.snowflakes.next()
+    user_id = guild.members[index % len(guild.members)]
+    panel = guild.message(guild.general, BOT_ID, 'Replay Bot', '')
+    panel['id'] = str(guild.panel_message)
+    data = {
+        'id': str(interaction_id),
+        'application_id': str(BOT_ID),
+        'type': 3,
+        'token': f'token{interaction_id}',
+        'version': 1,
+        'guild_id': str(GUILD_ID),
+        'channel_id': str(guild.general),
+        'member': member_payload(user_id, f'member{index % len(guild.members)}'),
+        'data': component,
+        'message': panel,
+        'locale': 'en-US'
+    }
+    return str(interaction_id), [('INTERACTION_CREATE', data)]
+
+
+def build_event(scenario, index, guild):
+    """Return ``(token, dispatches)``; the token appears in the request that answers the event."""
+    if scenario == 'joins':
+        user_id = guild.snowflakes.next()
+        data = member_payload(user_id, f'newcomer{index}')
+        data['guild_id'] = str(GUILD_ID)
+        return str(user_id), [('GUILD_MEMBER_ADD', data)]
+
+    if scenario == 'clicks':
+        custom_ids = list(guild.menu_roles)
+        return component_interaction(guild, index, {'custom_id': custom_ids[index % len(custom_ids)], 'component_type': 2})
+
+    if scenario == 'storms':
+        # Answered once, by the response to the last click
+        custom_ids = list(guild.menu_roles)
+        dispatches = []
+        for offset in range(3):
+            custom_id = custom_ids[(index + offset) % len(custom_ids)]
+            token, burst = component_interaction(guild, index, {'custom_id': custom_id, 'component_type': 2})
+            dispatches.extend(burst)
+        return token, dispatches
+
+    if scenario == 'selects':
+        # Alternate between categories, picking a rotating half of their roles
+        categories = [
+            (category_id, category) for category_id, category in Config.ROLE_CATEGORIES.items()
+            if category.get('mode') == 'select'
+        ]
+        if not categories:
+            raise ValueError("No role category uses the select mode")
+        category_id, category = categories[index % len(categories)]
+        roles = category['roles']
+        picked = 1 if category.get('exclusive') else max(1, len(roles) // 2)
+        values = [role_custom_id(roles[(index + offset) % len(roles)]) for offset in range(picked)]
+        return component_interaction(guild, index, {'custom_id': f'select_{category_id}', 'component_type': 3, 'values': values})
+
+    moderator = index % len(guild.moderators)
+    if scenario == 'mute':
+        target = guild.members[index % len(guild.members)]
+        content = f'{Config.BOT_PREFIX}mute <@{target}> 10m'
+        message = guild.message(guild.general, guild.moderators[moderator], f'mod{moderator}', content, [guild.moderator_role])
+        return str(target), [('MESSAGE_CREATE', message)]
+
+    if scenario == '8ball':
+        user_id = guild.members[index % len(guild.members)]
+        token = f'replay-{index}-{guild.snowflakes.next()}'
+        content = f'{Config.BOT_PREFIX}8ball will {token} pass?'
+        message = guild.message(guild.general, user_id, f'member{index % len(guild.members)}', content)
+        return token, [('MESSAGE_CREATE', message)]
+
+    if scenario == 'clear':
+        channel_id = guild.channels[index % len(guild.channels)]
+        content = f'{Config.BOT_PREFIX}clear 20'
+        message = guild.message(channel_id, guild.moderators[moderator], f'mod{moderator}', content, [guild.moderator_role])
+        return str(channel_id), [('MESSAGE_CREATE', message)]
+
+    raise ValueError(f"Unknown scenario {scenario}")
+
+
+def json_response(data):
+    # discord.py only decodes bodies whose content type is exactly application/json
+    return web.Response(body=json.dumps(data).encode(), headers={'Content-Type': 'application/json'})
+
+
+class FakeDiscord:
+    """Fake gateway and REST API on one local port."""
+
+    def __init__(self, guild, snowflakes):
+        self.guild = guild
+        self.snowflakes = snowflakes
+        self.ws = None
+        self.sequence = 0
+        self.ready = asyncio.Event()
+        self.requests = 0
+        self.expected = {}   # token -> send time
+        self.latencies = []
+        self.last_done = 0.0
+        self.last_request = 0.0
+        self._runner = None
+        self.port = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get('/gateway', self.gateway)
+        app.router.add_route('*', '/api/v10/{path:.*}', self.rest)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+        await self._runner.cleanup()
+
+    @property
+    def api_base(self):
+        return f'http://127.0.0.1:{self.port}/api/v10'
+
+    # Gateway
+
+    async def send(self, op, data, event=None):
+        payload = {'op': op, 'd': data, 's': None, 't': event}
+        if event is not None:
+            self.sequence += 1
+            payload['s'] = self.sequence
+        await self.ws.send_str(json.dumps(payload))
+
+    async def dispatch(self, event, data):
+        await self.send(0, data, event)
+
+    async def gateway(self, request):
+        self.ws = web.WebSocketResponse()
+        await self.ws.prepare(request)
+        await self.send(10, {'heartbeat_interval': 41250})
+        async for message in self.ws:
+            payload = json.loads(message.data)
+            if payload['op'] == 1:
+                await self.send(11, None)
+            elif payload['op'] == 2:
+                await self.dispatch('READY', {
+                    'v': 10,
+                    'user': user_payload(BOT_ID, 'Replay Bot', bot=True),
+                    'guilds': [{'id': str(GUILD_ID), 'unavailable': True}],
+                    'session_id': 'replay',
+                    'resume_gateway_url': f'ws://127.0.0.1:{self.port}/gateway',
+                    'shard': [0, 1],
+                    'application': {'id': str(BOT_ID), 'flags': 0}
+                })
+                await self.dispatch('GUILD_CREATE', self.guild.payload())
+                self.ready.set()
+        return self.ws
+
+    # REST
+
+    def expect(self, token):
+        self.expected[token] = time.perf_counter()
+
+    def check_done(self, method, path, body):
+        if method != 'POST' or not (path.endswith('/messages') or path.endswith('/callback')):
+            return
+        now = time.perf_counter()
+        for token in [token for token in self.expected if token in path or token in body]:
+            self.latencies.append(now - self.expected.pop(token))
+            self.last_done = now
+
+    def message(self, channel_id, data):
+        return {
+            'id': str(self.snowflakes.next()),
+            'channel_id': channel_id,
+            'guild_id': str(GUILD_ID),
+            'author': user_payload(BOT_ID, 'Replay Bot', bot=True),
+            'content': data.get('content') or '',
+            'timestamp': discord.utils.utcnow().isoformat(),
+            'edited_timestamp': None,
+            'tts': False,
+            'mention_everyone': False,
+            'mentions': [],
+            'mention_roles': [],
+            'attachments': [],
+            'embeds': data.get('embeds') or [],
+            'pinned': False,
+            'type': 0
+        }
+
+    async def rest(self, request):
+        self.requests += 1
+        self.last_request = time.perf_counter()
+        method = request.method
+        path = '/' + request.match_info['path']
+        body = await request.text() if request.can_read_body else ''
+        self.check_done(method, path, body)
+
+        parts = path.strip('/').split('/')
+        if path == '/users/@me':
+            return json_response(user_payload(BOT_ID, 'Replay Bot', bot=True))
+        if path == '/oauth2/applications/@me':
+            return json_response({
+                'id': str(BOT_ID), 'name': 'Replay Bot', 'description': '', 'icon': None,
+                'bot_public': False, 'bot_require_code_grant': False, 'verify_key': '', 'flags': 0,
+                'owner': user_payload(self.guild.moderators[0], 'mod0')
+            })
+        if path == '/gateway/bot':
+            return json_response({
+                'url': f'ws://127.0.0.1:{self.port}/gateway',
+                'shards': 1,
+                'session_start_limit': {'total': 1000, 'remaining': 1000, 'reset_after': 0, 'max_concurrency': 1}
+            })
+        if parts[0] == 'channels' and parts[2:] == ['messages']:
+            if method == 'GET':
+                # History for purges: recent messages by a regular member
+                limit = int(request.query.get('limit', 50))
+                author = self.guild.members[0]
+                return json_response([
+                    self.guild.message(parts[1], author, 'member0', 'filler') for _ in range(limit)
+                ])
+            data = json.loads(body) if body.startswith('{') else {}
+            return json_response(self.message(parts[1], data))
+        if parts[0] == 'channels' and len(parts) == 4 and parts[2] == 'messages' and method == 'PATCH':
+            data = json.loads(body) if body.startswith('{') else {}
+            return json_response(self.message(parts[1], data) | {'id': parts[3]})
+        if parts[0] == 'guilds' and len(parts) == 4 and parts[2] == 'members' and method == 'PATCH':
+            data = member_payload(int(parts[3]), 'member')
+            data.update(json.loads(body) if body.startswith('{') else {})
+            return json_response(data)
+        return web.Response(status=204)
+
+
+def quiet_console():
+    """Keep the bot's console log output to errors so the report stays readable."""
+    handlers = list(logging.getLogger().handlers)
+    if bot_module.log_listener is not None:
+        handlers.extend(bot_module.log_listener.handlers)
+    for handler in handlers:
+        if type(handler) is logging.StreamHandler:
+            handler.setLevel(logging.ERROR)
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def replay(server, guild, scenario, events, rate, timeout, quiet):
+    server.requests = 0
+    server.latencies = []
+    server.expected = {}
+
+    start = time.perf_counter()
+    for index in range(events):
+        token, dispatches = build_event(scenario, index, guild)
+        server.expect(token)
+        for event, data in dispatches:
+            await server.dispatch(event, data)
+        delay = start + (index + 1) / rate - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    # Wait for every answer, then for trailing requests to stop
+    deadline = time.perf_counter() + timeout
+    while server.expected and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+    while time.perf_counter() - server.last_request < quiet and time.perf_counter() < deadline:
+        await asyncio.sleep(0.05)
+
+    latencies = sorted(server.latencies)
+    elapsed = (server.last_done - start) if latencies else 0.0
+    return {
+        'done': len(latencies),
+        'throughput': len(latencies) / elapsed if elapsed > 0 else 0.0,
+        'p50': percentile(latencies, 0.5) if latencies else float('nan'),
+        'p99': percentile(latencies, 0.99) if latencies else float('nan'),
+        'rest_per_event': server.requests / events,
+        'rss': psutil.Process().memory_info().rss
+    }
+
+
+async def run(args):
+    snowflakes = Snowflakes()
+    guild = Guild(snowflakes, members=max(args.events, 500), channels=args.events)
+    server = FakeDiscord(guild, snowflakes)
+    await server.start()
+    discord.http.Route.BASE = server.api_base
+
+    quiet_console()
+    client = bot_module.DiscordBot()
+    client._connection.guild_ready_timeout = 0.1
+    runner = asyncio.create_task(client.start('replay-token'))
+    try:
+        ready = asyncio.create_task(client.wait_until_ready())
+        await asyncio.wait([ready, runner], timeout=30, return_when=asyncio.FIRST_COMPLETED)
+        if runner.done():
+            runner.result()  # Raise the startup error
+        if not ready.done():
+            raise RuntimeError("The bot did not become ready")
+        await asyncio.sleep(0.5)  # Let on_ready finish
+
+        mb = 1024 * 1024
+        print(f"{args.events} events per scenario at {args.rate:g}/s, guild of {len(guild.members) * 2} members")
+        print(f"Baseline RSS {psutil.Process().memory_info().rss / mb:.1f}MB")
+        print(f"{'scenario':<8} {'done':>6} {'events/s':>9} {'p50':>9} {'p99':>9} {'REST/event':>11} {'RSS':>9}")
+        for scenario in args.scenarios:
+            result = await replay(server, guild, scenario, args.events, args.rate, args.timeout, args.quiet)
+            print(
+                f"{scenario:<8} {result['done']:>6} {result['throughput']:>9.1f} "
+                f"{result['p50'] * 1000:>7.1f}ms {result['p99'] * 1000:>7.1f}ms "
+                f"{result['rest_per_event']:>11.2f} {result['rss'] / mb:>7.1f}MB"
+            )
+    finally:
+        await client.close()
+        runner.cancel()
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay synthetic Discord traffic against the bot.")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"comma-separated scenarios (default: {','.join(SCENARIOS)})")
+    parser.add_argument('--events', type=int, default=200, help="events per scenario (default: 200)")
+    parser.add_argument('--rate', type=float, default=50, help="events sent per second (default: 50)")
+    parser.add_argument('--timeout', type=float, default=Config.WELCOME_BATCH_WINDOW + 30, help="seconds to wait for answers after the last event")
+    parser.add_argument('--quiet', type=float, default=1.0, help="seconds without REST requests that end a scenario (default: 1)")
+    args = parser.parse_args()
+    args.scenarios = [scenario.strip() for scenario in args.scenarios.split(',') if scenario.strip()]
+    for scenario in args.scenarios:
+        if scenario not in SCENARIOS:
+            parser.error(f"unknown scenario {scenario!r}")
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        if bot_module.log_listener is not None:
+            bot_module.log_listener.stop()
+
+
+if __name__ == '__main__':
+    main()
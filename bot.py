@@ -1,118 +1,282 @@
+import time
+
+# Reference point for the startup report, taken before the heavy imports
+STARTED = time.perf_counter()
+
+import aiohttp
 import discord
 from discord.ext import commands
 import asyncio
 import logging
 from config import Config
+from utils.command_sync import CommandTreeSync
+from utils.cooldowns import CooldownManager
+from utils.database import Database
+from utils.embeds import EmbedTemplates
+from utils.errors import ErrorReporter
+from utils.logs import setup_logging
+from utils.metrics import BotMetrics, MetricsServer
+from utils.profiling import Profiler
+from utils.reloader import ExtensionReloader
+from utils.role_cache import RoleCache
+from utils.scheduler import TimerScheduler
+from utils.settings import GuildSettings
+from utils.startup import StartupReport, load_extensions
+from utils.system_stats import SystemStatsSampler
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('bot.log'),
-        logging.StreamHandler()
-    ]
+# Set up logging (queue-based by default so log calls never block the event loop)
+log_listener = setup_logging(
+    log_file=Config.LOG_FILE,
+    json_format=Config.LOG_JSON,
+    use_queue=Config.LOG_QUEUE,
+    max_bytes=Config.LOG_MAX_BYTES,
+    backup_count=Config.LOG_BACKUP_COUNT,
+    rotate_when=Config.LOG_ROTATE_WHEN
 )
 logger = logging.getLogger(__name__)
 
-class DiscordBot(commands.Bot):
-    """Main Discord bot class."""
+# Member cache policies selectable through Config.MEMBER_CACHE
+MEMBER_CACHE_POLICIES = {
+    'all': discord.MemberCacheFlags.all,
+    'voice': lambda: discord.MemberCacheFlags(voice=True, joined=False),
+    'none': discord.MemberCacheFlags.none
+}
+
+class DiscordBot(commands.AutoShardedBot):
+    """Main Discord bot class.
     
-    def __init__(self):
+    Runs every shard of ``shard_ids`` in this process. With no shard
+    arguments Discord's recommended shard count is used and all shards run
+    here; cluster.py starts several processes with disjoint shard ranges.
+    """
+    
+    def __init__(self, shard_ids=None, shard_count=None, cluster_id=None):
         intents = discord.Intents.default()
-        intents.message_content = True
+        # Prefix commands need message content; slash commands and mention-prefixed commands work without it
+        intents.message_content = Config.MESSAGE_CONTENT_INTENT
         intents.members = True
         intents.guilds = True
         
+        # Created first so their trace hooks see every REST request
+        self.metrics = BotMetrics(self)
+        self.profiler = Profiler(Config.SLOW_COMMAND_THRESHOLD)
+        http_trace = aiohttp.TraceConfig()
+        self.metrics.attach_trace(http_trace)
+        self.profiler.attach_trace(http_trace)
+        
         super().__init__(
-            command_prefix=Config.BOT_PREFIX,
+            command_prefix=commands.when_mentioned_or(Config.BOT_PREFIX),
             intents=intents,
-            help_command=None
+            help_command=None,
+            shard_ids=shard_ids,
+            shard_count=shard_count,
+            member_cache_flags=MEMBER_CACHE_POLICIES[Config.MEMBER_CACHE](),
+            chunk_guilds_at_startup=Config.CHUNK_GUILDS_AT_STARTUP,
+            max_messages=Config.MAX_MESSAGES or None,
+            http_trace=http_trace
         )
         
+        # Time every command, prefix and slash; slow ones are logged with a REST/CPU breakdown
+        self.before_invoke(self.before_command)
+        self.after_invoke(self.profiler.after_command)
+        
+        self.cluster_id = cluster_id
+        
         self.config = Config()
-        self.initial_extensions = [
-            'cogs.general',
-            'cogs.admin',
-            'cogs.fun',
-            'cogs.events',
-            'cogs.roles'
-        ]
+        self.role_cache = RoleCache()
+        self.embeds = EmbedTemplates()
+        self.errors = ErrorReporter(Config.ERROR_REPLY_WINDOW, Config.ERROR_TRACE_SAMPLE_RATE)
+        self.db = Database(Config.DATABASE_PATH)
+        self.settings = GuildSettings(self.db)
+        self.timers = TimerScheduler(self, self.db)
+        self.command_sync = CommandTreeSync(self, self.db)
+        self.metrics_server = None
+        self.stats = SystemStatsSampler(self, Config.STATS_INTERVAL, Config.STATS_HISTORY)
+        self.cooldowns = CooldownManager(self, Config.COOLDOWN_BACKEND, Config.COOLDOWN_REDIS_URL, Config.COOLDOWN_EXPIRE_INTERVAL)
+        self.startup = StartupReport(STARTED)
+        self.reloader = ExtensionReloader(self, Config.COG_RELOAD_INTERVAL)
+        # Extension -> extensions it needs loaded first; independent ones load concurrently
+        self.initial_extensions = {
+            'cogs.general': (),
+            'cogs.admin': (),
+            'cogs.fun': (),
+            'cogs.events': (),
+            'cogs.roles': ()
+        }
+    
+    def owns_guild(self, guild_id):
+        """Check whether a guild is served by one of this process's shards."""
+        if self.shard_ids is None or not self.shard_count:
+            return True
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
     
     async def setup_hook(self):
         """Set up the bot when it starts."""
         logger.info("Setting up bot...")
+        start = time.perf_counter()
+        
+        # Load persistent state (settings, pending mute expiries, cooldowns) before any cog needs it
+        await self.db.open()
+        await self.settings.load()
+        await self.timers.start()
+        await self.cooldowns.start()
+        self.stats.start()
         
-        # Load all extensions
-        for extension in self.initial_extensions:
+        if Config.METRICS_ENABLED:
+            # Each cluster process serves on its own port
+            port = Config.METRICS_PORT + (self.cluster_id or 0)
+            self.metrics_server = MetricsServer(self.metrics.registry, Config.METRICS_HOST, port)
             try:
-                await self.load_extension(extension)
-                logger.info(f"Loaded extension: {extension}")
-            except Exception as e:
-                logger.error(f"Failed to load extension {extension}: {e}")
+                await self.metrics_server.start()
+            except OSError as e:
+                logger.error(f"Failed to start metrics server on port {port}: {e}")
+                self.metrics_server = None
         
-        logger.info("Bot setup complete!")
+        await load_extensions(self, self.initial_extensions, self.startup)
+        self.reloader.snapshot()
+        if Config.COG_AUTO_RELOAD:
+            self.reloader.start_watching()
+        
+        # Register persistent views once so their buttons survive restarts
+        for cog in self.cogs.values():
+            for view in getattr(cog, 'persistent_views', []):
+                self.add_view(view)
+        
+        await self.sync_app_commands()
+        
+        self.startup.setup_hook = time.perf_counter() - start
+        logger.info(f"Bot setup complete in {self.startup.setup_hook:.2f}s")
+    
+    async def sync_app_commands(self):
+        """Sync slash commands with Discord if they changed since the last sync."""
+        # One process syncs for the whole bot
+        if Config.COMMAND_SYNC == 'off' or self.cluster_id not in (None, 0):
+            return
+        
+        guild = None
+        if Config.COMMAND_SYNC == 'guild':
+            # Guild commands update instantly, which suits development
+            guild = discord.Object(id=int(Config.DISCORD_GUILD_ID))
+            self.tree.copy_global_to(guild=guild)
+        
+        await self.command_sync.setup()
+        try:
+            await self.command_sync.sync(guild)
+        except discord.HTTPException as e:
+            logger.error(f"Failed to sync app commands: {e}")
+    
+    async def close(self):
+        """Stop background services and disconnect."""
+        await self.reloader.close()
+        await self.timers.close()
+        await self.cooldowns.close()
+        await self.stats.close()
+        if self.metrics_server is not None:
+            await self.metrics_server.close()
+        await super().close()
+        await self.db.close()
     
     async def on_ready(self):
         """Event triggered when the bot is ready."""
         logger.info(f"Logged in as {self.user.name} (ID: {self.user.id})")
-        logger.info(f"Bot is in {len(self.guilds)} guilds")
+        logger.info(f"Bot is in {len(self.guilds)} guilds across shards {sorted(self.shards)} of {self.shard_count}")
         
         # Set bot status
         activity = discord.Game(name=Config.BOT_STATUS)
         await self.change_presence(activity=activity)
         
         logger.info("Bot is ready!")
+        if self.startup.mark_ready():
+            logger.info(f"Startup: {' | '.join(self.startup.lines())}")
+    
+    async def on_shard_ready(self, shard_id):
+        """Event triggered when a single shard is ready."""
+        guilds = sum(1 for guild in self.guilds if guild.shard_id == shard_id)
+        logger.info(f"Shard {shard_id} ready with {guilds} guilds")
+    
+    async def before_command(self, ctx):
+        """Global before_invoke hook, run for prefix and slash invocations alike."""
+        ctx.started = time.perf_counter()
+        await self.profiler.before_command(ctx)
+    
+    def record_command(self, ctx, outcome):
+        """Record a finished command's outcome and, if it passed its checks, its duration."""
+        name = ctx.command.qualified_name
+        started = getattr(ctx, 'started', None)
+        if started is not None:
+            self.metrics.command_duration.observe(time.perf_counter() - started, name)
+        self.metrics.commands.inc(name, outcome)
+    
+    async def on_command_completion(self, ctx):
+        """Log every completed command with structured fields."""
+        self.record_command(ctx, 'success')
+        latency = (discord.utils.utcnow() - ctx.message.created_at).total_seconds() * 1000
+        logger.info(
+            f"Command {ctx.command.qualified_name} completed",
+            extra={
+                'guild_id': ctx.guild.id if ctx.guild else None,
+                'channel_id': ctx.channel.id,
+                'user_id': ctx.author.id,
+                'command': ctx.command.qualified_name,
+                'latency_ms': round(latency, 1)
+            }
+        )
+    
+    async def on_guild_role_create(self, role):
+        """Keep the role cache current when a role is created."""
+        self.role_cache.add(role)
+    
+    async def on_guild_role_update(self, before, after):
+        """Keep the role cache current when a role is renamed or moved."""
+        self.role_cache.update(before, after)
+    
+    async def on_guild_role_delete(self, role):
+        """Keep the role cache current when a role is deleted."""
+        self.role_cache.remove(role)
+    
+    async def on_guild_available(self, guild):
+        """Re-index a guild that arrived in a fresh session (not a resume) or after an outage."""
+        # The Guild and its Role objects were replaced, the index still points at the old ones
+        self.role_cache.drop_guild(guild.id)
+    
+    async def on_guild_remove(self, guild):
+        """Drop cached data for a guild the bot has left."""
+        self.role_cache.drop_guild(guild.id)
     
     async def on_command_error(self, ctx, error):
         """Global error handler for commands."""
-        if isinstance(error, commands.CommandNotFound):
-            return  # Ignore command not found errors
-        
-        if isinstance(error, commands.MissingPermissions):
-            embed = discord.Embed(
-                title="❌ Permission Error",
-                description="You don't have permission to use this command!",
-                color=Config.EMBED_COLORS['error']
-            )
-            await ctx.send(embed=embed)
-            return
-        
-        if isinstance(error, commands.CommandOnCooldown):
-            embed = discord.Embed(
-                title="⏰ Cooldown",
-                description=f"Please wait {error.retry_after:.2f} seconds before using this command again.",
-                color=Config.EMBED_COLORS['warning']
-            )
-            await ctx.send(embed=embed)
-            return
-        
-        # Log unexpected errors
-        logger.error(f"Unexpected error in command {ctx.command}: {error}")
-        
-        embed = discord.Embed(
-            title="❌ Error",
-            description="An unexpected error occurred. Please try again later.",
-            color=Config.EMBED_COLORS['error']
-        )
-        await ctx.send(embed=embed)
+        if ctx.command is not None:
+            self.record_command(ctx, 'error')
+        await self.errors.handle(ctx, error)
 
-async def main():
-    """Main function to run the bot."""
+async def main(shard_ids=None, shard_count=None, cluster_id=None):
+    """Main function to run the bot. Returns 1 if it stopped on an unexpected error."""
     if not Config.DISCORD_TOKEN:
         logger.error("No Discord token found! Please set DISCORD_TOKEN in your environment variables.")
         return
     
-    bot = DiscordBot()
+    bot = DiscordBot(
+        shard_ids=shard_ids if shard_ids is not None else Config.SHARD_IDS,
+        shard_count=shard_count if shard_count is not None else Config.SHARD_COUNT,
+        cluster_id=cluster_id
+    )
     
     try:
         await bot.start(Config.DISCORD_TOKEN)
     except KeyboardInterrupt:
         logger.info("Bot shutdown requested...")
+    except discord.LoginFailure as e:
+        logger.error(f"Login failed: {e}")
     except Exception as e:
         logger.error(f"Error running bot: {e}")
+        return 1
     finally:
         await bot.close()
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    try:
+        asyncio.run(main())
+    finally:
+        # Flush records still waiting in the logging queue
+        if log_listener is not None:
+            log_listener.stop() 
\ No newline at end of file
@@ -0,0 +1,149 @@
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import aiohttp
+from config import Config
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - cluster - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Discord allows one IDENTIFY per 5 seconds per concurrency bucket
+IDENTIFY_INTERVAL = 5
+
+# Restart delays of a crashing cluster double up to this many seconds
+RESTART_BACKOFF_MAX = 300
+
+# A cluster that stayed up this long starts over with the shortest delay
+RESTART_RESET_AFTER = 600
+
+
+async def fetch_recommended_shards():
+    """Ask Discord how many shards the bot should run."""
+    headers = {'Authorization': f'Bot {Config.DISCORD_TOKEN}'}
+    async with aiohttp.ClientSession() as session:
+        async with session.get('https://discord.com/api/v10/gateway/bot', headers=headers) as response:
+            response.raise_for_status()
+            data = await response.json()
+    return data['shards']
+
+
+def split_shards(shard_count, clusters):
+    """Split shard IDs into ``clusters`` contiguous, near-equal ranges."""
+    per_cluster, extra = divmod(shard_count, clusters)
+    ranges = []
+    start = 0
+    for cluster_id in range(clusters):
+        size = per_cluster + (1 if cluster_id < extra else 0)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return [shard_ids for shard_ids in ranges if shard_ids]
+
+
+def run_worker(cluster_id, shard_ids, shard_count):
+    """Entry point of a worker process: run the bot for a range of shards."""
+    # Each worker gets its own log file so rotation never races. Spawn has
+    # already imported config while re-importing this module, so the
+    # setting itself is overridden rather than the environment.
+    base, ext = os.path.splitext(Config.LOG_FILE)
+    Config.LOG_FILE = f"{base}.cluster{cluster_id}{ext}"
+
+    # Imported here so logging is configured with the worker's settings
+    import bot
+    try:
+        status = asyncio.run(bot.main(shard_ids=shard_ids, shard_count=shard_count, cluster_id=cluster_id))
+    finally:
+        if bot.log_listener is not None:
+            bot.log_listener.stop()
+    # A non-zero exit code asks the supervisor for a restart
+    sys.exit(status or 0)
+
+
+def start_worker(cluster_id, shard_ids, shard_count):
+    process = multiprocessing.Process(
+        target=run_worker,
+        args=(cluster_id, shard_ids, shard_count),
+        name=f'cluster-{cluster_id}'
+    )
+    process.start()
+    logger.info(f"Started cluster {cluster_id} (PID {process.pid}) with shards {shard_ids[0]}-{shard_ids[-1]}")
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the bot as several processes, each owning a range of shards.")
+    parser.add_argument('--clusters', type=int, default=os.cpu_count() or 1, help="number of worker processes (default: CPU count)")
+    parser.add_argument('--shards', type=int, default=Config.SHARD_COUNT, help="total shard count (default: Discord's recommendation)")
+    args = parser.parse_args()
+
+    if not Config.DISCORD_TOKEN:
+        logger.error("No Discord token found! Please set DISCORD_TOKEN in your environment variables.")
+        return
+
+    shard_count = args.shards or asyncio.run(fetch_recommended_shards())
+    shard_ranges = split_shards(shard_count, max(1, args.clusters))
+    logger.info(f"Running {shard_count} shards in {len(shard_ranges)} clusters")
+
+    multiprocessing.set_start_method('spawn')
+    workers = {}
+    started = {}    # cluster_id -> monotonic time the worker was started
+    restarts = {}   # cluster_id -> consecutive restarts
+    retry_at = {}   # cluster_id -> monotonic time of the pending restart
+    try:
+        for cluster_id, shard_ids in enumerate(shard_ranges):
+            workers[cluster_id] = start_worker(cluster_id, shard_ids, shard_count)
+            started[cluster_id] = time.monotonic()
+            # Let this cluster identify its shards before the next one starts
+            if cluster_id < len(shard_ranges) - 1:
+                time.sleep(IDENTIFY_INTERVAL * len(shard_ids))
+
+        # Supervise: restart crashed workers with backoff, one IDENTIFY window at a time
+        next_identify = time.monotonic()
+        while workers:
+            time.sleep(1)
+            now = time.monotonic()
+            for cluster_id, process in list(workers.items()):
+                if process.is_alive():
+                    continue
+                if process.exitcode == 0:
+                    # Clean shutdown or a login failure; restarting would not help
+                    logger.error(f"Cluster {cluster_id} stopped, not restarting")
+                    del workers[cluster_id]
+                    continue
+
+                if cluster_id not in retry_at:
+                    if now - started[cluster_id] > RESTART_RESET_AFTER:
+                        restarts[cluster_id] = 0
+                    delay = min(RESTART_BACKOFF_MAX, IDENTIFY_INTERVAL * 2 ** restarts.get(cluster_id, 0))
+                    restarts[cluster_id] = restarts.get(cluster_id, 0) + 1
+                    retry_at[cluster_id] = now + delay
+                    logger.warning(f"Cluster {cluster_id} exited with code {process.exitcode}, restarting in {delay}s")
+
+                if now < max(retry_at[cluster_id], next_identify):
+                    continue
+                del retry_at[cluster_id]
+                shard_ids = shard_ranges[cluster_id]
+                workers[cluster_id] = start_worker(cluster_id, shard_ids, shard_count)
+                started[cluster_id] = now
+                next_identify = now + IDENTIFY_INTERVAL * len(shard_ids)
+
+        logger.error("All clusters stopped")
+    except KeyboardInterrupt:
+        logger.info("Cluster shutdown requested...")
+    finally:
+        for process in workers.values():
+            if process.is_alive():
+                process.terminate()
+        for process in workers.values():
+            process.join(timeout=30)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,98 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 from config import Config
+from utils.cooldowns import shared_cooldown
+from utils.moderation import BulkModerator, ModerationPlan, parse_id_file, parse_targets, resolve_members
+from utils.overwrites import OverwriteSync, muted_permissions, needs_overwrite
+from utils.profiling import StackSampler
+from utils.progress import progress_reporter
+from utils.purge import MessageFilter, StreamingPurge, compile_filter_pattern
 import asyncio
+import io
+import logging
+import re
+import time
 from datetime import datetime, timedelta
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Discord caps native member timeouts at 28 days
+MAX_TIMEOUT_SECONDS = 28 * 86400
+
+# Slash command permissions of !mute/!unmute: the timeout backend also needs Moderate Members
+MUTE_PERMISSIONS = {'manage_roles': True}
+if Config.MUTE_BACKEND == 'timeout':
+    MUTE_PERMISSIONS['moderate_members'] = True
+
+# Longest !profile run
+MAX_PROFILE_SECONDS = 300
+
+# Largest ID list file read by the mass moderation commands
+MAX_ID_FILE_BYTES = 1024 * 1024
+
+# Results listed in a mass moderation summary before the rest go to the attached report
+SUMMARY_LINES = 10
+
+class ClearFilters(commands.FlagConverter):
+    """Optional !clear filters, given as ``name: value``."""
+    
+    user: Optional[discord.User] = commands.flag(default=None, description="Only messages from this user")
+    bots: bool = commands.flag(default=False, description="Only messages from bots")
+    match: Optional[str] = commands.flag(default=None, description="Only messages matching this regex")
+    attachments: bool = commands.flag(default=False, description="Only messages with attachments")
+    after: Optional[str] = commands.flag(default=None, description="Only messages newer than this age, e.g. 2h")
+    before: Optional[str] = commands.flag(default=None, description="Only messages older than this age, e.g. 7d")
 
 class Admin(commands.Cog):
     """Administrative and moderation commands."""
     
+    preserved_state = ('overwrite_sync', '_sync_tasks', 'bulk_moderator')
+    
     def __init__(self, bot):
         self.bot = bot
+        self.overwrite_sync = OverwriteSync(Config.OVERWRITE_SYNC_CONCURRENCY)
+        self._sync_tasks = {}  # guild_id -> running overwrite sync task
+        self.bulk_moderator = BulkModerator(Config.MODERATION_CONCURRENCY)
+        self._profiling = False
+    
+    def start_overwrite_sync(self, guild, muted_role):
+        """Apply the Muted overwrites to every channel without blocking the caller."""
+        task = self._sync_tasks.get(guild.id)
+        if task is not None and not task.done():
+            return task
+        
+        async def run():
+            result = await self.overwrite_sync.sync(guild, muted_role, reason="Muted role setup")
+            logger.info(
+                f"Muted overwrites synced in guild {guild.id}: {result.updated} updated, "
+                f"{result.skipped} skipped, {len(result.failed)} failed in {result.elapsed:.2f}s"
+            )
+        
+        task = asyncio.create_task(run(), name=f"overwrite-sync-{guild.id}")
+        task.add_done_callback(lambda _: self._sync_tasks.pop(guild.id, None))
+        self._sync_tasks[guild.id] = task
+        return task
+    
+    @commands.Cog.listener()
+    async def on_guild_channel_create(self, channel):
+        """Give new channels the Muted role overwrite."""
+        muted_role = self.bot.role_cache.get(channel.guild, "Muted")
+        permissions = muted_permissions(channel)
+        if not muted_role or not permissions or not needs_overwrite(channel, muted_role, permissions):
+            return
+        
+        try:
+            await self.overwrite_sync.apply_channel(channel, muted_role, permissions, reason="Muted role setup")
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to set Muted overwrite on channel {channel.id}: {e}")
     
-    @commands.command(name="kick")
+    @commands.hybrid_command(name="kick")
     @commands.has_permissions(kick_members=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(kick_members=True)
     async def kick(self, ctx, member: discord.Member, *, reason="No reason provided"):
         """Kick a member from the server."""
         if member == ctx.author:
@@ -55,9 +135,11 @@ class Admin(commands.Cog):
             )
             await ctx.send(embed=embed)
     
-    @commands.command(name="ban")
+    @commands.hybrid_command(name="ban")
     @commands.has_permissions(ban_members=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(ban_members=True)
     async def ban(self, ctx, member: discord.Member, *, reason="No reason provided"):
         """Ban a member from the server."""
         if member == ctx.author:
@@ -100,13 +182,15 @@ class Admin(commands.Cog):
             )
             await ctx.send(embed=embed)
     
-    @commands.command(name="unban")
+    @commands.hybrid_command(name="unban")
     @commands.has_permissions(ban_members=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
-    async def unban(self, ctx, user_id: int, *, reason="No reason provided"):
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(ban_members=True)
+    @app_commands.describe(user="User ID or mention of the banned user")
+    async def unban(self, ctx, user: discord.User, *, reason="No reason provided"):
         """Unban a user by their ID."""
         try:
-            user = await self.bot.fetch_user(user_id)
             await ctx.guild.unban(user, reason=reason)
             
             embed = discord.Embed(
@@ -135,45 +219,227 @@ class Admin(commands.Cog):
             )
             await ctx.send(embed=embed)
     
-    @commands.command(name="clear")
+    async def read_targets(self, ctx, targets, file):
+        """Collect target ids from the command text and an optional ID list file.
+        
+        Returns ``(ids, reason)``, or None after telling the user what is wrong.
+        """
+        ids, reason = parse_targets(targets)
+        error = None
+        if file is not None:
+            if file.size > MAX_ID_FILE_BYTES:
+                error = f"The ID list can be at most {MAX_ID_FILE_BYTES // 1024} KB!"
+            else:
+                ids = list(dict.fromkeys(ids + parse_id_file((await file.read()).decode('utf-8', 'ignore'))))
+        
+        if error is None and not ids:
+            error = "Give user IDs or mentions, or attach a file with one ID per line!"
+        elif error is None and len(ids) > Config.MASS_MODERATION_MAX:
+            error = f"At most {Config.MASS_MODERATION_MAX} users per command!"
+        
+        if error is not None:
+            embed = discord.Embed(title="❌ Error", description=error, color=Config.EMBED_COLORS['error'])
+            await ctx.send(embed=embed)
+            return None
+        return ids, reason or "No reason provided"
+    
+    async def run_mass_action(self, ctx, action, title, targets, file):
+        """Plan, apply and report a bulk kick, ban or unban."""
+        await ctx.defer()
+        parsed = await self.read_targets(ctx, targets, file)
+        if parsed is None:
+            return
+        ids, reason = parsed
+        
+        if action == 'unban':
+            plan = ModerationPlan.for_unban(ids)
+        else:
+            # Cache first, then batched gateway lookups; no per-ID REST fetches
+            members, unresolved = await resolve_members(ctx.guild, ids)
+            plan = ModerationPlan.for_members(action, ctx.guild, ctx.author, ids, members, unresolved)
+        
+        embed = discord.Embed(
+            title=title,
+            description=f"Processing {len(plan.operations)} users...",
+            color=Config.EMBED_COLORS['info']
+        )
+        message = await ctx.send(embed=embed)
+        
+        elapsed = await self.bulk_moderator.apply(
+            ctx.guild,
+            plan,
+            reason=f"{reason} (mass {action} by {ctx.author})",
+            progress=progress_reporter(message, title)
+        )
+        
+        succeeded = plan.succeeded
+        failed = plan.failed
+        embed = discord.Embed(
+            title=f"{title} Complete",
+            color=Config.EMBED_COLORS['success'] if not failed else Config.EMBED_COLORS['warning']
+        )
+        embed.add_field(name="✅ Done", value=str(len(succeeded)), inline=True)
+        embed.add_field(name="⏭️ Skipped", value=str(len(plan.skipped)), inline=True)
+        embed.add_field(name="❌ Failed", value=str(len(failed)), inline=True)
+        embed.add_field(name="Reason", value=reason, inline=False)
+        
+        problems = [f"⏭️ {user_id}: {why}" for user_id, why in plan.skipped] + [op.describe() for op in failed]
+        if problems:
+            shown = problems[:SUMMARY_LINES]
+            if len(problems) > SUMMARY_LINES:
+                shown.append(f"...and {len(problems) - SUMMARY_LINES} more in the attached report")
+            embed.add_field(name="Problems", value="\n".join(shown)[:1024], inline=False)
+        rate = len(plan.operations) / elapsed if elapsed else 0
+        embed.set_footer(text=f"Requested by {ctx.author.display_name} | {len(plan.operations)} requests in {elapsed:.2f}s ({rate:.1f}/s)")
+        await message.edit(embed=embed)
+        
+        if len(problems) > SUMMARY_LINES or len(succeeded) > SUMMARY_LINES:
+            lines = [op.describe() for op in plan.operations] + [f"⏭️ {user_id}: {why}" for user_id, why in plan.skipped]
+            report = io.BytesIO("\n".join(lines).encode())
+            await ctx.send(file=discord.File(report, filename=f"mass{action}-{int(time.time())}.txt"))
+    
+    @commands.hybrid_command(name="massban")
+    @commands.has_permissions(ban_members=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(ban_members=True)
+    @app_commands.describe(targets="User IDs or mentions, then an optional reason", file="Text file with user IDs")
+    async def massban(self, ctx, file: Optional[discord.Attachment] = None, *, targets: str = ""):
+        """Ban many users by ID or mention, or from an attached ID list."""
+        await self.run_mass_action(ctx, 'ban', "🔨 Mass Ban", targets, file)
+    
+    @commands.hybrid_command(name="masskick")
+    @commands.has_permissions(kick_members=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(kick_members=True)
+    @app_commands.describe(targets="User IDs or mentions, then an optional reason", file="Text file with user IDs")
+    async def masskick(self, ctx, file: Optional[discord.Attachment] = None, *, targets: str = ""):
+        """Kick many members by ID or mention, or from an attached ID list."""
+        await self.run_mass_action(ctx, 'kick', "👢 Mass Kick", targets, file)
+    
+    @commands.hybrid_command(name="massunban")
+    @commands.has_permissions(ban_members=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(ban_members=True)
+    @app_commands.describe(targets="User IDs, then an optional reason", file="Text file with user IDs")
+    async def massunban(self, ctx, file: Optional[discord.Attachment] = None, *, targets: str = ""):
+        """Unban many users by ID, or from an attached ID list."""
+        await self.run_mass_action(ctx, 'unban', "🔓 Mass Unban", targets, file)
+    
+    @commands.hybrid_command(name="clear")
     @commands.has_permissions(manage_messages=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
-    async def clear(self, ctx, amount: int = 10):
-        """Clear a specified number of messages."""
-        if amount < 1 or amount > 100:
-            embed = discord.Embed(
-                title="❌ Error",
-                description="Please specify a number between 1 and 100!",
-                color=Config.EMBED_COLORS['error']
-            )
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_messages=True)
+    @app_commands.describe(amount=f"Number of matching messages to delete (1-{Config.CLEAR_MAX})")
+    async def clear(self, ctx, amount: Optional[int] = None, *, filters: ClearFilters):
+        """Clear messages, optionally only those matching filters, e.g. `!clear 500 user: @spammer after: 2h`."""
+        # Optional so `!clear user: @x` parses the flags instead of failing on the amount
+        if amount is None:
+            amount = 10
+        
+        error = None
+        if amount < 1 or amount > Config.CLEAR_MAX:
+            error = f"Please specify a number between 1 and {Config.CLEAR_MAX}!"
+        
+        pattern = None
+        if error is None and filters.match is not None:
+            try:
+                pattern = compile_filter_pattern(filters.match)
+            except re.error as e:
+                error = f"Invalid regex: {e}"
+        
+        now = discord.utils.utcnow()
+        after = before = None
+        for name, value in (('after', filters.after), ('before', filters.before)):
+            if error is None and value is not None:
+                seconds = self.parse_duration(value)
+                if seconds is None:
+                    error = f"Invalid `{name}` age! Use e.g. 30m, 2h or 7d."
+                elif name == 'after':
+                    after = now - timedelta(seconds=seconds)
+                else:
+                    before = now - timedelta(seconds=seconds)
+        
+        if error is not None:
+            embed = discord.Embed(title="❌ Error", description=error, color=Config.EMBED_COLORS['error'])
             await ctx.send(embed=embed)
             return
         
+        # Slash invocations have no command message to delete, and answer
+        # privately so the reply isn't part of the history being purged
+        await ctx.defer(ephemeral=True)
+        check = MessageFilter(
+            author_id=filters.user.id if filters.user else None,
+            bots=filters.bots,
+            pattern=pattern,
+            attachments=filters.attachments
+        )
+        purge = StreamingPurge(
+            ctx.channel,
+            check,
+            limit=amount,
+            max_scan=Config.CLEAR_MAX_SCAN,
+            # Start below the command so the progress message is never part of the walk
+            before=before or (ctx.message if not ctx.interaction else now),
+            after=after,
+            extra=[] if ctx.interaction else [ctx.message]
+        )
+        
+        embed = discord.Embed(
+            title="🧹 Clearing Messages",
+            description=f"Deleting up to **{amount}** messages...",
+            color=Config.EMBED_COLORS['info']
+        )
+        message = await ctx.send(embed=embed)
+        
         try:
-            deleted = await ctx.channel.purge(limit=amount + 1)  # +1 to include command message
-            
-            embed = discord.Embed(
-                title="🧹 Messages Cleared",
-                description=f"Successfully deleted **{len(deleted) - 1}** messages.",
-                color=Config.EMBED_COLORS['success']
-            )
-            embed.set_footer(text=f"Cleared by {ctx.author.display_name}")
-            
-            message = await ctx.send(embed=embed)
-            await asyncio.sleep(5)
-            await message.delete()
-            
+            result = await purge.run(progress=progress_reporter(message, "🧹 Clearing Messages"))
         except discord.Forbidden:
             embed = discord.Embed(
                 title="❌ Error",
                 description="I don't have permission to delete messages!",
                 color=Config.EMBED_COLORS['error']
             )
-            await ctx.send(embed=embed)
+            await message.edit(embed=embed)
+            return
+        
+        embed = discord.Embed(
+            title="🧹 Messages Cleared",
+            description=f"Successfully deleted **{result.deleted}** messages.",
+            color=Config.EMBED_COLORS['success']
+        )
+        description = check.describe()
+        if description:
+            embed.add_field(name="Filters", value=description, inline=False)
+        if result.single_deleted:
+            embed.add_field(
+                name="Older Than 14 Days",
+                value=f"{result.single_deleted} deleted one by one",
+                inline=False
+            )
+        if result.deleted < amount and result.scanned >= Config.CLEAR_MAX_SCAN:
+            embed.add_field(
+                name="Scan Limit",
+                value=f"Stopped after looking at {result.scanned} messages",
+                inline=False
+            )
+        embed.set_footer(
+            text=f"Cleared by {ctx.author.display_name} | {result.scanned} scanned in {result.elapsed:.2f}s"
+        )
+        await message.edit(embed=embed)
+        
+        # Scheduled by discord.py, the command doesn't wait for it
+        await message.delete(delay=10)
     
-    @commands.command(name="mute")
+    @commands.hybrid_command(name="mute")
     @commands.has_permissions(manage_roles=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(**MUTE_PERMISSIONS)
+    @app_commands.describe(duration="How long, e.g. 30s, 5m, 2h or 1d")
     async def mute(self, ctx, member: discord.Member, duration: str = "10m", *, reason="No reason provided"):
         """Mute a member for a specified duration."""
         if member == ctx.author:
@@ -205,34 +471,28 @@ class Admin(commands.Cog):
             await ctx.send(embed=embed)
             return
         
-        # Find or create muted role
-        muted_role = discord.utils.get(ctx.guild.roles, name="Muted")
-        if not muted_role:
-            try:
-                muted_role = await ctx.guild.create_role(
-                    name="Muted",
-                    color=discord.Color.dark_grey(),
-                    reason="Mute command usage"
-                )
-                
-                # Set permissions for all channels
-                for channel in ctx.guild.channels:
-                    if isinstance(channel, discord.TextChannel):
-                        await channel.set_permissions(muted_role, send_messages=False)
-                    elif isinstance(channel, discord.VoiceChannel):
-                        await channel.set_permissions(muted_role, speak=False)
-                        
-            except discord.Forbidden:
-                embed = discord.Embed(
-                    title="❌ Error",
-                    description="I don't have permission to create the Muted role!",
-                    color=Config.EMBED_COLORS['error']
-                )
-                await ctx.send(embed=embed)
-                return
+        if self.uses_timeout(duration_seconds):
+            self.check_timeout_permission(ctx)
         
         try:
-            await member.add_roles(muted_role, reason=reason)
+            if self.uses_timeout(duration_seconds):
+                # Native timeout: one request, Discord lifts it by itself
+                await member.timeout(timedelta(seconds=duration_seconds), reason=reason)
+            else:
+                muted_role = await self.get_or_create_muted_role(ctx)
+                if not muted_role:
+                    return
+                
+                await member.add_roles(muted_role, reason=reason)
+                
+                # Schedule unmute, persisted so it survives restarts
+                await self.bot.timers.schedule(
+                    'mute',
+                    time.time() + duration_seconds,
+                    ctx.guild.id,
+                    member.id,
+                    ctx.channel.id
+                )
             
             embed = discord.Embed(
                 title="🔇 Member Muted",
@@ -245,18 +505,6 @@ class Admin(commands.Cog):
             
             await ctx.send(embed=embed)
             
-            # Schedule unmute
-            await asyncio.sleep(duration_seconds)
-            if muted_role in member.roles:
-                await member.remove_roles(muted_role, reason="Mute duration expired")
-                
-                embed = discord.Embed(
-                    title="🔊 Member Unmuted",
-                    description=f"**{member.display_name}** has been automatically unmuted.",
-                    color=Config.EMBED_COLORS['info']
-                )
-                await ctx.send(embed=embed)
-            
         except discord.Forbidden:
             embed = discord.Embed(
                 title="❌ Error",
@@ -265,13 +513,54 @@ class Admin(commands.Cog):
             )
             await ctx.send(embed=embed)
     
-    @commands.command(name="unmute")
+    def uses_timeout(self, duration_seconds):
+        """Check whether a mute of this length uses Discord's native timeout."""
+        return Config.MUTE_BACKEND == 'timeout' and duration_seconds <= MAX_TIMEOUT_SECONDS
+    
+    def check_timeout_permission(self, ctx):
+        """Timeouts need Moderate Members on top of the Manage Roles the mute commands check."""
+        if not ctx.author.guild_permissions.moderate_members:
+            raise commands.MissingPermissions(['moderate_members'])
+    
+    async def get_or_create_muted_role(self, ctx):
+        """Find or create the Muted role, reporting failures to the channel."""
+        muted_role = self.bot.role_cache.get(ctx.guild, "Muted")
+        if muted_role:
+            return muted_role
+        
+        try:
+            muted_role = await ctx.guild.create_role(
+                name="Muted",
+                color=discord.Color.dark_grey(),
+                reason="Mute command usage"
+            )
+        except discord.Forbidden:
+            embed = discord.Embed(
+                title="❌ Error",
+                description="I don't have permission to create the Muted role!",
+                color=Config.EMBED_COLORS['error']
+            )
+            await ctx.send(embed=embed)
+            return None
+        
+        # Set permissions for all channels in the background
+        self.start_overwrite_sync(ctx.guild, muted_role)
+        return muted_role
+    
+    @commands.hybrid_command(name="unmute")
     @commands.has_permissions(manage_roles=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(**MUTE_PERMISSIONS)
     async def unmute(self, ctx, member: discord.Member, *, reason="No reason provided"):
         """Unmute a member."""
-        muted_role = discord.utils.get(ctx.guild.roles, name="Muted")
-        if not muted_role or muted_role not in member.roles:
+        # Check both backends: the backend may have changed since the mute
+        timed_out = member.is_timed_out()
+        muted_role = None
+        if not timed_out:
+            muted_role = self.bot.role_cache.get(ctx.guild, "Muted")
+        
+        if not timed_out and (not muted_role or muted_role not in member.roles):
             embed = discord.Embed(
                 title="❌ Error",
                 description="This member is not muted!",
@@ -280,8 +569,15 @@ class Admin(commands.Cog):
             await ctx.send(embed=embed)
             return
         
+        if timed_out:
+            self.check_timeout_permission(ctx)
+        
         try:
-            await member.remove_roles(muted_role, reason=reason)
+            if timed_out:
+                await member.timeout(None, reason=reason)
+            else:
+                await member.remove_roles(muted_role, reason=reason)
+                await self.bot.timers.cancel('mute', ctx.guild.id, member.id)
             
             embed = discord.Embed(
                 title="🔊 Member Unmuted",
@@ -302,11 +598,252 @@ class Admin(commands.Cog):
             )
             await ctx.send(embed=embed)
     
+    @commands.hybrid_command(name="mutesync")
+    @commands.has_permissions(manage_roles=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_roles=True)
+    async def mute_sync(self, ctx):
+        """Re-apply the Muted role overwrites to every channel."""
+        muted_role = self.bot.role_cache.get(ctx.guild, "Muted")
+        if not muted_role:
+            embed = discord.Embed(
+                title="❌ Error",
+                description="There is no Muted role yet! It is created on the first `!mute`.",
+                color=Config.EMBED_COLORS['error']
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        embed = discord.Embed(
+            title="🔧 Syncing Muted Overwrites",
+            description="Checking channels...",
+            color=Config.EMBED_COLORS['info']
+        )
+        message = await ctx.send(embed=embed)
+        
+        result = await self.overwrite_sync.sync(
+            ctx.guild,
+            muted_role,
+            reason=f"Muted overwrite sync by {ctx.author.display_name}",
+            progress=progress_reporter(message, "🔧 Syncing Muted Overwrites")
+        )
+        
+        embed = discord.Embed(
+            title="🔧 Muted Overwrites Synced",
+            description=f"**Updated:** {result.updated}\n"
+                        f"**Already correct:** {result.skipped}\n"
+                        f"**Failed:** {len(result.failed)}",
+            color=Config.EMBED_COLORS['success'] if not result.failed else Config.EMBED_COLORS['warning']
+        )
+        if result.failed:
+            embed.add_field(
+                name="❌ Failed Channels",
+                value="\n".join(channel.mention for channel, _ in result.failed[:20]),
+                inline=False
+            )
+        embed.set_footer(text=f"Synced by {ctx.author.display_name} | {result.elapsed:.2f}s")
+        await message.edit(embed=embed)
+    
+    @commands.hybrid_command(name="setcooldown")
+    @commands.has_permissions(manage_guild=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.describe(category="default, admin or fun", seconds="New cooldown; leave empty to reset")
+    async def set_cooldown(self, ctx, category: str, seconds: float = None):
+        """Override a cooldown category for this server (no seconds resets it)."""
+        category = category.lower()
+        if category not in Config.COOLDOWNS:
+            embed = discord.Embed(
+                title="❌ Unknown Category",
+                description=f"Choose one of: {', '.join(f'`{name}`' for name in Config.COOLDOWNS)}",
+                color=Config.EMBED_COLORS['error']
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        overrides = dict(self.bot.settings.get(ctx.guild.id, 'cooldowns', {}))
+        if seconds is None:
+            overrides.pop(category, None)
+            description = f"`{category}` commands use the default cooldown of {Config.COOLDOWNS[category]}s again."
+        else:
+            overrides[category] = max(0.0, seconds)
+            description = f"`{category}` commands now have a {overrides[category]:g}s cooldown."
+        
+        if overrides:
+            await self.bot.settings.set(ctx.guild.id, 'cooldowns', overrides)
+        else:
+            await self.bot.settings.delete(ctx.guild.id, 'cooldowns')
+        
+        embed = discord.Embed(
+            title="⏰ Cooldown Updated",
+            description=description,
+            color=Config.EMBED_COLORS['success']
+        )
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="errors")
+    @commands.is_owner()
+    async def error_stats(self, ctx):
+        """Show command error counts by type and command (Owner only)."""
+        reporter = self.bot.errors
+        summary = reporter.summary()
+        
+        embed = discord.Embed(
+            title="📉 Command Errors",
+            description="\n".join(
+                f"**{error_type}** in `{command or 'unknown'}`: {count}"
+                for error_type, command, count in summary
+            ) or "No errors recorded.",
+            color=Config.EMBED_COLORS['info']
+        )
+        embed.add_field(name="Suppressed Replies", value=str(reporter.suppressed), inline=True)
+        embed.add_field(name="Captured Traces", value=str(len(reporter.traces)), inline=True)
+        if reporter.traces:
+            captured_at, command, trace = reporter.traces[-1]
+            embed.add_field(
+                name=f"Latest Trace ({command or 'unknown'})",
+                value=f"```{trace[-900:]}```",
+                inline=False
+            )
+        await ctx.send(embed=embed)
+    
+    @commands.command(name="profile")
+    @commands.is_owner()
+    async def profile(self, ctx, seconds: int = 30):
+        """Sample the event loop over live traffic and upload the report (Owner only)."""
+        if not 1 <= seconds <= MAX_PROFILE_SECONDS:
+            embed = discord.Embed(
+                title="❌ Error",
+                description=f"Profile for 1 to {MAX_PROFILE_SECONDS} seconds!",
+                color=Config.EMBED_COLORS['error']
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        if self._profiling:
+            embed = discord.Embed(
+                title="❌ Error",
+                description="A profile is already running!",
+                color=Config.EMBED_COLORS['error']
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        embed = discord.Embed(
+            title="🔬 Profiling",
+            description=f"Sampling the event loop for {seconds} seconds...",
+            color=Config.EMBED_COLORS['info']
+        )
+        message = await ctx.send(embed=embed)
+        
+        self._profiling = True
+        try:
+            sampler = StackSampler()
+            await sampler.run(seconds)
+        finally:
+            self._profiling = False
+        
+        report = io.BytesIO(sampler.report().encode())
+        embed = discord.Embed(
+            title="🔬 Profile Complete",
+            description=f"{sampler.samples} samples over {seconds} seconds.",
+            color=Config.EMBED_COLORS['success']
+        )
+        embed.add_field(name="Slow Invocations Logged", value=str(self.bot.profiler.slow_count), inline=True)
+        await message.edit(embed=embed)
+        await ctx.send(file=discord.File(report, filename=f"profile-{int(time.time())}.txt"))
+    
+    @commands.command(name="reload")
+    @commands.is_owner()
+    async def reload(self, ctx, *extensions: str):
+        """Reload changed or named cogs without reconnecting (Owner only)."""
+        reloader = self.bot.reloader
+        names = [reloader.resolve(name) for name in extensions] or reloader.changed()
+        if not names:
+            embed = discord.Embed(
+                title="🔄 Reload",
+                description="No cog files changed since they were loaded.",
+                color=Config.EMBED_COLORS['info']
+            )
+            await ctx.send(embed=embed)
+            return
+        
+        results = await reloader.reload(names)
+        failed = {name: error for name, error in results.items() if error is not None}
+        embed = discord.Embed(
+            title="🔄 Reload" + (" Failed" if failed else " Complete"),
+            description="\n".join(
+                f"❌ `{name}`: {error[:300]}" if error else f"✅ `{name}`"
+                for name, error in results.items()
+            ),
+            color=Config.EMBED_COLORS['error' if failed else 'success']
+        )
+        if failed:
+            embed.set_footer(text="Failed cogs keep running their previous version")
+        await ctx.send(embed=embed)
+    
+    @commands.Cog.listener()
+    async def on_mute_timer_complete(self, timer):
+        """Lift a mute once its timer expires; failures are retried with backoff."""
+        guild = self.bot.get_guild(timer.guild_id)
+        if guild is None or guild.unavailable:
+            # Down during an outage (or left); the timer gives up after its last retry
+            await self.retry_unmute(timer, "guild unavailable")
+            return
+        
+        try:
+            member = await self.expire_mute(guild, timer)
+        except discord.HTTPException as e:
+            await self.retry_unmute(timer, e)
+            return
+        
+        await self.bot.timers.complete(timer)
+        if member is None:
+            return
+        
+        channel = guild.get_channel(timer.channel_id)
+        if channel:
+            embed = discord.Embed(
+                title="🔊 Member Unmuted",
+                description=f"**{member.display_name}** has been automatically unmuted.",
+                color=Config.EMBED_COLORS['info']
+            )
+            try:
+                await channel.send(embed=embed)
+            except discord.HTTPException:
+                pass
+    
+    async def expire_mute(self, guild, timer):
+        """Remove the Muted role of an expired mute. Returns the member, or None if nothing was left to do."""
+        member = guild.get_member(timer.user_id)
+        if member is None:
+            try:
+                member = await guild.fetch_member(timer.user_id)
+            except discord.NotFound:
+                return None  # Member left the server
+        
+        muted_role = self.bot.role_cache.get(guild, "Muted")
+        if not muted_role or muted_role not in member.roles:
+            return None
+        
+        await member.remove_roles(muted_role, reason="Mute duration expired")
+        return member
+    
+    async def retry_unmute(self, timer, error):
+        if await self.bot.timers.retry(timer):
+            logger.warning(f"Failed to unmute {timer.user_id} in guild {timer.guild_id}, retrying: {error}")
+        else:
+            logger.error(f"Gave up unmuting {timer.user_id} in guild {timer.guild_id}: {error}")
+    
     def parse_duration(self, duration_str):
-        """Parse duration string to seconds."""
+        """Parse duration string to seconds. Raises BadArgument for durations that are not positive."""
         try:
             unit = duration_str[-1].lower()
             value = int(duration_str[:-1])
+            if value <= 0 and unit in 'smhd':
+                raise commands.BadArgument(f"Duration must be positive, got `{duration_str}`.")
             
             if unit == 's':
                 return value
@@ -1,60 +1,176 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 from config import Config
+from utils.cooldowns import shared_cooldown
+from collections import deque
+import asyncio
+import time
 
 class Events(commands.Cog):
     """Event listeners for the bot."""
+    
+    # Kept across !reload so join batches in flight still get their notice
+    preserved_state = ('welcome_channels', 'recent_notices', 'pending_notices')
+    
     def __init__(self, bot):
         self.bot = bot
+        self.welcome_channels = {}  # guild_id -> resolved channel (or None)
+        self.recent_notices = {}    # guild_id -> deque of recent join/leave times
+        self.pending_notices = {}   # (guild_id, kind) -> members waiting for a batched notice
+    
+    def get_welcome_channel(self, guild):
+        """Return the channel for join/leave notices, resolving it once per guild."""
+        if guild.id in self.welcome_channels:
+            return self.welcome_channels[guild.id]
+        
+        channel = None
+        channel_id = self.bot.settings.get(guild.id, 'welcome_channel')
+        if channel_id is not None:
+            channel = guild.get_channel(channel_id)
+            if channel and not channel.permissions_for(guild.me).send_messages:
+                channel = None
+        if channel is None:
+            channel = next((c for c in guild.text_channels if c.permissions_for(guild.me).send_messages), None)
+        
+        self.welcome_channels[guild.id] = channel
+        return channel
+    
+    def invalidate_welcome_channel(self, guild):
+        """Forget the resolved channel so it is looked up again on the next notice."""
+        self.welcome_channels.pop(guild.id, None)
     
     @commands.Cog.listener()
-    async def on_member_join(self, member):
-        channel = next((c for c in member.guild.text_channels if c.permissions_for(member.guild.me).send_messages), None)
-        if channel:
-            embed = discord.Embed(
-                title="👋 Welcome!",
-                description=f"Welcome to the server, {member.mention}!",
-                color=Config.EMBED_COLORS['success']
-            )
-            await channel.send(embed=embed)
+    async def on_guild_channel_create(self, channel):
+        self.invalidate_welcome_channel(channel.guild)
     
     @commands.Cog.listener()
-    async def on_member_remove(self, member):
-        channel = next((c for c in member.guild.text_channels if c.permissions_for(member.guild.me).send_messages), None)
-        if channel:
-            embed = discord.Embed(
-                title="😢 Goodbye!",
-                description=f"{member.display_name} has left the server.",
-                color=Config.EMBED_COLORS['error']
-            )
-            await channel.send(embed=embed)
+    async def on_guild_channel_delete(self, channel):
+        self.invalidate_welcome_channel(channel.guild)
     
     @commands.Cog.listener()
-    async def on_command_error(self, ctx, error):
-        if isinstance(error, commands.CommandNotFound):
-            return
-        if isinstance(error, commands.MissingPermissions):
-            embed = discord.Embed(
-                title="❌ Permission Error",
-                description="You don't have permission to use this command!",
-                color=Config.EMBED_COLORS['error']
-            )
-            await ctx.send(embed=embed)
-            return
-        if isinstance(error, commands.CommandOnCooldown):
-            embed = discord.Embed(
-                title="⏰ Cooldown",
-                description=f"Please wait {error.retry_after:.2f} seconds before using this command again.",
-                color=Config.EMBED_COLORS['warning']
-            )
-            await ctx.send(embed=embed)
-            return
+    async def on_guild_channel_update(self, before, after):
+        # Position and overwrite changes can both change the resolved channel
+        if before.position != after.position or before.overwrites != after.overwrites:
+            self.invalidate_welcome_channel(after.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_role_update(self, before, after):
+        if before.permissions != after.permissions:
+            self.invalidate_welcome_channel(after.guild)
+    
+    @commands.Cog.listener()
+    async def on_member_update(self, before, after):
+        if after.id == self.bot.user.id and before.roles != after.roles:
+            self.invalidate_welcome_channel(after.guild)
+    
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.invalidate_welcome_channel(guild)
+        self.recent_notices.pop(guild.id, None)
+    
+    @commands.hybrid_command(name="setwelcome")
+    @commands.has_permissions(manage_guild=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_guild=True)
+    async def set_welcome(self, ctx, channel: discord.TextChannel = None):
+        """Set the channel for join/leave messages (no channel resets to automatic)."""
+        if channel is None:
+            await self.bot.settings.delete(ctx.guild.id, 'welcome_channel')
+            description = "Welcome messages will go to the first channel I can write in."
+        else:
+            await self.bot.settings.set(ctx.guild.id, 'welcome_channel', channel.id)
+            description = f"Welcome messages will be sent to {channel.mention}."
+        self.invalidate_welcome_channel(ctx.guild)
+        
         embed = discord.Embed(
-            title="❌ Error",
-            description="An unexpected error occurred. Please try again later.",
-            color=Config.EMBED_COLORS['error']
+            title="👋 Welcome Channel Updated",
+            description=description,
+            color=Config.EMBED_COLORS['success']
         )
         await ctx.send(embed=embed)
+    
+    def is_burst(self, guild):
+        """Record a join/leave and check whether the guild is in a burst."""
+        now = time.monotonic()
+        recent = self.recent_notices.setdefault(guild.id, deque())
+        recent.append(now)
+        while recent and recent[0] < now - Config.WELCOME_BATCH_WINDOW:
+            recent.popleft()
+        return len(recent) > Config.WELCOME_BURST_THRESHOLD
+    
+    async def notify(self, member, kind):
+        """Send a join/leave notice, batching it while the guild is in a burst."""
+        guild = member.guild
+        channel = self.get_welcome_channel(guild)
+        if not channel:
+            return
+        
+        # Record every join/leave, batched or not, so a sustained burst stays a burst
+        burst = self.is_burst(guild)
+        key = (guild.id, kind)
+        if key in self.pending_notices:
+            self.pending_notices[key].append(member)
+            return
+        
+        if burst:
+            # Collect everyone arriving within the window into one message
+            self.pending_notices[key] = [member]
+            await asyncio.sleep(Config.WELCOME_BATCH_WINDOW)
+            members = self.pending_notices.pop(key)
+            await self.send_notice(guild, kind, members)
+            return
+        
+        await self.send_notice(guild, kind, [member])
+    
+    async def send_notice(self, guild, kind, members):
+        """Send one join/leave embed for one or more members."""
+        channel = self.get_welcome_channel(guild)
+        if not channel:
+            return
+        
+        if kind == 'join':
+            title = "👋 Welcome!"
+            names = [member.mention for member in members]
+            color = Config.EMBED_COLORS['success']
+        else:
+            title = "😢 Goodbye!"
+            names = [member.display_name for member in members]
+            color = Config.EMBED_COLORS['error']
+        
+        # Keep well under the embed description limit
+        shown = []
+        length = 0
+        for name in names:
+            length += len(name) + 2
+            if length > 3500:
+                break
+            shown.append(name)
+        listed = ", ".join(shown)
+        if len(shown) < len(names):
+            listed += f" and {len(names) - len(shown)} more"
+        
+        if kind == 'join':
+            description = f"Welcome to the server, {listed}!"
+        elif len(members) == 1:
+            description = f"{listed} has left the server."
+        else:
+            description = f"{listed} have left the server."
+        
+        embed = discord.Embed(title=title, description=description, color=color)
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException:
+            self.invalidate_welcome_channel(guild)
+    
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        await self.notify(member, 'join')
+    
+    @commands.Cog.listener()
+    async def on_member_remove(self, member):
+        await self.notify(member, 'leave')
 
 async def setup(bot):
     await bot.add_cog(Events(bot)) 
\ No newline at end of file
@@ -1,6 +1,9 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 from config import Config
+from utils.cooldowns import shared_cooldown
+from utils.dice import DiceBudget, DiceError, roll as roll_dice
 import random
 
 class Fun(commands.Cog):
@@ -13,9 +16,16 @@ class Fun(commands.Cog):
             "Reply hazy, try again.", "Ask again later.", "Better not tell you now.", "Cannot predict now.", "Concentrate and ask again.",
             "Don't count on it.", "My reply is no.", "My sources say no.", "Outlook not so good.", "Very doubtful."
         ]
+        self.dice_budget = DiceBudget(
+            max_terms=Config.DICE_MAX_TERMS,
+            max_dice=Config.DICE_MAX_DICE,
+            max_sides=Config.DICE_MAX_SIDES,
+            exact_dice=Config.DICE_EXACT_DICE,
+            list_dice=Config.DICE_LIST_DICE
+        )
     
-    @commands.command(name="8ball")
-    @commands.cooldown(1, Config.COOLDOWNS['fun'], commands.BucketType.user)
+    @commands.hybrid_command(name="8ball")
+    @shared_cooldown('fun')
     async def eight_ball(self, ctx, *, question: str):
         """Ask the magic 8-ball a question."""
         response = random.choice(self.eight_ball_responses)
@@ -26,30 +36,53 @@ class Fun(commands.Cog):
         )
         await ctx.send(embed=embed)
     
-    @commands.command(name="roll")
-    @commands.cooldown(1, Config.COOLDOWNS['fun'], commands.BucketType.user)
-    async def roll(self, ctx, dice: str = "1d6"):
-        """Roll dice in NdM format (e.g., 2d6)."""
+    @commands.hybrid_command(name="roll")
+    @shared_cooldown('fun')
+    @app_commands.describe(dice="Dice expression, e.g. 2d6 or 4d6kh3+2")
+    async def roll(self, ctx, *, dice: str = "1d6"):
+        """Roll dice, e.g. 2d6, 4d6kh3+2 or 1000000d6."""
         try:
-            rolls, limit = map(int, dice.lower().split('d'))
-        except Exception:
+            result = roll_dice(dice, self.dice_budget)
+        except DiceError as e:
             embed = discord.Embed(
                 title="❌ Error",
-                description="Format must be NdM (e.g., 2d6)",
+                description=f"{e}\nFormat: NdM terms with optional kh/kl (e.g., `2d6`, `4d6kh3+2`, `d20-1`)",
                 color=Config.EMBED_COLORS['error']
             )
             await ctx.send(embed=embed)
             return
-        results = [random.randint(1, limit) for _ in range(rolls)]
+        
+        lines = [self.describe_term(term) for term in result.terms if term.rolls is not None or term.counts is not None]
+        total = f"≈ {result.total:,}" if result.approximate else f"{result.total:,}"
+        description = f"Rolled `{dice}`: **{total}**"
+        for line in lines:
+            if len(description) + len(line) > 3800:
+                description += "\n..."
+                break
+            description += f"\n{line}"
+        
         embed = discord.Embed(
             title="🎲 Dice Roll",
-            description=f"Rolled {dice}: {', '.join(map(str, results))}",
+            description=description,
             color=Config.EMBED_COLORS['info']
         )
+        if result.approximate:
+            embed.set_footer(text="Large rolls are sampled statistically")
         await ctx.send(embed=embed)
     
-    @commands.command(name="coinflip")
-    @commands.cooldown(1, Config.COOLDOWNS['fun'], commands.BucketType.user)
+    def describe_term(self, term):
+        """Describe the individual results of a dice term, if they fit."""
+        if term.rolls is not None:
+            line = f"`{term.text}`: {', '.join(map(str, term.rolls))}"
+            if term.kept is not None:
+                line += f" (kept {', '.join(map(str, term.kept))})"
+        else:
+            faces = " · ".join(f"{face}: {count:,}" for face, count in sorted(term.counts.items()))
+            line = f"`{term.text}`: {faces}"
+        return line[:1000]
+    
+    @commands.hybrid_command(name="coinflip")
+    @shared_cooldown('fun')
     async def coinflip(self, ctx):
         """Flip a coin."""
         result = random.choice(["Heads", "Tails"])
@@ -60,8 +93,8 @@ class Fun(commands.Cog):
         )
         await ctx.send(embed=embed)
     
-    @commands.command(name="joke")
-    @commands.cooldown(1, Config.COOLDOWNS['fun'], commands.BucketType.user)
+    @commands.hybrid_command(name="joke")
+    @shared_cooldown('fun')
     async def joke(self, ctx):
         """Tell a random joke."""
         jokes = [
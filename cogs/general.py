@@ -1,19 +1,22 @@
 import discord
 from discord.ext import commands
 from config import Config
+from utils.cooldowns import shared_cooldown
 import platform
-import psutil
 import time
 
 class General(commands.Cog):
     """General utility commands."""
     
+    preserved_state = ('start_time',)
+    
     def __init__(self, bot):
         self.bot = bot
         self.start_time = time.time()
+        self.bot.embeds.register("help", self.build_help_embed)
     
-    @commands.command(name="ping")
-    @commands.cooldown(1, Config.COOLDOWNS['default'], commands.BucketType.user)
+    @commands.hybrid_command(name="ping")
+    @shared_cooldown('default')
     async def ping(self, ctx):
         """Check the bot's latency."""
         latency = round(self.bot.latency * 1000)
@@ -23,14 +26,32 @@ class General(commands.Cog):
             description=f"Bot latency: **{latency}ms**",
             color=Config.EMBED_COLORS['info']
         )
-        embed.set_footer(text=f"Requested by {ctx.author.display_name}")
+        
+        shard_lines = self.shard_summary()
+        if len(shard_lines) > 1:
+            embed.add_field(name="🧩 Shards", value="\n".join(shard_lines), inline=False)
+        
+        shard_id = ctx.guild.shard_id if ctx.guild else 0
+        embed.set_footer(text=f"Shard {shard_id} | Requested by {ctx.author.display_name}")
         
         await ctx.send(embed=embed)
     
-    @commands.command(name="help")
-    @commands.cooldown(1, Config.COOLDOWNS['default'], commands.BucketType.user)
-    async def help_command(self, ctx):
-        """Show help information about available commands."""
+    def shard_summary(self, limit=20):
+        """Return one line per shard of this process with latency and guild count."""
+        guild_counts = {}
+        for guild in self.bot.guilds:
+            guild_counts[guild.shard_id] = guild_counts.get(guild.shard_id, 0) + 1
+        
+        lines = [
+            f"**#{shard_id}:** {round(latency * 1000)}ms, {guild_counts.get(shard_id, 0)} servers"
+            for shard_id, latency in sorted(self.bot.latencies)[:limit]
+        ]
+        if len(self.bot.latencies) > limit:
+            lines.append(f"... and {len(self.bot.latencies) - limit} more")
+        return lines
+    
+    def build_help_embed(self):
+        """Build the static part of the help embed."""
         embed = discord.Embed(
             title="🤖 Bot Help",
             description="Here are the available commands:",
@@ -42,6 +63,7 @@ class General(commands.Cog):
             "`!ping` - Check bot latency",
             "`!help` - Show this help message",
             "`!info` - Show bot information",
+            "`!stats` - Show system stats over the last hour",
             "`!userinfo [user]` - Show user information"
         ]
         
@@ -49,16 +71,23 @@ class General(commands.Cog):
         admin_commands = [
             "`!kick <user> [reason]` - Kick a user",
             "`!ban <user> [reason]` - Ban a user",
-            "`!clear <amount>` - Clear messages",
+            "`!massban <ids...> [reason]` - Ban many users (or attach an ID list)",
+            "`!masskick <ids...> [reason]` - Kick many members (or attach an ID list)",
+            "`!massunban <ids...> [reason]` - Unban many users (or attach an ID list)",
+            "`!clear [amount] [filters]` - Clear messages (filters: user, bots, match, attachments, after, before)",
             "`!mute <user> <duration>` - Mute a user",
-            "`!createroles` - Create all role categories",
-            "`!deleteroles` - Delete all bot-created roles"
+            "`!mutesync` - Re-apply Muted role channel overwrites",
+            "`!setwelcome [channel]` - Set the welcome channel",
+            "`!setcooldown <category> [seconds]` - Override a cooldown",
+            "`!createroles [preview]` - Create all role categories",
+            "`!rolepanel` - Post a permanent role panel",
+            "`!deleteroles [preview]` - Delete all bot-created roles"
         ]
         
         # Fun commands
         fun_commands = [
             "`!8ball <question>` - Ask the magic 8-ball",
-            "`!roll [dice]` - Roll dice",
+            "`!roll [dice]` - Roll dice (e.g. 2d6, 4d6kh3+2)",
             "`!coinflip` - Flip a coin",
             "`!joke` - Get a random joke"
         ]
@@ -90,18 +119,29 @@ class General(commands.Cog):
             inline=False
         )
         
-        embed.set_footer(text=f"Prefix: {Config.BOT_PREFIX} | Requested by {ctx.author.display_name}")
+        return embed
+    
+    @commands.hybrid_command(name="help")
+    @shared_cooldown('default')
+    async def help_command(self, ctx):
+        """Show help information about available commands."""
+        embed = self.bot.embeds.get(
+            "help",
+            footer=f"Prefix: {Config.BOT_PREFIX} or / | Requested by {ctx.author.display_name}"
+        )
         
         await ctx.send(embed=embed)
     
-    @commands.command(name="info")
-    @commands.cooldown(1, Config.COOLDOWNS['default'], commands.BucketType.user)
+    @commands.hybrid_command(name="info")
+    @shared_cooldown('default')
     async def info(self, ctx):
         """Show bot information and statistics."""
         uptime = time.time() - self.start_time
         hours, remainder = divmod(uptime, 3600)
         minutes, seconds = divmod(remainder, 60)
         
+        role_cache = self.bot.role_cache.stats()
+        
         embed = discord.Embed(
             title="🤖 Bot Information",
             color=Config.EMBED_COLORS['info']
@@ -110,8 +150,9 @@ class General(commands.Cog):
         embed.add_field(
             name="📊 Statistics",
             value=f"**Servers:** {len(self.bot.guilds)}\n"
-                  f"**Users:** {len(self.bot.users)}\n"
-                  f"**Commands:** {len(self.bot.commands)}",
+                  f"**Users:** {sum(guild.member_count or 0 for guild in self.bot.guilds)}\n"
+                  f"**Commands:** {len(self.bot.commands)}\n"
+                  f"**Role Cache:** {role_cache['hits']} hits / {role_cache['misses']} misses",
             inline=True
         )
         
@@ -119,25 +160,75 @@ class General(commands.Cog):
             name="⚙️ Technical",
             value=f"**Python:** {platform.python_version()}\n"
                   f"**Discord.py:** {discord.__version__}\n"
-                  f"**Uptime:** {int(hours)}h {int(minutes)}m {int(seconds)}s",
+                  f"**Uptime:** {int(hours)}h {int(minutes)}m {int(seconds)}s\n"
+                  f"**Shards:** {len(self.bot.shards)} here / {self.bot.shard_count or 1} total"
+                  + (f" (cluster {self.bot.cluster_id})" if self.bot.cluster_id is not None else ""),
             inline=True
         )
         
+        # Cached by the stats sampler, never measured on the event loop
+        sample = self.bot.stats.latest
+        if sample is None:
+            system = "**CPU:** collecting...\n**Memory:** collecting...\n"
+        else:
+            system = (
+                f"**CPU:** {sample.system_cpu:.1f}% (bot {sample.cpu:.1f}%)\n"
+                f"**Memory:** {sample.memory_percent:.1f}% (bot {sample.rss / 1024 / 1024:.0f} MB)\n"
+            )
         embed.add_field(
             name="💻 System",
-            value=f"**CPU:** {psutil.cpu_percent()}%\n"
-                  f"**Memory:** {psutil.virtual_memory().percent}%\n"
-                  f"**Platform:** {platform.system()}",
+            value=system + f"**Platform:** {platform.system()}",
             inline=True
         )
         
+        startup = self.bot.startup.lines()
+        if startup:
+            embed.add_field(name="🚀 Startup", value="\n".join(startup), inline=False)
+        
         embed.set_thumbnail(url=self.bot.user.avatar.url if self.bot.user.avatar else None)
         embed.set_footer(text=f"Requested by {ctx.author.display_name}")
         
         await ctx.send(embed=embed)
     
-    @commands.command(name="userinfo")
-    @commands.cooldown(1, Config.COOLDOWNS['default'], commands.BucketType.user)
+    @commands.hybrid_command(name="stats")
+    @shared_cooldown('default')
+    async def stats(self, ctx):
+        """Show min/avg/max system and bot stats over the last hour."""
+        sampler = self.bot.stats
+        summary = sampler.summary(3600)
+        
+        embed = discord.Embed(
+            title="📈 Stats (last hour)",
+            color=Config.EMBED_COLORS['info']
+        )
+        if not summary:
+            embed.description = f"No samples yet, the first arrives {sampler.interval:g}s after startup."
+            await ctx.send(embed=embed)
+            return
+        
+        rows = [
+            ("CPU (bot)", 'cpu', lambda value: f"{value:.1f}%"),
+            ("CPU (system)", 'system_cpu', lambda value: f"{value:.1f}%"),
+            ("Memory (bot)", 'rss', lambda value: f"{value / 1024 / 1024:.0f} MB"),
+            ("Memory (system)", 'memory_percent', lambda value: f"{value:.1f}%"),
+            ("Event Loop Lag", 'loop_lag', lambda value: f"{value * 1000:.1f}ms"),
+            ("Gateway Latency", 'latency', lambda value: f"{value * 1000:.0f}ms")
+        ]
+        for name, field, fmt in rows:
+            if field not in summary:
+                continue
+            low, average, high = summary[field]
+            embed.add_field(
+                name=name,
+                value=f"**Min:** {fmt(low)}\n**Avg:** {fmt(average)}\n**Max:** {fmt(high)}",
+                inline=True
+            )
+        
+        embed.set_footer(text=f"{len(sampler.samples)} samples, every {sampler.interval:g}s")
+        await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name="userinfo")
+    @shared_cooldown('default')
     async def userinfo(self, ctx, member: discord.Member = None):
         """Show information about a user."""
         member = member or ctx.author
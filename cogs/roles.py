@@ -1,37 +1,84 @@
 import discord
+from discord import app_commands
 from discord.ext import commands
 from config import Config
+from utils.cooldowns import shared_cooldown
+from utils.profiling import ProfiledView
+from utils.progress import progress_reporter
+from utils.provisioning import RolePlan, RoleProvisioner
+from utils.role_cache import role_custom_id
+from utils.role_toggles import RoleToggleBuffer
 import asyncio
+import time
+from typing import Literal, Optional
+
+# custom_id prefixes of the role menu buttons
+CATEGORY_PREFIX = "category_"
+PANEL_PREFIX = "panel_"
+SELECT_PREFIX = "select_"
+BACK_CUSTOM_ID = "back_to_categories"
+
+# Discord allows five select menus per view
+SELECTS_PER_VIEW = 5
+
+# discord.py allows 25 components per view
+BUTTONS_PER_VIEW = 25
 
 class Roles(commands.Cog):
     """Role management commands with categorized roles."""
     
+    preserved_state = ('provisioner', 'toggle_buffer')
+    
     def __init__(self, bot):
         self.bot = bot
+        self.role_categories = Config.ROLE_CATEGORIES
+        self.role_names = {
+            role_custom_id(role_name): role_name
+            for category in self.role_categories.values()
+            for role_name in category["roles"]
+        }
+        self.role_category_ids = {
+            role_custom_id(role_name): category_id
+            for category_id, category in self.role_categories.items()
+            for role_name in category["roles"]
+        }
         
-        # Define role categories
-        self.role_categories = {
-            "tuar_games": {
-                "name": "🎮 Tuar Studios Games",
-                "description": "Stay updated with Tuar Studios games and testing",
-                "roles": ["📰 News", "🧪 Tester"]
-            },
-            "platforms": {
-                "name": "💻 Platforms",
-                "description": "Choose your gaming platform",
-                "roles": ["🖥️ PC", "🎮 Console", "📱 Mobile"]
-            },
-            "regions": {
-                "name": "🌍 Regions",
-                "description": "Select your region",
-                "roles": ["🇪🇺 EU", "🇺🇸 NA East", "🇺🇸 NA West", "🇦🇺 Oceania", "🌏 Asia", "🇿🇦 South Africa", "🇧🇷 South America"]
-            }
+        # Layout views are built once and shared by every message
+        self.category_view = RoleCategoryView(self.role_categories, CATEGORY_PREFIX)
+        self.panel_view = RoleCategoryView(self.role_categories, PANEL_PREFIX)
+        self.selection_views = {
+            category_id: RoleSelectionView(category["roles"])
+            for category_id, category in self.role_categories.items()
         }
+        
+        self.provisioner = RoleProvisioner(Config.ROLE_PROVISION_CONCURRENCY)
+        self.toggle_buffer = RoleToggleBuffer(Config.ROLE_TOGGLE_WINDOW, self.report_toggles, self.observe_toggles)
+        
+        # Overview and category embeds only depend on the role config, which is
+        # fixed at load time; a reload registers them again
+        bot.embeds.register("role_categories", self.build_categories_embed)
+        for category_id in self.role_categories:
+            bot.embeds.register(
+                f"role_category:{category_id}",
+                lambda category_id=category_id: self.build_category_embed(category_id)
+            )
+        
+        # Registered once by DiscordBot.setup_hook
+        select_categories = [
+            category_id for category_id, category in self.role_categories.items()
+            if category.get("mode") == "select"
+        ]
+        custom_ids = dispatcher_custom_ids(self.role_categories)
+        self.persistent_views = [
+            RoleDispatcherView(custom_ids[i:i + BUTTONS_PER_VIEW], bot)
+            for i in range(0, len(custom_ids), BUTTONS_PER_VIEW)
+        ] + [
+            RoleSelectDispatcherView(select_categories[i:i + SELECTS_PER_VIEW], bot)
+            for i in range(0, len(select_categories), SELECTS_PER_VIEW)
+        ]
     
-    @commands.command(name="roles")
-    @commands.cooldown(1, Config.COOLDOWNS['default'], commands.BucketType.user)
-    async def show_roles(self, ctx):
-        """Show all available role categories."""
+    def build_categories_embed(self):
+        """Build the role category overview embed."""
         embed = discord.Embed(
             title="🎭 Role Categories",
             description="Click the buttons below to manage your roles in each category:",
@@ -45,78 +92,328 @@ class Roles(commands.Cog):
                 inline=False
             )
         
-        embed.set_footer(text=f"Requested by {ctx.author.display_name}")
-        
-        # Create buttons for each category
-        view = RoleCategoryView(self.role_categories, self.bot)
-        await ctx.send(embed=embed, view=view)
+        return embed
     
-    @commands.command(name="createroles")
-    @commands.has_permissions(manage_roles=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
-    async def create_roles(self, ctx):
-        """Create all role categories and roles (Admin only)."""
-        embed = discord.Embed(
-            title="⚙️ Creating Roles",
-            description="Creating role categories and roles...",
+    def build_category_embed(self, category_id):
+        """Build the embed for a single role category."""
+        category = self.role_categories[category_id]
+        description = category["description"]
+        if category.get("mode") == "select":
+            if category.get("exclusive"):
+                description += "\n\nPick one role; clear the menu to remove it."
+            else:
+                description += "\n\nPick every role you want; unpicked roles of this category are removed."
+        return discord.Embed(
+            title=category["name"],
+            description=description,
             color=Config.EMBED_COLORS['info']
         )
-        message = await ctx.send(embed=embed)
+    
+    @commands.hybrid_command(name="roles")
+    @shared_cooldown('default')
+    async def show_roles(self, ctx):
+        """Show all available role categories."""
+        embed = self.bot.embeds.get("role_categories", footer=f"Requested by {ctx.author.display_name}")
         
-        created_roles = []
-        failed_roles = []
+        await ctx.send(embed=embed, view=self.category_view)
+    
+    @commands.hybrid_command(name="rolepanel")
+    @commands.has_permissions(manage_roles=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_roles=True)
+    async def role_panel(self, ctx):
+        """Post a permanent role panel in this channel (Admin only)."""
+        embed = self.bot.embeds.get("role_categories", footer="Role menus open privately and keep working across restarts")
         
-        # Create roles for each category
-        for category_id, category in self.role_categories.items():
-            for role_name in category["roles"]:
-                try:
-                    # Check if role already exists
-                    existing_role = discord.utils.get(ctx.guild.roles, name=role_name)
-                    if existing_role:
-                        created_roles.append(f"✅ {role_name} (already exists)")
-                        continue
-                    
-                    # Create the role
-                    role = await ctx.guild.create_role(
-                        name=role_name,
-                        color=discord.Color.default(),
-                        reason=f"Role creation by {ctx.author.display_name}"
-                    )
-                    created_roles.append(f"✅ {role_name}")
-                    
-                except discord.Forbidden:
-                    failed_roles.append(f"❌ {role_name} (no permission)")
-                except Exception as e:
-                    failed_roles.append(f"❌ {role_name} (error: {str(e)})")
-        
-        # Update the embed with results
-        result_embed = discord.Embed(
-            title="🎭 Role Creation Complete",
-            color=Config.EMBED_COLORS['success'] if not failed_roles else Config.EMBED_COLORS['warning']
+        if ctx.interaction:
+            # Post the panel as a regular message rather than an interaction response
+            await ctx.channel.send(embed=embed, view=self.panel_view)
+            await ctx.send("Role panel posted.", ephemeral=True)
+            return
+        
+        await ctx.send(embed=embed, view=self.panel_view)
+        try:
+            await ctx.message.delete()
+        except discord.HTTPException:
+            pass
+    
+    async def show_category_roles(self, interaction: discord.Interaction, category_id: str, ephemeral: bool = False):
+        """Show roles for a specific category."""
+        if category_id not in self.role_categories:
+            return
+        
+        embed = self.bot.embeds.get(f"role_category:{category_id}")
+        category = self.role_categories[category_id]
+        if category.get("mode") == "select":
+            # Built per click so the menu starts from the user's current roles
+            member_roles = {role.name for role in interaction.user.roles}
+            view = RoleSelectMenuView(
+                category_id, category["roles"], member_roles, exclusive=category.get("exclusive", False)
+            )
+        else:
+            view = self.selection_views[category_id]
+        
+        if ephemeral:
+            # Panels are shared, so open the category in a private message
+            await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+        else:
+            await interaction.response.edit_message(embed=embed, view=view)
+    
+    async def back_to_categories(self, interaction: discord.Interaction):
+        """Go back to the category selection."""
+        embed = self.bot.embeds.get("role_categories", footer=f"Requested by {interaction.user.display_name}")
+        
+        await interaction.response.edit_message(embed=embed, view=self.category_view)
+    
+    async def toggle_role(self, interaction: discord.Interaction, custom_id: str):
+        """Toggle a role for the user."""
+        guild = interaction.guild
+        role_name = self.role_names.get(custom_id)
+        if role_name is None:
+            return
+        
+        # Find the role
+        role = self.bot.role_cache.get_by_custom_id(guild, custom_id)
+        
+        if not role:
+            embed = discord.Embed(
+                title="❌ Role Not Found",
+                description=f"The role '{role_name}' doesn't exist. Please ask an administrator to create it.",
+                color=Config.EMBED_COLORS['error']
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        # Rapid clicks are coalesced into one edit; the last click gets the report
+        category = self.role_categories[self.role_category_ids[custom_id]]
+        excludes = ()
+        if category.get("exclusive"):
+            excludes = [self.bot.role_cache.get(guild, name) for name in category["roles"] if name != role_name]
+            excludes = [other for other in excludes if other is not None]
+        await self.toggle_buffer.toggle(interaction, role, excludes)
+    
+    def state_migrated(self):
+        """Called by the reloader once preserved_state was taken over from the old cog."""
+        # The buffer still reports through the old module's cog otherwise
+        self.toggle_buffer.report = self.report_toggles
+        self.toggle_buffer.observe = self.observe_toggles
+    
+    def observe_toggles(self, duration):
+        """Record a toggle burst once its edit finished, not when the click returned."""
+        self.bot.metrics.interaction_duration.observe(duration, "toggle")
+    
+    async def report_toggles(self, interaction: discord.Interaction, added, removed, error):
+        """Answer the last click of a toggle burst with the net change."""
+        member = interaction.user
+        if isinstance(error, discord.Forbidden):
+            embed = discord.Embed(
+                title="❌ Permission Error",
+                description="I don't have permission to manage roles!",
+                color=Config.EMBED_COLORS['error']
+            )
+        elif error is not None:
+            embed = discord.Embed(
+                title="❌ Error",
+                description=f"An error occurred: {str(error)}",
+                color=Config.EMBED_COLORS['error']
+            )
+        elif len(added) + len(removed) == 1:
+            role, action = (added[0], "added") if added else (removed[0], "removed")
+            embed = discord.Embed(
+                title="✅ Role Updated",
+                description=f"The role **{role.name}** has been {action} for you.",
+                color=Config.EMBED_COLORS['success' if added else 'warning']
+            )
+        elif added or removed:
+            embed = discord.Embed(title="✅ Roles Updated", color=Config.EMBED_COLORS['success'])
+            if added:
+                embed.add_field(name="➕ Added", value="\n".join(role.name for role in added), inline=True)
+            if removed:
+                embed.add_field(name="➖ Removed", value="\n".join(role.name for role in removed), inline=True)
+        else:
+            embed = discord.Embed(
+                title="ℹ️ No Changes",
+                description="Your clicks cancelled each other out; your roles are unchanged.",
+                color=Config.EMBED_COLORS['info']
+            )
+        embed.set_footer(text=f"Requested by {member.display_name}")
+        
+        if interaction.response.is_done():
+            await interaction.followup.send(embed=embed, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    async def edit_category_roles(self, member, category, chosen):
+        """Give the member exactly the ``chosen`` role names of a category in one edit.
+        
+        Returns the added and removed roles. Roles missing from the server are skipped.
+        """
+        guild = member.guild
+        category_roles = [self.bot.role_cache.get(guild, role_name) for role_name in category["roles"]]
+        category_roles = [role for role in category_roles if role is not None]
+        current = set(member.roles)
+        
+        added = [role for role in category_roles if role.name in chosen and role not in current]
+        removed = [role for role in category_roles if role.name not in chosen and role in current]
+        if not added and not removed:
+            return added, removed
+        
+        # One PATCH with the full role list instead of a request per role
+        roles = [role for role in member.roles if not role.is_default() and role not in removed] + added
+        await member.edit(roles=roles, reason=f"Role selection via bot by {member.display_name}")
+        return added, removed
+    
+    async def apply_role_selection(self, interaction: discord.Interaction, category_id: str, values):
+        """Apply a category's select menu choice."""
+        category = self.role_categories.get(category_id)
+        if category is None or category.get("mode") != "select":
+            return
+        member = interaction.user
+        
+        chosen = [self.role_names[value] for value in values if self.role_category_ids.get(value) == category_id]
+        if category.get("exclusive"):
+            # Menus posted before the category became exclusive still allow several
+            chosen = chosen[:1]
+        missing = [
+            role_name for role_name in chosen
+            if self.bot.role_cache.get(interaction.guild, role_name) is None
+        ]
+        
+        try:
+            added, removed = await self.edit_category_roles(member, category, set(chosen))
+        except discord.Forbidden:
+            embed = discord.Embed(
+                title="❌ Permission Error",
+                description="I don't have permission to manage roles!",
+                color=Config.EMBED_COLORS['error']
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        except discord.HTTPException as e:
+            embed = discord.Embed(
+                title="❌ Error",
+                description=f"An error occurred: {str(e)}",
+                color=Config.EMBED_COLORS['error']
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+        
+        embed = discord.Embed(
+            title="✅ Roles Updated" if added or removed else "ℹ️ No Changes",
+            color=Config.EMBED_COLORS['success'] if added or removed else Config.EMBED_COLORS['info']
         )
+        if added:
+            embed.add_field(name="➕ Added", value="\n".join(role.name for role in added), inline=True)
+        if removed:
+            embed.add_field(name="➖ Removed", value="\n".join(role.name for role in removed), inline=True)
+        if missing:
+            embed.add_field(
+                name="❌ Not Found",
+                value="\n".join(missing) + "\nPlease ask an administrator to create these roles.",
+                inline=False
+            )
+        embed.set_footer(text=f"Requested by {member.display_name}")
         
-        if created_roles:
-            result_embed.add_field(
-                name="✅ Created/Existing Roles",
-                value="\n".join(created_roles),
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    @property
+    def configured_role_names(self):
+        """All role names of every category, in config order."""
+        return [role_name for category in self.role_categories.values() for role_name in category["roles"]]
+    
+    def plan_embed(self, title, plan, pending_label, unchanged_label):
+        """Build a preview embed for a role plan without applying it."""
+        embed = discord.Embed(
+            title=title,
+            description="Dry run: no roles were changed.",
+            color=Config.EMBED_COLORS['info']
+        )
+        embed.add_field(
+            name=pending_label,
+            value="\n".join(op.describe() for op in plan.operations) or "Nothing to do",
+            inline=False
+        )
+        if plan.unchanged:
+            embed.add_field(
+                name=unchanged_label,
+                value="\n".join(f"ℹ️ {role_name}" for role_name in plan.unchanged),
                 inline=False
             )
+        return embed
+    
+    def result_embed(self, title, plan, elapsed, done_label, unchanged_label, author):
+        """Build the result embed of an applied role plan."""
+        failed = plan.failed
+        embed = discord.Embed(
+            title=title,
+            color=Config.EMBED_COLORS['success'] if not failed else Config.EMBED_COLORS['warning']
+        )
+        
+        done = [op.describe() for op in plan.operations if op.ok]
+        done.extend(f"ℹ️ {role_name} ({unchanged_label})" for role_name in plan.unchanged)
+        if done:
+            embed.add_field(name=done_label, value="\n".join(done), inline=False)
         
-        if failed_roles:
-            result_embed.add_field(
+        if failed:
+            embed.add_field(
                 name="❌ Failed Roles",
-                value="\n".join(failed_roles),
+                value="\n".join(op.describe() for op in failed),
                 inline=False
             )
         
-        result_embed.set_footer(text=f"Requested by {ctx.author.display_name}")
+        embed.set_footer(text=f"Requested by {author.display_name} | {len(plan.operations)} operations in {elapsed:.2f}s")
+        return embed
+    
+    @commands.hybrid_command(name="createroles")
+    @commands.has_permissions(manage_roles=True)
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_roles=True)
+    @app_commands.describe(mode="preview: only show what would change")
+    async def create_roles(self, ctx, mode: Optional[Literal["preview"]] = None):
+        """Create all role categories and roles (Admin only). Use `preview` for a dry run."""
+        plan = RolePlan.for_create(ctx.guild, self.configured_role_names, self.bot.role_cache)
+        
+        if mode == "preview":
+            embed = self.plan_embed("🎭 Role Creation Preview", plan, "➕ Would Create", "ℹ️ Already Exist")
+            await ctx.send(embed=embed)
+            return
+        
+        embed = discord.Embed(
+            title="⚙️ Creating Roles",
+            description="Creating role categories and roles...",
+            color=Config.EMBED_COLORS['info']
+        )
+        message = await ctx.send(embed=embed)
+        
+        elapsed = await self.provisioner.apply(
+            ctx.guild,
+            plan,
+            reason=f"Role creation by {ctx.author.display_name}",
+            progress=progress_reporter(message, "⚙️ Creating Roles")
+        )
+        
+        result_embed = self.result_embed(
+            "🎭 Role Creation Complete", plan, elapsed,
+            "✅ Created/Existing Roles", "already exists", ctx.author
+        )
         await message.edit(embed=result_embed)
     
-    @commands.command(name="deleteroles")
+    @commands.hybrid_command(name="deleteroles")
     @commands.has_permissions(manage_roles=True)
-    @commands.cooldown(1, Config.COOLDOWNS['admin'], commands.BucketType.user)
-    async def delete_roles(self, ctx):
-        """Delete all bot-created roles (Admin only)."""
+    @shared_cooldown('admin')
+    @app_commands.guild_only()
+    @app_commands.default_permissions(manage_roles=True)
+    @app_commands.describe(mode="preview: only show what would change")
+    async def delete_roles(self, ctx, mode: Optional[Literal["preview"]] = None):
+        """Delete all bot-created roles (Admin only). Use `preview` for a dry run."""
+        if mode == "preview":
+            plan = RolePlan.for_delete(ctx.guild, self.configured_role_names, self.bot.role_cache)
+            embed = self.plan_embed("🗑️ Role Deletion Preview", plan, "➖ Would Delete", "ℹ️ Not Found")
+            await ctx.send(embed=embed)
+            return
+        
         embed = discord.Embed(
             title="🗑️ Deleting Roles",
             description="Are you sure you want to delete all bot-created roles?",
@@ -129,180 +426,151 @@ class Roles(commands.Cog):
         )
         
         # Create confirmation view
-        view = RoleDeletionConfirmationView(self.role_categories, self.bot)
+        view = RoleDeletionConfirmationView(self, self.bot)
         await ctx.send(embed=embed, view=view)
 
 class RoleCategoryView(discord.ui.View):
-    """View for role category selection."""
-    
-    def __init__(self, role_categories, bot):
-        super().__init__(timeout=300)  # 5 minutes timeout
-        self.role_categories = role_categories
-        self.bot = bot
+    """Category buttons of the role menu.
     
-    @discord.ui.button(label="🎮 Tuar Studios Games", style=discord.ButtonStyle.primary, custom_id="tuar_games")
-    async def tuar_games_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.show_category_roles(interaction, "tuar_games")
+    Layout only: the view is stopped right away so discord.py never stores a
+    copy per message. Clicks are handled by RoleDispatcherView.
+    """
     
-    @discord.ui.button(label="💻 Platforms", style=discord.ButtonStyle.primary, custom_id="platforms")
-    async def platforms_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.show_category_roles(interaction, "platforms")
-    
-    @discord.ui.button(label="🌍 Regions", style=discord.ButtonStyle.primary, custom_id="regions")
-    async def regions_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        await self.show_category_roles(interaction, "regions")
-    
-    async def show_category_roles(self, interaction: discord.Interaction, category_id: str):
-        """Show roles for a specific category."""
-        category = self.role_categories[category_id]
+    def __init__(self, role_categories, custom_id_prefix=CATEGORY_PREFIX):
+        super().__init__(timeout=None)
         
-        embed = discord.Embed(
-            title=category["name"],
-            description=category["description"],
-            color=Config.EMBED_COLORS['info']
-        )
-        
-        # Create role selection view
-        view = RoleSelectionView(category["roles"], category_id, self.bot)
+        for category_id, category in role_categories.items():
+            self.add_item(discord.ui.Button(
+                label=category["name"],
+                style=discord.ButtonStyle.primary,
+                custom_id=f"{custom_id_prefix}{category_id}"
+            ))
         
-        await interaction.response.edit_message(embed=embed, view=view)
+        self.stop()
 
 class RoleSelectionView(discord.ui.View):
-    """View for role selection within a category."""
+    """Role buttons of a single category (layout only, see RoleCategoryView)."""
     
-    def __init__(self, roles, category_id, bot):
-        super().__init__(timeout=300)  # 5 minutes timeout
-        self.roles = roles
-        self.category_id = category_id
-        self.bot = bot
+    def __init__(self, roles):
+        super().__init__(timeout=None)
         
         # Add buttons for each role
         for role_name in roles:
-            button = discord.ui.Button(
+            self.add_item(discord.ui.Button(
                 label=role_name,
                 style=discord.ButtonStyle.secondary,
-                custom_id=f"role_{role_name.lower().replace(' ', '_')}"
-            )
-            button.callback = self.create_role_callback(role_name)
-            self.add_item(button)
+                custom_id=role_custom_id(role_name)
+            ))
         
         # Add back button
-        back_button = discord.ui.Button(
+        self.add_item(discord.ui.Button(
             label="⬅️ Back to Categories",
             style=discord.ButtonStyle.danger,
-            custom_id="back_to_categories"
-        )
-        back_button.callback = self.back_to_categories
-        self.add_item(back_button)
-    
-    def create_role_callback(self, role_name):
-        """Create a callback function for a specific role."""
-        async def role_callback(interaction: discord.Interaction):
-            await self.toggle_role(interaction, role_name)
-        return role_callback
-    
-    async def toggle_role(self, interaction: discord.Interaction, role_name: str):
-        """Toggle a role for the user."""
-        member = interaction.user
-        guild = interaction.guild
-        
-        # Find the role
-        role = discord.utils.get(guild.roles, name=role_name)
+            custom_id=BACK_CUSTOM_ID
+        ))
         
-        if not role:
-            embed = discord.Embed(
-                title="❌ Role Not Found",
-                description=f"The role '{role_name}' doesn't exist. Please ask an administrator to create it.",
-                color=Config.EMBED_COLORS['error']
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            return
+        self.stop()
+
+class RoleSelectMenuView(discord.ui.View):
+    """Role select menu of a single category, preset to the member's roles (layout only)."""
+    
+    def __init__(self, category_id, roles, member_roles, exclusive=False):
+        super().__init__(timeout=None)
         
-        # Check if user has the role
-        has_role = role in member.roles
+        self.add_item(discord.ui.Select(
+            custom_id=f"{SELECT_PREFIX}{category_id}",
+            placeholder="Choose a role" if exclusive else "Choose your roles",
+            min_values=0,
+            max_values=1 if exclusive else len(roles),
+            options=[
+                discord.SelectOption(label=role_name, value=role_custom_id(role_name), default=role_name in member_roles)
+                for role_name in roles
+            ]
+        ))
         
-        try:
-            if has_role:
-                # Remove the role
-                await member.remove_roles(role, reason=f"Role removal via bot by {member.display_name}")
-                action = "removed"
-                color = Config.EMBED_COLORS['warning']
-            else:
-                # Add the role
-                await member.add_roles(role, reason=f"Role assignment via bot by {member.display_name}")
-                action = "added"
-                color = Config.EMBED_COLORS['success']
-            
-            embed = discord.Embed(
-                title="✅ Role Updated",
-                description=f"The role **{role_name}** has been {action} for you.",
-                color=color
-            )
-            embed.set_footer(text=f"Requested by {member.display_name}")
-            
-            await interaction.response.send_message(embed=embed, ephemeral=True)
-            
-        except discord.Forbidden:
-            embed = discord.Embed(
-                title="❌ Permission Error",
-                description="I don't have permission to manage roles!",
-                color=Config.EMBED_COLORS['error']
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+        self.add_item(discord.ui.Button(
+            label="⬅️ Back to Categories",
+            style=discord.ButtonStyle.danger,
+            custom_id=BACK_CUSTOM_ID
+        ))
         
-        except Exception as e:
-            embed = discord.Embed(
-                title="❌ Error",
-                description=f"An error occurred: {str(e)}",
-                color=Config.EMBED_COLORS['error']
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=True)
+        self.stop()
+
+def dispatcher_custom_ids(role_categories):
+    """Return the custom_id of every role menu button, in config order."""
+    custom_ids = [BACK_CUSTOM_ID]
+    for category_id, category in role_categories.items():
+        custom_ids.append(f"{CATEGORY_PREFIX}{category_id}")
+        custom_ids.append(f"{PANEL_PREFIX}{category_id}")
+        custom_ids.extend(role_custom_id(role_name) for role_name in category["roles"])
+    return custom_ids
+
+class RoleDispatcherView(ProfiledView):
+    """Persistent view that receives the role menu clicks of up to 25 custom_ids and routes them."""
     
-    async def back_to_categories(self, interaction: discord.Interaction):
-        """Go back to the category selection."""
-        embed = discord.Embed(
-            title="🎭 Role Categories",
-            description="Click the buttons below to manage your roles in each category:",
-            color=Config.EMBED_COLORS['info']
-        )
+    def __init__(self, custom_ids, bot):
+        super().__init__(timeout=None)
+        self.bot = bot
         
-        role_categories = {
-            "tuar_games": {
-                "name": "🎮 Tuar Studios Games",
-                "description": "Stay updated with Tuar Studios games and testing",
-                "roles": ["📰 News", "🧪 Tester"]
-            },
-            "platforms": {
-                "name": "💻 Platforms",
-                "description": "Choose your gaming platform",
-                "roles": ["🖥️ PC", "🎮 Console", "📱 Mobile"]
-            },
-            "regions": {
-                "name": "🌍 Regions",
-                "description": "Select your region",
-                "roles": ["🇪🇺 EU", "🇺🇸 NA East", "🇺🇸 NA West", "🇦🇺 Oceania", "🌏 Asia", "🇿🇦 South Africa", "🇧🇷 South America"]
-            }
-        }
+        for custom_id in custom_ids:
+            button = discord.ui.Button(custom_id=custom_id)
+            button.callback = self.dispatch
+            self.add_item(button)
+    
+    async def dispatch(self, interaction: discord.Interaction):
+        """Route a click to the Roles cog."""
+        # Resolve the cog per click so reloaded cogs are picked up
+        cog = self.bot.get_cog("Roles")
+        if cog is None:
+            return
         
-        for category_id, category in role_categories.items():
-            embed.add_field(
-                name=category["name"],
-                value=f"{category['description']}\nRoles: {', '.join(category['roles'])}",
-                inline=False
-            )
+        start = time.perf_counter()
+        custom_id = interaction.data["custom_id"]
+        if custom_id == BACK_CUSTOM_ID:
+            action = "back"
+            await cog.back_to_categories(interaction)
+        elif custom_id.startswith(CATEGORY_PREFIX):
+            action = "category"
+            await cog.show_category_roles(interaction, custom_id[len(CATEGORY_PREFIX):])
+        elif custom_id.startswith(PANEL_PREFIX):
+            action = "panel"
+            await cog.show_category_roles(interaction, custom_id[len(PANEL_PREFIX):], ephemeral=True)
+        else:
+            # Observed by the toggle buffer once the coalesced edit finished
+            await cog.toggle_role(interaction, custom_id)
+            return
+        self.bot.metrics.interaction_duration.observe(time.perf_counter() - start, action)
+
+class RoleSelectDispatcherView(ProfiledView):
+    """Persistent view that receives the role select menus of up to five categories."""
+    
+    def __init__(self, category_ids, bot):
+        super().__init__(timeout=None)
+        self.bot = bot
         
-        embed.set_footer(text=f"Requested by {interaction.user.display_name}")
+        for category_id in category_ids:
+            select = discord.ui.Select(custom_id=f"{SELECT_PREFIX}{category_id}", options=[])
+            select.callback = self.dispatch
+            self.add_item(select)
+    
+    async def dispatch(self, interaction: discord.Interaction):
+        """Route a selection to the Roles cog."""
+        cog = self.bot.get_cog("Roles")
+        if cog is None:
+            return
         
-        # Create buttons for each category
-        view = RoleCategoryView(role_categories, self.bot)
-        await interaction.response.edit_message(embed=embed, view=view)
+        start = time.perf_counter()
+        # Read the values from the payload; the select item is shared by every message
+        category_id = interaction.data["custom_id"][len(SELECT_PREFIX):]
+        await cog.apply_role_selection(interaction, category_id, interaction.data.get("values", []))
+        self.bot.metrics.interaction_duration.observe(time.perf_counter() - start, "select")
 
-class RoleDeletionConfirmationView(discord.ui.View):
+class RoleDeletionConfirmationView(ProfiledView):
     """View for role deletion confirmation."""
     
-    def __init__(self, role_categories, bot):
+    def __init__(self, cog, bot):
         super().__init__(timeout=60)  # 1 minute timeout
-        self.role_categories = role_categories
+        self.cog = cog
         self.bot = bot
     
     @discord.ui.button(label="✅ Confirm", style=discord.ButtonStyle.danger)
@@ -315,46 +583,18 @@ class RoleDeletionConfirmationView(discord.ui.View):
         )
         await interaction.response.edit_message(embed=embed, view=None)
         
-        deleted_roles = []
-        failed_roles = []
-        
-        # Delete roles for each category
-        for category_id, category in self.role_categories.items():
-            for role_name in category["roles"]:
-                try:
-                    role = discord.utils.get(interaction.guild.roles, name=role_name)
-                    if role:
-                        await role.delete(reason=f"Role deletion by {interaction.user.display_name}")
-                        deleted_roles.append(f"✅ {role_name}")
-                    else:
-                        deleted_roles.append(f"ℹ️ {role_name} (not found)")
-                        
-                except discord.Forbidden:
-                    failed_roles.append(f"❌ {role_name} (not found)")
-                except Exception as e:
-                    failed_roles.append(f"❌ {role_name} (error: {str(e)})")
-        
-        # Update the embed with results
-        result_embed = discord.Embed(
-            title="🎭 Role Deletion Complete",
-            color=Config.EMBED_COLORS['success'] if not failed_roles else Config.EMBED_COLORS['warning']
+        plan = RolePlan.for_delete(interaction.guild, self.cog.configured_role_names, self.bot.role_cache)
+        elapsed = await self.cog.provisioner.apply(
+            interaction.guild,
+            plan,
+            reason=f"Role deletion by {interaction.user.display_name}",
+            progress=progress_reporter(interaction.message, "🗑️ Deleting Roles")
         )
         
-        if deleted_roles:
-            result_embed.add_field(
-                name="✅ Deleted/Not Found Roles",
-                value="\n".join(deleted_roles),
-                inline=False
-            )
-        
-        if failed_roles:
-            result_embed.add_field(
-                name="❌ Failed Roles",
-                value="\n".join(failed_roles),
-                inline=False
-            )
-        
-        result_embed.set_footer(text=f"Requested by {interaction.user.display_name}")
+        result_embed = self.cog.result_embed(
+            "🎭 Role Deletion Complete", plan, elapsed,
+            "✅ Deleted/Not Found Roles", "not found", interaction.user
+        )
         await interaction.message.edit(embed=result_embed)
     
     @discord.ui.button(label="❌ Cancel", style=discord.ButtonStyle.secondary)
@@ -16,6 +16,56 @@ class Config:
     BOT_PREFIX = os.getenv('BOT_PREFIX', '!')
     BOT_STATUS = os.getenv('BOT_STATUS', 'Playing with Discord.py')
     
+    # Slash commands: 'global' syncs them everywhere, 'guild' only to
+    # DISCORD_GUILD_ID (instant updates while developing), 'off' never syncs.
+    # Syncs are skipped when the command tree is unchanged since the last one.
+    COMMAND_SYNC = os.getenv('COMMAND_SYNC', 'global')
+    # Without the message content intent, prefix commands only work when
+    # they start with a mention of the bot; slash commands always work
+    MESSAGE_CONTENT_INTENT = os.getenv('MESSAGE_CONTENT_INTENT', 'true').lower() == 'true'
+    
+    # Reload a cog when its file changes, without reconnecting (for development;
+    # use !reload in production)
+    COG_AUTO_RELOAD = os.getenv('COG_AUTO_RELOAD', 'false').lower() == 'true'
+    COG_RELOAD_INTERVAL = float(os.getenv('COG_RELOAD_INTERVAL', '2'))
+    
+    # Sharding: leave unset to let Discord pick the shard count and run every
+    # shard in this process (cluster.py sets these per worker process)
+    SHARD_COUNT = int(os.getenv('SHARD_COUNT')) if os.getenv('SHARD_COUNT') else None
+    SHARD_IDS = [int(shard_id) for shard_id in os.getenv('SHARD_IDS').split(',')] if os.getenv('SHARD_IDS') else None
+    
+    # Caching: MEMBER_CACHE is 'all', 'voice' or 'none'; members are fetched on
+    # demand when not cached. MAX_MESSAGES=0 disables the message cache.
+    MEMBER_CACHE = os.getenv('MEMBER_CACHE', 'all')
+    CHUNK_GUILDS_AT_STARTUP = os.getenv('CHUNK_GUILDS_AT_STARTUP', 'false').lower() == 'true'
+    MAX_MESSAGES = int(os.getenv('MAX_MESSAGES', 1000))
+    
+    # Logging
+    LOG_FILE = os.getenv('LOG_FILE', 'bot.log')
+    LOG_JSON = os.getenv('LOG_JSON', 'true').lower() == 'true'
+    LOG_QUEUE = os.getenv('LOG_QUEUE', 'true').lower() == 'true'
+    LOG_MAX_BYTES = int(os.getenv('LOG_MAX_BYTES', 10 * 1024 * 1024))
+    LOG_BACKUP_COUNT = int(os.getenv('LOG_BACKUP_COUNT', 7))
+    LOG_ROTATE_WHEN = os.getenv('LOG_ROTATE_WHEN', 'midnight')
+    
+    # Error replies: one reply per user, channel and error type per window;
+    # this fraction of unexpected errors is logged with a full stack trace
+    ERROR_REPLY_WINDOW = float(os.getenv('ERROR_REPLY_WINDOW', 10))
+    ERROR_TRACE_SAMPLE_RATE = float(os.getenv('ERROR_TRACE_SAMPLE_RATE', 0.1))
+    
+    # Prometheus metrics endpoint (/metrics); clusters serve on METRICS_PORT + cluster id
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT = int(os.getenv('METRICS_PORT', 8000))
+    
+    # Commands and view callbacks slower than this (seconds) are logged
+    SLOW_COMMAND_THRESHOLD = float(os.getenv('SLOW_COMMAND_THRESHOLD', 1.0))
+    
+    # System stats sampler behind !info and !stats: seconds between samples
+    # and seconds of history kept
+    STATS_INTERVAL = float(os.getenv('STATS_INTERVAL', 10))
+    STATS_HISTORY = int(os.getenv('STATS_HISTORY', 3600))
+    
     # Colors for embeds
     EMBED_COLORS = {
         'success': 0x00ff00,  # Green
@@ -29,4 +79,72 @@ class Config:
         'default': 3,
         'admin': 1,
         'fun': 5
-    } 
\ No newline at end of file
+    }
+    
+    # Where cooldown buckets live: 'memory' (per process), 'sqlite' (shared via
+    # DATABASE_PATH) or 'redis' (shared via COOLDOWN_REDIS_URL, needs the redis package)
+    COOLDOWN_BACKEND = os.getenv('COOLDOWN_BACKEND', 'memory')
+    COOLDOWN_REDIS_URL = os.getenv('COOLDOWN_REDIS_URL', 'redis://localhost:6379/0')
+    COOLDOWN_EXPIRE_INTERVAL = int(os.getenv('COOLDOWN_EXPIRE_INTERVAL', '60'))
+    
+    # Mute backend: 'timeout' uses Discord's native member timeout (mutes
+    # longer than 28 days fall back to the role), 'role' uses the Muted role
+    MUTE_BACKEND = os.getenv('MUTE_BACKEND', 'timeout')
+    
+    # SQLite database for persistent bot state (pending timers, ...)
+    DATABASE_PATH = os.getenv('DATABASE_PATH', 'bot.db')
+    
+    # Maximum concurrent requests per route when creating/deleting roles
+    ROLE_PROVISION_CONCURRENCY = int(os.getenv('ROLE_PROVISION_CONCURRENCY', 4))
+    
+    # !clear: most messages per command, and messages looked at before a
+    # filtered clear gives up
+    CLEAR_MAX = int(os.getenv('CLEAR_MAX', 1000))
+    CLEAR_MAX_SCAN = int(os.getenv('CLEAR_MAX_SCAN', 10000))
+    
+    # Mass kick/ban/unban: concurrent requests and users per command
+    MODERATION_CONCURRENCY = int(os.getenv('MODERATION_CONCURRENCY', 5))
+    MASS_MODERATION_MAX = int(os.getenv('MASS_MODERATION_MAX', 1000))
+    
+    # Maximum concurrent channel permission updates when syncing the Muted role
+    OVERWRITE_SYNC_CONCURRENCY = int(os.getenv('OVERWRITE_SYNC_CONCURRENCY', 5))
+    
+    # Role button clicks of a member within this many seconds are applied as
+    # one edit; keep it well below Discord's 3 second interaction deadline
+    ROLE_TOGGLE_WINDOW = float(os.getenv('ROLE_TOGGLE_WINDOW', 0.5))
+    
+    # Join/leave messages: above WELCOME_BURST_THRESHOLD joins (or leaves) within
+    # WELCOME_BATCH_WINDOW seconds, members are greeted in one batched message
+    WELCOME_BURST_THRESHOLD = int(os.getenv('WELCOME_BURST_THRESHOLD', 5))
+    WELCOME_BATCH_WINDOW = float(os.getenv('WELCOME_BATCH_WINDOW', 10))
+    
+    # Dice budget for !roll: terms per expression, dice per term, sides per die,
+    # dice rolled one by one (the rest is sampled) and dice listed individually
+    DICE_MAX_TERMS = int(os.getenv('DICE_MAX_TERMS', 10))
+    DICE_MAX_DICE = int(os.getenv('DICE_MAX_DICE', 10 ** 9))
+    DICE_MAX_SIDES = int(os.getenv('DICE_MAX_SIDES', 10 ** 6))
+    DICE_EXACT_DICE = int(os.getenv('DICE_EXACT_DICE', 10000))
+    DICE_LIST_DICE = int(os.getenv('DICE_LIST_DICE', 100))
+    
+    # Self-assignable role categories. "mode": "select" shows a select menu
+    # whose choice is applied in one member edit instead of one toggle button
+    # per role; "exclusive": True allows at most one role of the category.
+    ROLE_CATEGORIES = {
+        "tuar_games": {
+            "name": "🎮 Tuar Studios Games",
+            "description": "Stay updated with Tuar Studios games and testing",
+            "roles": ["📰 News", "🧪 Tester"]
+        },
+        "platforms": {
+            "name": "💻 Platforms",
+            "description": "Choose your gaming platform",
+            "roles": ["🖥️ PC", "🎮 Console", "📱 Mobile"],
+            "mode": "select"
+        },
+        "regions": {
+            "name": "🌍 Regions",
+            "description": "Select your region",
+            "roles": ["🇪🇺 EU", "🇺🇸 NA East", "🇺🇸 NA West", "🇦🇺 Oceania", "🌏 Asia", "🇿🇦 South Africa", "🇧🇷 South America"],
+            "mode": "select"
+        }
+    }
@@ -0,0 +1,47 @@
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CommandTreeSync:
+    """Syncs the app command tree only when it changed since the last sync.
+    
+    The payload Discord would receive is hashed and the hash stored per
+    application and scope, so restarts with an unchanged tree skip the sync
+    call and its rate limit.
+    """
+    
+    def __init__(self, bot, db):
+        self.bot = bot
+        self.db = db
+    
+    async def setup(self):
+        await self.db.execute(
+            'CREATE TABLE IF NOT EXISTS app_command_hashes (scope TEXT PRIMARY KEY, hash TEXT NOT NULL)'
+        )
+    
+    def tree_hash(self, guild=None):
+        """Hash the command payload for the global tree or a guild."""
+        payload = [command.to_dict() for command in self.bot.tree.get_commands(guild=guild)]
+        payload.sort(key=lambda command: (command.get('type', 1), command['name']))
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+    
+    async def sync(self, guild=None, force=False):
+        """Sync the tree if its hash changed. Returns whether Discord was called."""
+        scope = f"{self.bot.application_id}:{guild.id if guild else 'global'}"
+        digest = self.tree_hash(guild)
+        
+        rows = await self.db.fetchall('SELECT hash FROM app_command_hashes WHERE scope = ?', (scope,))
+        if not force and rows and rows[0][0] == digest:
+            logger.info(f"App commands unchanged for {scope}, skipping sync")
+            return False
+        
+        synced = await self.bot.tree.sync(guild=guild)
+        await self.db.execute(
+            'INSERT OR REPLACE INTO app_command_hashes (scope, hash) VALUES (?, ?)',
+            (scope, digest)
+        )
+        logger.info(f"Synced {len(synced)} app commands for {scope}")
+        return True
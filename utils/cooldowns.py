@@ -0,0 +1,200 @@
+import asyncio
+import logging
+import time
+
+from discord.ext import commands
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCooldownStore:
+    """Token buckets in process memory (the default, not shared between processes)."""
+    
+    def __init__(self):
+        self._buckets = {}  # key -> (tokens, updated, expires)
+    
+    async def acquire(self, key, rate, per, now):
+        """Take one token. Returns None on success or the seconds until a token is free."""
+        tokens, updated, _ = self._buckets.get(key, (rate, now, now))
+        tokens = min(rate, tokens + (now - updated) * rate / per)
+        if tokens < 1:
+            return (1 - tokens) * per / rate
+        tokens -= 1
+        # The bucket is full again (and can be forgotten) after this time
+        self._buckets[key] = (tokens, now, now + (rate - tokens) * per / rate)
+        return None
+    
+    async def expire(self, now):
+        """Drop every bucket that has refilled completely."""
+        expired = [key for key, (_, _, expires) in self._buckets.items() if expires <= now]
+        for key in expired:
+            del self._buckets[key]
+        return len(expired)
+    
+    async def close(self):
+        pass
+
+
+class SQLiteCooldownStore:
+    """Token buckets in the bot's SQLite database, shared by every process using it.
+    
+    Each acquire runs as one ``BEGIN IMMEDIATE`` transaction, so concurrent
+    processes can never both take the last token.
+    """
+    
+    def __init__(self, db):
+        self.db = db
+    
+    async def setup(self):
+        await self.db.execute(
+            'CREATE TABLE IF NOT EXISTS cooldowns ('
+            'key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL, expires REAL NOT NULL)'
+        )
+    
+    @staticmethod
+    def _acquire(connection, key, rate, per, now):
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute('SELECT tokens, updated FROM cooldowns WHERE key = ?', (key,)).fetchone()
+            tokens = rate if row is None else min(rate, row[0] + (now - row[1]) * rate / per)
+            if tokens < 1:
+                return (1 - tokens) * per / rate
+            tokens -= 1
+            connection.execute(
+                'INSERT OR REPLACE INTO cooldowns (key, tokens, updated, expires) VALUES (?, ?, ?, ?)',
+                (key, tokens, now, now + (rate - tokens) * per / rate)
+            )
+            return None
+        finally:
+            connection.commit()
+    
+    async def acquire(self, key, rate, per, now):
+        return await self.db.run(self._acquire, key, rate, per, now)
+    
+    @staticmethod
+    def _expire(connection, now):
+        cursor = connection.execute('DELETE FROM cooldowns WHERE expires <= ?', (now,))
+        connection.commit()
+        return cursor.rowcount
+    
+    async def expire(self, now):
+        return await self.db.run(self._expire, now)
+    
+    async def close(self):
+        pass
+
+
+class RedisCooldownStore:
+    """Token buckets in Redis (or any server speaking its protocol and Lua scripting).
+    
+    The bucket update is a Lua script, so it is atomic on the server; keys
+    expire through their TTL once the bucket has refilled.
+    """
+    
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local per = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local data = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(data[1])
+    if tokens == nil then
+        tokens = rate
+    else
+        tokens = math.min(rate, tokens + (now - tonumber(data[2])) * rate / per)
+    end
+    if tokens < 1 then
+        return tostring((1 - tokens) * per / rate)
+    end
+    tokens = tokens - 1
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('PEXPIRE', KEYS[1], math.ceil((rate - tokens) * per / rate * 1000))
+    return false
+    """
+    
+    def __init__(self, url):
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError("COOLDOWN_BACKEND=redis requires the 'redis' package (pip install redis)")
+        self._redis = redis.from_url(url)
+        self._script = self._redis.register_script(self.SCRIPT)
+    
+    async def acquire(self, key, rate, per, now):
+        result = await self._script(keys=[f'cooldown:{key}'], args=[rate, per, now])
+        return float(result) if result else None
+    
+    async def expire(self, now):
+        return 0  # Handled by key TTLs
+    
+    async def close(self):
+        await self._redis.close()
+
+
+class CooldownManager:
+    """Applies the Config.COOLDOWNS categories through a pluggable bucket store.
+    
+    Guilds can override a category's duration with the ``cooldowns`` guild
+    setting. Buckets are per command and user, like ``BucketType.user``.
+    """
+    
+    def __init__(self, bot, backend='memory', redis_url=None, expire_interval=60):
+        self.bot = bot
+        self.backend = backend
+        self.redis_url = redis_url
+        self.expire_interval = expire_interval
+        self.store = None
+        self._task = None
+    
+    async def start(self):
+        """Create the store and start the periodic expiry task."""
+        if self.backend == 'sqlite':
+            self.store = SQLiteCooldownStore(self.bot.db)
+            await self.store.setup()
+        elif self.backend == 'redis':
+            self.store = RedisCooldownStore(self.redis_url)
+        else:
+            self.store = MemoryCooldownStore()
+        self._task = asyncio.create_task(self._expire_loop(), name='cooldown-expiry')
+    
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.store is not None:
+            await self.store.close()
+    
+    def get_duration(self, guild, category):
+        """Return the cooldown of a category in a guild, honouring overrides."""
+        if guild is not None:
+            overrides = self.bot.settings.get(guild.id, 'cooldowns', {})
+            if category in overrides:
+                return overrides[category]
+        return Config.COOLDOWNS[category]
+    
+    async def check(self, ctx, category):
+        """Consume the cooldown of a command or raise CommandOnCooldown."""
+        per = self.get_duration(ctx.guild, category)
+        if per <= 0:
+            return True
+        
+        key = f'{ctx.command.qualified_name}:{ctx.author.id}'
+        retry_after = await self.store.acquire(key, 1, per, time.time())
+        if retry_after is not None:
+            raise commands.CommandOnCooldown(commands.Cooldown(1, per), retry_after, commands.BucketType.user)
+        return True
+    
+    async def _expire_loop(self):
+        while True:
+            await asyncio.sleep(self.expire_interval)
+            try:
+                await self.store.expire(time.time())
+            except Exception as e:
+                logger.warning(f"Cooldown expiry failed: {e}")
+
+
+def shared_cooldown(category):
+    """Per-user command cooldown of a Config.COOLDOWNS category, stored in the bot's cooldown backend."""
+    async def predicate(ctx):
+        return await ctx.bot.cooldowns.check(ctx, category)
+    return commands.check(predicate)
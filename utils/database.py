@@ -0,0 +1,64 @@
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+
+class Database:
+    """SQLite connection whose queries run on one worker thread.
+    
+    Keeps disk I/O off the event loop and serialises access without locks.
+    WAL mode lets several cluster processes share the file.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='database')
+        self._db = None
+    
+    async def _call(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+    
+    def _connect(self):
+        self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous=NORMAL')
+    
+    def _execute(self, sql, params):
+        cursor = self._db.execute(sql, params)
+        self._db.commit()
+        return cursor.lastrowid
+    
+    def _executemany(self, sql, seq):
+        self._db.executemany(sql, seq)
+        self._db.commit()
+    
+    def _fetchall(self, sql, params):
+        return self._db.execute(sql, params).fetchall()
+    
+    async def open(self):
+        """Open the connection."""
+        if self._db is None:
+            await self._call(self._connect)
+    
+    async def execute(self, sql, params=()):
+        """Run a statement and commit. Returns the last inserted row id."""
+        return await self._call(self._execute, sql, params)
+    
+    async def executemany(self, sql, seq):
+        """Run a statement for every parameter tuple in one transaction."""
+        await self._call(self._executemany, sql, list(seq))
+    
+    async def fetchall(self, sql, params=()):
+        """Run a query and return all rows."""
+        return await self._call(self._fetchall, sql, params)
+    
+    async def run(self, func, *args):
+        """Call ``func(connection, *args)`` on the worker thread, e.g. for a transaction."""
+        return await self._call(func, self._db, *args)
+    
+    async def close(self):
+        """Close the connection and stop the worker thread."""
+        if self._db is not None:
+            await self._call(self._db.close)
+            self._db = None
+        self._executor.shutdown(wait=False)
@@ -0,0 +1,172 @@
+import math
+import random
+import re
+
+# One term of an expression: NdM with optional keep-highest/lowest, or a constant
+TERM_PATTERN = re.compile(r'([+-])?(?:(\d*)d(\d+)(?:(kh|kl|k)(\d+))?|(\d+))')
+
+# Dice with at most this many faces report a per-face distribution
+DISTRIBUTION_MAX_SIDES = 20
+
+
+class DiceError(ValueError):
+    """Raised for expressions that are malformed or exceed the cost budget."""
+
+
+class DiceBudget:
+    """Limits that bound the work and memory of a single roll."""
+    
+    def __init__(self, max_terms=10, max_dice=10 ** 9, max_sides=10 ** 6, exact_dice=10000, list_dice=100):
+        self.max_terms = max_terms
+        self.max_dice = max_dice        # Dice per term
+        self.max_sides = max_sides
+        self.exact_dice = exact_dice    # Dice rolled one by one per expression, the rest is sampled
+        self.list_dice = list_dice      # Dice per term whose individual results may be listed
+
+
+class TermResult:
+    """Outcome of one term of an expression."""
+    
+    def __init__(self, text, sign, total, rolls=None, kept=None, counts=None, approximate=False):
+        self.text = text
+        self.sign = sign
+        self.total = total
+        self.rolls = rolls          # Individual results, only for small terms
+        self.kept = kept            # Results that counted towards the total with kh/kl
+        self.counts = counts        # face -> count, for large terms with few faces
+        self.approximate = approximate
+
+
+class RollResult:
+    """Outcome of a whole expression."""
+    
+    def __init__(self, terms):
+        self.terms = terms
+        self.total = sum(term.sign * term.total for term in terms)
+        self.approximate = any(term.approximate for term in terms)
+
+
+def _binomial(n, p, rng):
+    """Sample Binomial(n, p) in constant memory (normal approximation for large n)."""
+    if n <= 1000:
+        return sum(1 for _ in range(n) if rng.random() < p)
+    mean = n * p
+    std = math.sqrt(n * p * (1 - p))
+    return min(n, max(0, round(rng.gauss(mean, std))))
+
+
+def _face_counts(count, sides, rng):
+    """Sample how many of ``count`` dice landed on each face (multinomial)."""
+    counts = {}
+    remaining = count
+    for face in range(1, sides):
+        hits = _binomial(remaining, 1 / (sides - face + 1), rng)
+        counts[face] = hits
+        remaining -= hits
+    counts[sides] = remaining
+    return counts
+
+
+def _keep_from_counts(counts, keep, highest):
+    """Sum the ``keep`` highest (or lowest) dice described by face counts."""
+    total = 0
+    faces = sorted(counts, reverse=highest)
+    for face in faces:
+        taken = min(keep, counts[face])
+        total += taken * face
+        keep -= taken
+        if keep == 0:
+            break
+    return total
+
+
+def parse(expression, budget):
+    """Parse an expression like ``4d6kh3+2d8-1`` into term tuples."""
+    text = expression.replace(' ', '').lower()
+    if not text:
+        raise DiceError("Empty dice expression")
+    
+    terms = []
+    position = 0
+    while position < len(text):
+        match = TERM_PATTERN.match(text, position)
+        if not match or match.end() == position or (terms and not match.group(1)):
+            raise DiceError(f"Can't parse `{text[position:]}`")
+        position = match.end()
+        
+        sign = -1 if match.group(1) == '-' else 1
+        if match.group(6) is not None:
+            terms.append((match.group(0).lstrip('+-'), sign, None, int(match.group(6)), None, None))
+            continue
+        
+        count = int(match.group(2)) if match.group(2) else 1
+        sides = int(match.group(3))
+        keep_mode = match.group(4)
+        keep = int(match.group(5)) if keep_mode else None
+        if count < 1 or sides < 1:
+            raise DiceError("Dice count and sides must be at least 1")
+        if count > budget.max_dice:
+            raise DiceError(f"Too many dice (max {budget.max_dice:,} per term)")
+        if sides > budget.max_sides:
+            raise DiceError(f"Too many sides (max {budget.max_sides:,})")
+        if keep is not None and not 1 <= keep <= count:
+            raise DiceError("Keep count must be between 1 and the number of dice")
+        terms.append((match.group(0).lstrip('+-'), sign, count, sides, keep_mode, keep))
+    
+    if len(terms) > budget.max_terms:
+        raise DiceError(f"Too many terms (max {budget.max_terms})")
+    return terms
+
+
+def roll(expression, budget=None, rng=None):
+    """Evaluate a dice expression within ``budget`` and return a RollResult.
+    
+    Small terms are rolled die by die. Once the per-expression exact budget
+    is used up, terms are sampled in constant memory: per-face counts from a
+    multinomial for dice with few faces, otherwise the sum from its normal
+    approximation. Those results are flagged as approximate.
+    """
+    budget = budget or DiceBudget()
+    rng = rng or random.Random()
+    exact_left = budget.exact_dice
+    results = []
+    
+    for text, sign, count, sides, keep_mode, keep in parse(expression, budget):
+        if count is None:
+            results.append(TermResult(text, sign, sides))
+            continue
+        
+        highest = keep_mode in ('kh', 'k')
+        if count <= exact_left:
+            exact_left -= count
+            rolls = [rng.randint(1, sides) for _ in range(count)] if count <= budget.list_dice else None
+            if rolls is not None:
+                kept = sorted(rolls, reverse=highest)[:keep] if keep_mode else None
+                total = sum(kept if kept is not None else rolls)
+                results.append(TermResult(text, sign, total, rolls=rolls, kept=kept))
+                continue
+            
+            # Too many to list: only keep per-face counts
+            counts = {}
+            for _ in range(count):
+                face = rng.randint(1, sides)
+                counts[face] = counts.get(face, 0) + 1
+            total = _keep_from_counts(counts, keep, highest) if keep_mode else sum(face * n for face, n in counts.items())
+            results.append(TermResult(text, sign, total, counts=counts if sides <= DISTRIBUTION_MAX_SIDES else None))
+            continue
+        
+        if sides <= DISTRIBUTION_MAX_SIDES:
+            counts = _face_counts(count, sides, rng)
+            total = _keep_from_counts(counts, keep, highest) if keep_mode else sum(face * n for face, n in counts.items())
+            results.append(TermResult(text, sign, total, counts=counts, approximate=True))
+            continue
+        
+        if keep_mode:
+            raise DiceError(f"Keeping dice from `{text}` is too expensive (max {budget.exact_dice:,} dice with more than {DISTRIBUTION_MAX_SIDES} sides)")
+        
+        mean = count * (sides + 1) / 2
+        std = math.sqrt(count * (sides * sides - 1) / 12)
+        total = min(count * sides, max(count, round(rng.gauss(mean, std))))
+        results.append(TermResult(text, sign, total, approximate=True))
+    
+    return RollResult(results)
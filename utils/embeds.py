@@ -0,0 +1,46 @@
+import copy
+
+
+class EmbedTemplates:
+    """Registry of static embeds that are built once and copied per request.
+    
+    Cogs register a builder for each embed whose content only depends on
+    configuration. The embed is built on first use and cached; ``get`` hands
+    out a cheap copy with a fresh field list, so callers can set per-request
+    parts such as the footer or author without touching the template.
+    Templates are rebuilt after ``invalidate`` or when their builder is
+    registered again, e.g. by a reloaded cog.
+    """
+    
+    def __init__(self):
+        self._builders = {}  # name -> builder
+        self._cache = {}     # name -> embed
+        self.builds = 0
+    
+    def register(self, name, builder):
+        """Register (or replace) the builder of a template."""
+        self._builders[name] = builder
+        self._cache.pop(name, None)
+    
+    def invalidate(self, name=None):
+        """Drop one cached template, or all of them."""
+        if name is None:
+            self._cache.clear()
+        else:
+            self._cache.pop(name, None)
+    
+    def get(self, name, footer=None):
+        """Return a copy of a template, optionally with a footer text."""
+        template = self._cache.get(name)
+        if template is None:
+            template = self._cache[name] = self._builders[name]()
+            self.builds += 1
+        
+        embed = copy.copy(template)
+        embed._fields = list(getattr(embed, '_fields', []))
+        if footer is not None:
+            embed.set_footer(text=footer)
+        return embed
+    
+    def __len__(self):
+        return len(self._cache)
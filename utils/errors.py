@@ -0,0 +1,119 @@
+import logging
+import random
+import time
+import traceback
+from collections import Counter, deque
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+
+class ErrorReporter:
+    """The single place command errors are counted, logged and answered.
+    
+    Replies are throttled per user, channel and error type: within
+    ``reply_window`` seconds only the first error of a kind gets a reply.
+    Unexpected errors are counted by type and command, and a sample of them
+    (``trace_sample_rate``, plus the first of each kind) is logged with its
+    full stack and kept in ``traces`` for inspection.
+    """
+    
+    def __init__(self, reply_window=10, trace_sample_rate=0.1, max_traces=20):
+        self.reply_window = reply_window
+        self.trace_sample_rate = trace_sample_rate
+        self.counts = Counter()          # (error type, command) -> count
+        self.traces = deque(maxlen=max_traces)
+        self.suppressed = 0
+        self._last_reply = {}            # (user_id, channel_id, error type) -> monotonic time
+    
+    def should_reply(self, ctx, error):
+        """Check (and record) whether this error may be answered now."""
+        now = time.monotonic()
+        key = (ctx.author.id, ctx.channel.id, type(error).__name__)
+        last = self._last_reply.get(key)
+        if last is not None and now - last < self.reply_window:
+            self.suppressed += 1
+            return False
+        
+        self._last_reply[key] = now
+        if len(self._last_reply) > 10000:
+            # Drop expired entries so the throttle table stays bounded
+            self._last_reply = {k: t for k, t in self._last_reply.items() if now - t < self.reply_window}
+        return True
+    
+    def capture(self, ctx, error):
+        """Log an unexpected error, with its stack for sampled occurrences."""
+        command = ctx.command.qualified_name if ctx.command else None
+        first = self.counts[(type(error).__name__, command)] == 1
+        extra = {
+            'guild_id': ctx.guild.id if ctx.guild else None,
+            'command': command
+        }
+        
+        if first or random.random() < self.trace_sample_rate:
+            trace = ''.join(traceback.format_exception(type(error), error, error.__traceback__))
+            self.traces.append((time.time(), command, trace))
+            logger.error(f"Unexpected error in command {command}: {error}\n{trace}", extra=extra)
+        else:
+            logger.error(f"Unexpected error in command {command}: {error}", extra=extra)
+    
+    def build_embed(self, error):
+        """Return the reply embed for an error."""
+        if isinstance(error, commands.MissingPermissions):
+            return discord.Embed(
+                title="❌ Permission Error",
+                description="You don't have permission to use this command!",
+                color=Config.EMBED_COLORS['error']
+            )
+        if isinstance(error, commands.BadArgument):
+            return discord.Embed(
+                title="❌ Invalid Argument",
+                description=str(error),
+                color=Config.EMBED_COLORS['error']
+            )
+        if isinstance(error, commands.CommandOnCooldown):
+            return discord.Embed(
+                title="⏰ Cooldown",
+                description=f"Please wait {error.retry_after:.2f} seconds before using this command again.",
+                color=Config.EMBED_COLORS['warning']
+            )
+        return discord.Embed(
+            title="❌ Error",
+            description="An unexpected error occurred. Please try again later.",
+            color=Config.EMBED_COLORS['error']
+        )
+    
+    async def handle(self, ctx, error):
+        """Count, log and (throttled) answer a command error."""
+        if isinstance(error, commands.CommandNotFound):
+            return  # Ignore command not found errors
+        
+        # Report the exception the command actually raised; slash invocations
+        # of hybrid commands wrap it in HybridCommandError and app_commands' own error
+        if isinstance(error, commands.HybridCommandError):
+            error = error.original
+        if isinstance(error, (commands.CommandInvokeError, app_commands.CommandInvokeError)):
+            error = error.original
+        
+        command = ctx.command.qualified_name if ctx.command else None
+        self.counts[(type(error).__name__, command)] += 1
+        
+        # Command errors (bad input, failed checks, cooldowns) are expected
+        if not isinstance(error, (commands.CommandError, app_commands.AppCommandError)):
+            self.capture(ctx, error)
+        
+        if not self.should_reply(ctx, error):
+            return
+        
+        try:
+            await ctx.send(embed=self.build_embed(error))
+        except discord.HTTPException:
+            pass
+    
+    def summary(self, limit=15):
+        """Return the most frequent (error type, command, count) entries."""
+        return [(error_type, command, count) for (error_type, command), count in self.counts.most_common(limit)]
@@ -0,0 +1,142 @@
+import copy
+import gzip
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import shutil
+import time
+
+# Extra record attributes that are promoted to top-level JSON fields
+STRUCTURED_FIELDS = ('guild_id', 'channel_id', 'user_id', 'command', 'latency_ms', 'rest_ms', 'rest_calls', 'cpu_ms')
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as one JSON object per line."""
+    
+    def format(self, record):
+        data = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        if record.exc_info:
+            data['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _gzip_namer(name):
+    return name + '.gz'
+
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as src, gzip.open(dest, 'wb') as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class CompressingRotatingFileHandler(logging.handlers.TimedRotatingFileHandler):
+    """Rotate on a time schedule or once the file exceeds ``max_bytes``, gzipping old files."""
+    
+    def __init__(self, filename, when='midnight', max_bytes=0, backup_count=7, encoding='utf-8'):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding=encoding)
+        self.max_bytes = max_bytes
+        self.namer = _gzip_namer
+        self.rotator = _gzip_rotator
+        # Name rotated files by the rollover time so size rollovers never collide
+        self.suffix = '%Y-%m-%d_%H-%M-%S'
+        self.extMatch = re.compile(r'^\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}(_\d+)?$', re.ASCII)
+    
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes > 0 and self.stream is not None:
+            self.stream.seek(0, 2)
+            return self.stream.tell() >= self.max_bytes
+        return False
+    
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        
+        now = time.time()
+        stamp = time.strftime(self.suffix, time.localtime(now))
+        dest = self.rotation_filename(f"{self.baseFilename}.{stamp}")
+        counter = 1
+        while os.path.exists(dest):
+            dest = self.rotation_filename(f"{self.baseFilename}.{stamp}_{counter}")
+            counter += 1
+        self.rotate(self.baseFilename, dest)
+        if self.backupCount > 0:
+            for old_file in self.getFilesToDelete():
+                os.remove(old_file)
+        
+        self.stream = self._open()
+        self.rolloverAt = self.computeRollover(int(now))
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+    
+    The stock handler formats every record before enqueueing it, which
+    keeps most of the cost on the event loop. Here only the message is
+    merged with its arguments (so mutable args can't change later).
+    """
+    
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(level=logging.INFO, log_file='bot.log', json_format=True, use_queue=True,
+                  max_bytes=0, backup_count=7, rotate_when='midnight'):
+    """Configure root logging.
+    
+    With ``use_queue`` the root logger only gets a QueueHandler, so logging
+    calls on the event loop never touch the disk; a QueueListener thread
+    formats and writes the records. Returns the listener (or None), which
+    must be stopped on shutdown to flush pending records.
+    """
+    text_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    
+    file_handler = CompressingRotatingFileHandler(
+        log_file,
+        when=rotate_when,
+        max_bytes=max_bytes,
+        backup_count=backup_count
+    )
+    file_handler.setFormatter(JsonFormatter() if json_format else text_formatter)
+    
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(text_formatter)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    
+    if not use_queue:
+        root.addHandler(file_handler)
+        root.addHandler(stream_handler)
+        return None
+    
+    log_queue = queue.SimpleQueue()
+    root.addHandler(DeferredQueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(
+        log_queue,
+        file_handler,
+        stream_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    return listener
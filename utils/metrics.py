@@ -0,0 +1,222 @@
+import bisect
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Snowflakes and interaction/webhook tokens in REST paths, collapsed so each
+# route is a single label value
+SNOWFLAKE_PATTERN = re.compile(r'/\d{15,}')
+TOKEN_PATTERN = re.compile(r'/[\w.-]{60,}')
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{value}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def route_label(method, path):
+    """Return a low-cardinality route label like ``POST /channels/{id}/messages``."""
+    path = SNOWFLAKE_PATTERN.sub('/{id}', path)
+    path = TOKEN_PATTERN.sub('/{token}', path)
+    return f'{method} {path}'
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+    
+    type = 'counter'
+    
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.values = {}
+    
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+    
+    def samples(self):
+        for labels, value in self.values.items():
+            yield self.name, _labels(self.labels, labels), value
+
+
+class Histogram:
+    """Cumulative histogram with fixed buckets, optionally split by labels."""
+    
+    type = 'histogram'
+    
+    def __init__(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self.values = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+    
+    def observe(self, value, *labels):
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect.bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+    
+    def samples(self):
+        for labels, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), series):
+                cumulative += count
+                yield f'{self.name}_bucket', _labels(self.labels, labels, [('le', bound)]), cumulative
+            yield f'{self.name}_sum', _labels(self.labels, labels), series[-1]
+            yield f'{self.name}_count', _labels(self.labels, labels), cumulative
+
+
+class Gauge:
+    """Value read from a callback at scrape time.
+    
+    The callback returns a number, or an iterable of ``(label values, number)``
+    pairs when the gauge has labels.
+    """
+    
+    type = 'gauge'
+    
+    def __init__(self, name, help, callback, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.callback = callback
+    
+    def samples(self):
+        value = self.callback()
+        if not self.labels:
+            yield self.name, '', value
+            return
+        for labels, item in value:
+            yield self.name, _labels(self.labels, labels), item
+
+
+class MetricsRegistry:
+    """In-process metrics rendered in the Prometheus text format.
+    
+    Recording is a dict update on the event loop, so metrics are always
+    collected; the HTTP endpoint only formats them when scraped.
+    """
+    
+    def __init__(self):
+        self.metrics = {}
+    
+    def _add(self, metric):
+        self.metrics[metric.name] = metric
+        return metric
+    
+    def counter(self, name, help, labels=()):
+        return self._add(Counter(name, help, labels))
+    
+    def histogram(self, name, help, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help, labels, buckets))
+    
+    def gauge(self, name, help, callback, labels=()):
+        return self._add(Gauge(name, help, callback, labels))
+    
+    def render(self):
+        lines = []
+        for metric in self.metrics.values():
+            lines.append(f'# HELP {metric.name} {metric.help}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            try:
+                for name, labels, value in metric.samples():
+                    lines.append(f'{name}{labels} {value}')
+            except Exception as e:
+                logger.warning(f"Failed to collect metric {metric.name}: {e}")
+        return '\n'.join(lines) + '\n'
+
+
+class BotMetrics:
+    """The bot's metrics and the hooks that feed them."""
+    
+    def __init__(self, bot):
+        self.bot = bot
+        self.registry = MetricsRegistry()
+        
+        self.commands = self.registry.counter(
+            'discord_commands_total', "Commands invoked, by command and outcome.", ('command', 'outcome')
+        )
+        self.command_duration = self.registry.histogram(
+            'discord_command_duration_seconds', "Time spent running a command.", ('command',)
+        )
+        self.rest_requests = self.registry.counter(
+            'discord_rest_requests_total', "REST requests made, by route and status.", ('route', 'status')
+        )
+        self.rest_ratelimits = self.registry.counter(
+            'discord_rest_ratelimits_total', "REST responses with status 429, by route.", ('route',)
+        )
+        self.interaction_duration = self.registry.histogram(
+            'discord_role_interaction_duration_seconds', "Time to handle a role view interaction.", ('action',)
+        )
+        self.registry.gauge(
+            'discord_heartbeat_latency_seconds', "Gateway heartbeat latency per shard.",
+            lambda: (((shard_id,), latency) for shard_id, latency in bot.latencies
+                     if latency == latency and latency != float('inf')),
+            ('shard',)
+        )
+        self.registry.gauge(
+            'discord_cache_size', "Number of cached objects.", self.cache_sizes, ('cache',)
+        )
+    
+    def cache_sizes(self):
+        bot = self.bot
+        return [
+            (('guilds',), len(bot.guilds)),
+            (('users',), len(bot.users)),
+            (('members',), sum(len(guild.members) for guild in bot.guilds)),
+            (('messages',), len(bot.cached_messages)),
+            (('roles',), bot.role_cache.stats()['roles'])
+        ]
+    
+    def attach_trace(self, trace):
+        """Count REST responses and 429s through an aiohttp trace config."""
+        async def on_request_end(session, context, params):
+            route = route_label(params.method, params.url.path)
+            status = params.response.status
+            self.rest_requests.inc(route, status)
+            if status == 429:
+                self.rest_ratelimits.inc(route)
+        
+        trace.on_request_end.append(on_request_end)
+
+
+class MetricsServer:
+    """Serves ``/metrics`` for a registry from the bot's event loop."""
+    
+    def __init__(self, registry, host, port):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+    
+    async def handle(self, request):
+        from aiohttp import web
+        return web.Response(text=self.registry.render(), content_type='text/plain', charset='utf-8')
+    
+    async def start(self):
+        # aiohttp.web is only needed when metrics are enabled
+        from aiohttp import web
+        
+        app = web.Application()
+        app.router.add_get('/metrics', self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+    
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,196 @@
+import asyncio
+import re
+import time
+
+import discord
+
+# Raw snowflakes and user mentions
+TARGET_PATTERN = re.compile(r'^(?:<@!?(\d{15,20})>|(\d{15,20}))$')
+SNOWFLAKE_PATTERN = re.compile(r'(?<!\d)\d{15,20}(?!\d)')
+
+# query_members accepts up to 100 user ids per gateway request
+QUERY_CHUNK = 100
+
+
+def parse_targets(text):
+    """Split command text into target ids and the remaining words as the reason.
+    
+    IDs and mentions may be separated by spaces, commas or newlines; every
+    other word belongs to the reason. Duplicates are dropped, order is kept.
+    """
+    ids = []
+    words = []
+    for token in re.split(r'[\s,;]+', text.strip()):
+        if not token:
+            continue
+        match = TARGET_PATTERN.match(token)
+        if match:
+            ids.append(int(match.group(1) or match.group(2)))
+        else:
+            words.append(token)
+    return list(dict.fromkeys(ids)), " ".join(words)
+
+
+def parse_id_file(content):
+    """Return every snowflake in a pasted or attached ID list, in order and without duplicates."""
+    return list(dict.fromkeys(int(match) for match in SNOWFLAKE_PATTERN.findall(content)))
+
+
+async def resolve_members(guild, user_ids):
+    """Map the given ids to members, from the cache or with batched gateway lookups.
+    
+    Returns ``(members, unresolved)``: ids that are not members of the guild
+    are missing from ``members``, and ids whose lookup timed out are in the
+    ``unresolved`` set, since they may well be members. No REST request is
+    made.
+    """
+    members = {}
+    unresolved = set()
+    missing = []
+    for user_id in user_ids:
+        member = guild.get_member(user_id)
+        if member is not None:
+            members[user_id] = member
+        else:
+            missing.append(user_id)
+    
+    for i in range(0, len(missing), QUERY_CHUNK):
+        chunk = missing[i:i + QUERY_CHUNK]
+        try:
+            found = await guild.query_members(user_ids=chunk, limit=QUERY_CHUNK, cache=False)
+        except asyncio.TimeoutError:
+            unresolved.update(chunk)
+            continue
+        members.update((member.id, member) for member in found)
+    return members, unresolved
+
+
+class ModerationOperation:
+    """A single kick, ban or unban and, once applied, its outcome."""
+    
+    def __init__(self, action, user_id, member=None):
+        self.action = action    # 'kick', 'ban' or 'unban'
+        self.user_id = user_id
+        self.member = member    # Resolved member, None for users outside the guild
+        self.ok = None
+        self.error = None
+    
+    def describe(self):
+        """Return a one-line result for the report."""
+        name = f"{self.member} ({self.user_id})" if self.member is not None else str(self.user_id)
+        if self.ok:
+            return f"✅ {name}"
+        return f"❌ {name}: {self.error}"
+
+
+class ModerationPlan:
+    """Targets of a bulk action, split into operations and skipped ids."""
+    
+    def __init__(self, operations, skipped):
+        self.operations = operations
+        self.skipped = skipped  # (user_id, reason) pairs that need no request
+    
+    @classmethod
+    def for_members(cls, action, guild, author, user_ids, members, unresolved=()):
+        """Plan a kick or ban, skipping targets the author or the bot may not act on.
+        
+        Targets in ``unresolved`` are skipped too: without their member the
+        role hierarchy cannot be checked.
+        """
+        operations = []
+        skipped = []
+        for user_id in user_ids:
+            if user_id in unresolved:
+                skipped.append((user_id, "lookup failed"))
+                continue
+            
+            member = members.get(user_id)
+            if member is None:
+                if action == 'kick':
+                    skipped.append((user_id, "not a member"))
+                else:
+                    # Banning works for users who already left
+                    operations.append(ModerationOperation(action, user_id))
+                continue
+            
+            if member == author:
+                skipped.append((user_id, "yourself"))
+            elif member == guild.me or member == guild.owner:
+                skipped.append((user_id, "protected member"))
+            elif author != guild.owner and member.top_role >= author.top_role:
+                skipped.append((user_id, "higher or equal role"))
+            elif member.top_role >= guild.me.top_role:
+                skipped.append((user_id, "above the bot's role"))
+            else:
+                operations.append(ModerationOperation(action, user_id, member))
+        return cls(operations, skipped)
+    
+    @classmethod
+    def for_unban(cls, user_ids):
+        """Plan an unban of every id; ids that are not banned fail with "not banned"."""
+        return cls([ModerationOperation('unban', user_id) for user_id in user_ids], [])
+    
+    @property
+    def succeeded(self):
+        return [op for op in self.operations if op.ok]
+    
+    @property
+    def failed(self):
+        return [op for op in self.operations if op.ok is False]
+
+
+class BulkModerator:
+    """Applies a ModerationPlan with bounded concurrency.
+    
+    Kicks, bans and unbans each share one rate-limit bucket per guild.
+    discord.py serialises requests within a bucket and waits out 429s; the
+    per-bucket semaphore caps how many are queued at once so a raid cleanup
+    does not starve other commands.
+    """
+    
+    def __init__(self, concurrency=5):
+        self.concurrency = max(1, concurrency)
+        self._semaphores = {}
+    
+    def _semaphore(self, route):
+        if route not in self._semaphores:
+            self._semaphores[route] = asyncio.Semaphore(self.concurrency)
+        return self._semaphores[route]
+    
+    async def _apply_one(self, guild, operation, reason):
+        async with self._semaphore((operation.action, guild.id)):
+            target = operation.member or discord.Object(id=operation.user_id)
+            try:
+                if operation.action == 'kick':
+                    await guild.kick(target, reason=reason)
+                elif operation.action == 'ban':
+                    await guild.ban(target, reason=reason)
+                else:
+                    await guild.unban(target, reason=reason)
+                operation.ok = True
+            except discord.NotFound:
+                operation.ok = False
+                operation.error = "not banned" if operation.action == 'unban' else "unknown user"
+            except discord.Forbidden:
+                operation.ok = False
+                operation.error = "no permission"
+            except discord.HTTPException as e:
+                operation.ok = False
+                operation.error = f"error: {e}"
+        return operation
+    
+    async def apply(self, guild, plan, reason, progress=None):
+        """Apply every operation of a plan, calling ``progress(done, total)`` as they finish.
+        
+        Returns the total wall-clock time in seconds.
+        """
+        start = time.perf_counter()
+        total = len(plan.operations)
+        done = 0
+        tasks = [asyncio.create_task(self._apply_one(guild, op, reason)) for op in plan.operations]
+        for task in asyncio.as_completed(tasks):
+            await task
+            done += 1
+            if progress is not None:
+                await progress(done, total)
+        return time.perf_counter() - start
@@ -0,0 +1,81 @@
+import asyncio
+import time
+
+import discord
+
+
+def muted_permissions(channel):
+    """Return the overwrite values the Muted role needs in a channel, or None."""
+    if isinstance(channel, discord.TextChannel):
+        return {'send_messages': False}
+    if isinstance(channel, discord.VoiceChannel):
+        return {'speak': False}
+    return None
+
+
+def needs_overwrite(channel, role, permissions):
+    """Check whether a channel's overwrite for ``role`` differs from ``permissions``."""
+    current = channel.overwrites_for(role)
+    return any(getattr(current, name) != value for name, value in permissions.items())
+
+
+class OverwriteSyncResult:
+    """Outcome of an overwrite sync run."""
+    
+    def __init__(self):
+        self.updated = 0
+        self.skipped = 0
+        self.failed = []  # (channel, error) pairs
+        self.elapsed = 0.0
+
+
+class OverwriteSync:
+    """Applies the Muted role overwrite to every channel of a guild.
+    
+    Channels that already carry the right overwrite are skipped without a
+    request; the rest are updated concurrently, bounded by ``concurrency``
+    (each channel has its own rate-limit bucket, so the cap mainly protects
+    the global limit).
+    """
+    
+    def __init__(self, concurrency=5):
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+    
+    def plan(self, guild, role):
+        """Return (channel, permissions) pairs that need updating."""
+        pending = []
+        for channel in guild.channels:
+            permissions = muted_permissions(channel)
+            if permissions and needs_overwrite(channel, role, permissions):
+                pending.append((channel, permissions))
+        return pending
+    
+    async def apply_channel(self, channel, role, permissions, reason=None):
+        """Set the overwrite on a single channel."""
+        async with self.semaphore:
+            await channel.set_permissions(role, reason=reason, **permissions)
+    
+    async def sync(self, guild, role, reason=None, progress=None):
+        """Bring every channel of ``guild`` in line, calling ``progress(done, total)``."""
+        result = OverwriteSyncResult()
+        start = time.perf_counter()
+        pending = self.plan(guild, role)
+        result.skipped = sum(1 for channel in guild.channels if muted_permissions(channel)) - len(pending)
+        
+        async def run(channel, permissions):
+            try:
+                await self.apply_channel(channel, role, permissions, reason)
+                result.updated += 1
+            except discord.HTTPException as e:
+                result.failed.append((channel, e))
+        
+        tasks = [asyncio.create_task(run(channel, permissions)) for channel, permissions in pending]
+        done = 0
+        for task in asyncio.as_completed(tasks):
+            await task
+            done += 1
+            if progress is not None:
+                await progress(done, len(pending))
+        
+        result.elapsed = time.perf_counter() - start
+        return result
@@ -0,0 +1,200 @@
+import asyncio
+import contextvars
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Timing of the command or view callback running in the current task
+current_timing = contextvars.ContextVar('current_timing', default=None)
+
+
+class Timing:
+    """Wall, REST and CPU time of one command or view callback."""
+    
+    __slots__ = ('name', 'start', 'cpu_start', 'rest', 'rest_calls')
+    
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        self.rest = 0.0
+        self.rest_calls = 0
+
+
+class Profiler:
+    """Times every command and view callback and logs the slow ones.
+    
+    REST time is the time spent in HTTP requests made from the timed task
+    (and tasks it spawns). CPU time is the event loop thread's CPU time while
+    the invocation ran, so it is an upper bound when other events interleave.
+    """
+    
+    def __init__(self, slow_threshold=1.0):
+        self.slow_threshold = slow_threshold
+        self.slow_count = 0
+    
+    def start(self, name):
+        """Start timing ``name`` in the current task."""
+        timing = Timing(name)
+        current_timing.set(timing)
+        return timing
+    
+    def finish(self, timing, **extra):
+        """Stop a timing and log it if it exceeded the threshold."""
+        elapsed = time.perf_counter() - timing.start
+        if elapsed < self.slow_threshold:
+            return elapsed
+        
+        self.slow_count += 1
+        cpu = min(time.thread_time() - timing.cpu_start, elapsed)
+        logger.warning(
+            f"Slow {timing.name}: {elapsed * 1000:.0f}ms "
+            f"(REST {timing.rest * 1000:.0f}ms over {timing.rest_calls} calls, CPU {cpu * 1000:.0f}ms)",
+            extra={
+                'latency_ms': round(elapsed * 1000, 1),
+                'rest_ms': round(timing.rest * 1000, 1),
+                'rest_calls': timing.rest_calls,
+                'cpu_ms': round(cpu * 1000, 1),
+                **extra
+            }
+        )
+        return elapsed
+    
+    async def before_command(self, ctx):
+        """Global before_invoke hook."""
+        ctx.timing = self.start(f"command {ctx.command.qualified_name}")
+    
+    async def after_command(self, ctx):
+        """Global after_invoke hook."""
+        timing = getattr(ctx, 'timing', None)
+        if timing is not None:
+            self.finish(
+                timing,
+                guild_id=ctx.guild.id if ctx.guild else None,
+                channel_id=ctx.channel.id,
+                user_id=ctx.author.id,
+                command=ctx.command.qualified_name
+            )
+    
+    def attach_trace(self, trace):
+        """Add REST timing to an aiohttp trace config."""
+        async def on_request_start(session, context, params):
+            context.profile_start = time.perf_counter()
+        
+        async def on_request_done(session, context, params):
+            timing = current_timing.get()
+            if timing is not None:
+                timing.rest += time.perf_counter() - context.profile_start
+                timing.rest_calls += 1
+        
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_end.append(on_request_done)
+        trace.on_request_exception.append(on_request_done)
+
+
+class ProfiledView(discord.ui.View):
+    """View whose item callbacks are timed by the bot's profiler.
+    
+    Timing starts in ``interaction_check`` and ends when the task running
+    the callback finishes. Subclasses overriding ``interaction_check`` must
+    call the base implementation.
+    """
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        profiler = getattr(interaction.client, 'profiler', None)
+        if profiler is not None:
+            custom_id = interaction.data.get('custom_id', '?')
+            timing = profiler.start(f"view {type(self).__name__}:{custom_id}")
+            asyncio.current_task().add_done_callback(
+                lambda _: profiler.finish(
+                    timing,
+                    guild_id=interaction.guild_id,
+                    channel_id=interaction.channel_id,
+                    user_id=interaction.user.id
+                )
+            )
+        return True
+
+
+class StackSampler:
+    """Sampling profiler for one thread (by default the event loop's).
+    
+    A background thread records the target thread's stack every
+    ``interval`` seconds, so it sees live traffic without instrumenting it.
+    """
+    
+    def __init__(self, thread_id=None, interval=0.005):
+        self.thread_id = thread_id or threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+    
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+    
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_label(frame))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+            self.samples += 1
+    
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='stack-sampler', daemon=True)
+        self._thread.start()
+    
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+    
+    async def run(self, seconds):
+        """Sample for ``seconds`` without blocking the event loop."""
+        self.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.stop()
+    
+    def report(self, top=40):
+        """Return a text summary: hottest functions, then collapsed stacks."""
+        own = Counter()
+        total = Counter()
+        for stack, count in self.stacks.items():
+            own[stack[-1]] += count
+            for label in set(stack):
+                total[label] += count
+        
+        samples = self.samples or 1
+        lines = [f"{self.samples} samples every {self.interval * 1000:g}ms", ""]
+        lines.append(f"Top {top} by own time (function running when sampled)")
+        lines.append(f"{'own %':>7} {'total %':>8}  function")
+        for label, count in own.most_common(top):
+            lines.append(f"{count / samples:>7.1%} {total[label] / samples:>8.1%}  {label}")
+        
+        lines.append("")
+        lines.append(f"Top {top} by total time (function on the stack when sampled)")
+        lines.append(f"{'total %':>8}  function")
+        for label, count in total.most_common(top):
+            lines.append(f"{count / samples:>8.1%}  {label}")
+        
+        # Collapsed stacks, loadable by flamegraph.pl and speedscope
+        lines.append("")
+        lines.append("Collapsed stacks")
+        for stack, count in self.stacks.most_common():
+            lines.append(f"{';'.join(stack)} {count}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,31 @@
+import time
+
+import discord
+from config import Config
+
+
+def progress_reporter(message, title, interval=1.0):
+    """Return an async ``progress(done, total)`` callback that edits ``message``.
+    
+    Edits are throttled to one per ``interval`` seconds (the final update is
+    always sent) so long operations don't spend their rate limit on progress.
+    """
+    last_edit = 0.0
+    
+    async def progress(done, total):
+        nonlocal last_edit
+        now = time.monotonic()
+        if done != total and now - last_edit < interval:
+            return
+        last_edit = now
+        embed = discord.Embed(
+            title=title,
+            description=f"Progress: **{done}/{total}**",
+            color=Config.EMBED_COLORS['info']
+        )
+        try:
+            await message.edit(embed=embed)
+        except discord.HTTPException:
+            pass
+    
+    return progress
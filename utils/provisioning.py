@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import discord
+
+
+class RoleOperation:
+    """A single planned role change and, once applied, its outcome."""
+    
+    def __init__(self, action, role_name, role=None):
+        self.action = action        # 'create' or 'delete'
+        self.role_name = role_name
+        self.role = role
+        self.ok = None
+        self.error = None
+        self.elapsed = 0.0
+    
+    def describe(self):
+        """Return a one-line result suitable for an embed."""
+        if self.ok is None:
+            return f"➕ {self.role_name}" if self.action == 'create' else f"➖ {self.role_name}"
+        if self.ok:
+            return f"✅ {self.role_name} ({self.elapsed:.2f}s)"
+        return f"❌ {self.role_name} ({self.error})"
+
+
+class RolePlan:
+    """Diff between the configured roles and the roles that exist in a guild."""
+    
+    def __init__(self, operations, unchanged):
+        self.operations = operations
+        self.unchanged = unchanged  # Role names that need no change
+    
+    @classmethod
+    def for_create(cls, guild, role_names, role_cache):
+        """Plan the creation of every configured role that does not exist yet."""
+        operations = []
+        unchanged = []
+        for role_name in role_names:
+            if role_cache.get(guild, role_name):
+                unchanged.append(role_name)
+            else:
+                operations.append(RoleOperation('create', role_name))
+        return cls(operations, unchanged)
+    
+    @classmethod
+    def for_delete(cls, guild, role_names, role_cache):
+        """Plan the deletion of every configured role that exists."""
+        operations = []
+        unchanged = []
+        for role_name in role_names:
+            role = role_cache.get(guild, role_name)
+            if role:
+                operations.append(RoleOperation('delete', role_name, role))
+            else:
+                unchanged.append(role_name)
+        return cls(operations, unchanged)
+    
+    @property
+    def failed(self):
+        return [op for op in self.operations if op.ok is False]
+
+
+class RoleProvisioner:
+    """Applies a RolePlan with bounded concurrency.
+    
+    discord.py already serialises requests that share a rate-limit bucket and
+    waits out 429s; the per-route semaphores here only cap how many requests
+    are queued against each bucket at once so a large plan cannot starve
+    other commands.
+    """
+    
+    def __init__(self, concurrency=4):
+        self.concurrency = max(1, concurrency)
+        self._semaphores = {}
+    
+    def _semaphore(self, route):
+        if route not in self._semaphores:
+            self._semaphores[route] = asyncio.Semaphore(self.concurrency)
+        return self._semaphores[route]
+    
+    async def _apply_one(self, guild, operation, reason):
+        # Creations and deletions are each capped per guild: the guild is the major
+        # parameter of both routes, so Discord rate-limits them per guild as well
+        route = ('create_role', guild.id) if operation.action == 'create' else ('delete_role', guild.id)
+        async with self._semaphore(route):
+            start = time.perf_counter()
+            try:
+                if operation.action == 'create':
+                    operation.role = await guild.create_role(
+                        name=operation.role_name,
+                        color=discord.Color.default(),
+                        reason=reason
+                    )
+                else:
+                    await operation.role.delete(reason=reason)
+                operation.ok = True
+            except discord.Forbidden:
+                operation.ok = False
+                operation.error = "no permission"
+            except Exception as e:
+                operation.ok = False
+                operation.error = f"error: {str(e)}"
+            finally:
+                operation.elapsed = time.perf_counter() - start
+        return operation
+    
+    async def apply(self, guild, plan, reason, progress=None):
+        """Apply every operation of a plan, calling ``progress(done, total)`` as they finish.
+        
+        Returns the total wall-clock time in seconds.
+        """
+        start = time.perf_counter()
+        total = len(plan.operations)
+        done = 0
+        tasks = [asyncio.create_task(self._apply_one(guild, op, reason)) for op in plan.operations]
+        for task in asyncio.as_completed(tasks):
+            await task
+            done += 1
+            if progress is not None:
+                await progress(done, total)
+        return time.perf_counter() - start
@@ -0,0 +1,222 @@
+import asyncio
+import re
+import time
+from datetime import timedelta
+
+import discord
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+# Bulk delete only accepts messages younger than 14 days; the margin covers
+# messages that age past the limit while a long walk is still running
+BULK_DELETE_MAX_AGE = timedelta(days=14) - timedelta(minutes=10)
+
+# Messages per bulk delete request
+BULK_DELETE_CHUNK = 100
+
+# Filter patterns are matched on the event loop; these limits keep a
+# backtracking pattern from stalling it on long messages
+MAX_PATTERN_LENGTH = 100
+MAX_CONTENT_LENGTH = 4000  # Longest message content, the most an unbounded repeat can take
+MAX_PATTERN_COST = 4 * MAX_CONTENT_LENGTH
+
+REPEAT_OPCODES = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+
+
+def _pattern_cost(parsed):
+    """Estimate how many ways a parsed pattern can match one position. Raises re.error.
+    
+    Variable repeats multiply the cost by the number of counts they can
+    take, branches add up their alternatives, and a repeated item that can
+    itself match in several ways is counted once per repetition, so a
+    fixed ``{26}`` around an optional item costs 2**26. The result is
+    capped just above MAX_PATTERN_COST.
+    """
+    cost = 1
+    for op, av in parsed:
+        if op in REPEAT_OPCODES:
+            low, high, item = av
+            high = min(high, MAX_CONTENT_LENGTH)
+            body = _pattern_cost(item)
+            counts = max(1, high - low + 1)
+            cost *= counts * body ** min(high, 64) if body > 1 else counts
+        elif op is sre_constants.BRANCH:
+            cost *= sum(_pattern_cost(branch) for branch in av[1])
+        elif op is sre_constants.SUBPATTERN:
+            cost *= _pattern_cost(av[-1])
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            cost *= _pattern_cost(av[1])
+        elif op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS):
+            raise re.error("backreferences are not supported")
+        cost = min(cost, MAX_PATTERN_COST + 1)
+    return cost
+
+
+def compile_filter_pattern(text):
+    r"""Compile a user-supplied content filter, rejecting patterns that may backtrack badly.
+    
+    Patterns are limited in length, may not use backreferences, and their
+    estimated backtracking cost must stay within MAX_PATTERN_COST: one
+    ``*`` or ``+`` plus a couple of ``?`` is fine, two overlapping ``*`` or
+    nested quantifiers are not. Raises re.error.
+    
+    >>> compile_filter_pattern(r'https?://discord\.gg/\S+').pattern
+    'https?://discord\\.gg/\\S+'
+    >>> compile_filter_pattern(r'(?:a?){26}a{26}')
+    Traceback (most recent call last):
+    ...
+    re.error: too many ways to match, use fewer or simpler quantifiers
+    """
+    if len(text) > MAX_PATTERN_LENGTH:
+        raise re.error(f"longer than {MAX_PATTERN_LENGTH} characters")
+    pattern = re.compile(text, re.IGNORECASE)
+    if _pattern_cost(sre_parse.parse(text, re.IGNORECASE)) > MAX_PATTERN_COST:
+        raise re.error("too many ways to match, use fewer or simpler quantifiers")
+    return pattern
+
+
+class MessageFilter:
+    """Which messages a purge deletes."""
+    
+    def __init__(self, author_id=None, bots=False, pattern=None, attachments=False):
+        self.author_id = author_id
+        self.bots = bots
+        self.pattern = pattern          # Compiled regex searched in the content
+        self.attachments = attachments  # Only messages with attachments
+    
+    def __call__(self, message):
+        if self.author_id is not None and message.author.id != self.author_id:
+            return False
+        if self.bots and not message.author.bot:
+            return False
+        if self.attachments and not message.attachments:
+            return False
+        if self.pattern is not None and not self.pattern.search(message.content):
+            return False
+        return True
+    
+    def describe(self):
+        """Return the active filters as a short text, or None."""
+        parts = []
+        if self.author_id is not None:
+            parts.append(f"from <@{self.author_id}>")
+        if self.bots:
+            parts.append("from bots")
+        if self.attachments:
+            parts.append("with attachments")
+        if self.pattern is not None:
+            parts.append(f"matching `{self.pattern.pattern}`")
+        return ", ".join(parts) or None
+
+
+class PurgeResult:
+    """Outcome of a streaming purge."""
+    
+    def __init__(self):
+        self.scanned = 0
+        self.bulk_deleted = 0
+        self.single_deleted = 0
+        self.elapsed = 0.0
+    
+    @property
+    def deleted(self):
+        return self.bulk_deleted + self.single_deleted
+
+
+class StreamingPurge:
+    """Deletes matching messages while walking a channel's history page by page.
+    
+    Messages younger than 14 days are bulk deleted 100 at a time, with the
+    next history page fetched while a chunk is being deleted; older ones
+    fall back to single deletes, which discord.py paces by their rate-limit
+    bucket. History is never loaded beyond what the walk has reached.
+    """
+    
+    def __init__(self, channel, check, limit, max_scan, before=None, after=None, extra=()):
+        self.channel = channel
+        self.check = check
+        self.limit = limit        # Matching messages to delete
+        self.max_scan = max_scan  # Messages to look at before giving up
+        self.before = before      # Only messages older than this (a datetime or snowflake)
+        self.after = after        # Only messages newer than this datetime
+        self.extra = list(extra)  # Deleted along with the first chunk but not counted, e.g. the command message
+    
+    async def _bulk_delete(self, messages, result):
+        counted = [message for message in messages if message not in self.extra]
+        try:
+            await self.channel.delete_messages(messages)
+        except discord.NotFound:
+            # Someone deleted part of the chunk first; retry the rest one by one
+            for message in counted:
+                await self._single_delete(message, result)
+            return
+        result.bulk_deleted += len(counted)
+    
+    async def _single_delete(self, message, result):
+        try:
+            await message.delete()
+        except discord.NotFound:
+            return
+        result.single_deleted += 1
+    
+    async def run(self, progress=None):
+        """Purge, calling ``progress(deleted, limit)`` as chunks finish. Raises discord.Forbidden."""
+        result = PurgeResult()
+        start = time.perf_counter()
+        bulk_cutoff = discord.utils.utcnow() - BULK_DELETE_MAX_AGE
+        chunk = list(self.extra)
+        matched = 0
+        deleting = None  # Bulk delete running while the walk continues
+        
+        async def flush():
+            nonlocal chunk, deleting
+            if deleting is not None:
+                await deleting
+            if chunk:
+                deleting = asyncio.create_task(self._bulk_delete(chunk, result))
+                chunk = []
+            else:
+                deleting = None
+        
+        try:
+            # after= is checked here: history() keeps paging past it when walking newest first
+            async for message in self.channel.history(limit=self.max_scan, before=self.before):
+                if self.after is not None and message.created_at <= self.after:
+                    break
+                result.scanned += 1
+                matches = self.check(message)
+                # Give other events a turn between messages; a filter regex may take a while on long ones
+                await asyncio.sleep(0)
+                if not matches:
+                    continue
+                matched += 1
+                
+                if message.created_at > bulk_cutoff:
+                    chunk.append(message)
+                    if len(chunk) >= BULK_DELETE_CHUNK:
+                        await flush()
+                        if progress is not None:
+                            await progress(result.deleted, self.limit)
+                else:
+                    # History runs newest first, so every message from here on is too old
+                    await flush()
+                    await self._single_delete(message, result)
+                    if progress is not None and result.single_deleted % 10 == 0:
+                        await progress(result.deleted, self.limit)
+                
+                if matched >= self.limit:
+                    break
+            
+            await flush()
+            if deleting is not None:
+                await deleting
+        finally:
+            if deleting is not None and not deleting.done():
+                deleting.cancel()
+        
+        result.elapsed = time.perf_counter() - start
+        return result
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import sys
+
+from discord.ext import commands
+
+logger = logging.getLogger(__name__)
+
+
+class ExtensionReloader:
+    """Reloads extensions in place without reconnecting to the gateway.
+    
+    Cogs name the attributes that hold their runtime state (caches, pending
+    tasks, schedulers) in a ``preserved_state`` tuple; after a reload those
+    objects are moved from the old cog instance to the new one. discord.py
+    restores the previous module when the new one fails to load, and the
+    restored cog is a fresh instance too, so state is migrated either way.
+    Migrated objects that call back into the cog are rebound in the new
+    cog's ``state_migrated()`` hook, which runs after the move.
+    """
+    
+    def __init__(self, bot, interval=2.0):
+        self.bot = bot
+        self.interval = interval
+        self._mtimes = {}  # extension -> source mtime when it was last (re)loaded
+        self._lock = asyncio.Lock()
+        self._task = None
+    
+    def _mtime(self, name):
+        path = getattr(sys.modules.get(name), '__file__', None)
+        try:
+            return os.stat(path).st_mtime_ns if path else None
+        except OSError:
+            return None
+    
+    def snapshot(self):
+        """Remember the source times of all loaded extensions."""
+        for name in self.bot.extensions:
+            self._mtimes[name] = self._mtime(name)
+    
+    def changed(self):
+        """Return loaded extensions whose source changed since they were loaded."""
+        return [name for name in self.bot.extensions if self._mtime(name) != self._mtimes.get(name)]
+    
+    def resolve(self, name):
+        """Accept ``fun`` as well as ``cogs.fun``."""
+        if name in self.bot.extensions:
+            return name
+        return next((loaded for loaded in self.bot.extensions if loaded.rpartition('.')[2] == name), name)
+    
+    async def reload(self, names):
+        """Reload extensions one by one. Returns ``{name: error or None}``."""
+        results = {}
+        async with self._lock:
+            for name in names:
+                results[name] = await self._reload(name)
+                if results[name] is None:
+                    logger.info(f"Reloaded extension: {name}")
+                else:
+                    logger.error(f"Failed to reload extension {name}: {results[name]}")
+            
+            # Hash-gated, so this only calls Discord when a command's signature changed
+            if any(error is None for error in results.values()):
+                await self.bot.sync_app_commands()
+        return results
+    
+    async def _reload(self, name):
+        if name not in self.bot.extensions:
+            return "not loaded"
+        
+        # Check the new source compiles before unloading anything
+        mtime = self._mtime(name)
+        path = sys.modules[name].__file__
+        try:
+            await asyncio.to_thread(self._compile, path)
+        except (OSError, SyntaxError, ValueError) as e:
+            self._mtimes[name] = mtime
+            return f"{type(e).__name__}: {e}"
+        
+        old_cogs = {cog.qualified_name: cog for cog in self.bot.cogs.values() if type(cog).__module__ == name}
+        try:
+            await self.bot.reload_extension(name)
+        except commands.ExtensionError as e:
+            return str(e.__cause__ or e)
+        finally:
+            self._mtimes[name] = mtime
+            for cog in self.bot.cogs.values():
+                if type(cog).__module__ != name:
+                    continue
+                old = old_cogs.get(cog.qualified_name)
+                if old is not None and old is not cog:
+                    self._migrate(old, cog)
+                # Replaces the old module's views for the same custom_ids
+                for view in getattr(cog, 'persistent_views', []):
+                    self.bot.add_view(view)
+        return None
+    
+    @staticmethod
+    def _compile(path):
+        with open(path, 'rb') as file:
+            compile(file.read(), path, 'exec')
+    
+    @staticmethod
+    def _migrate(old, new):
+        for attribute in getattr(new, 'preserved_state', ()):
+            if hasattr(old, attribute):
+                setattr(new, attribute, getattr(old, attribute))
+        hook = getattr(new, 'state_migrated', None)
+        if hook is not None:
+            hook()
+    
+    def start_watching(self):
+        """Reload extensions automatically when their source files change."""
+        self._task = asyncio.create_task(self._watch(), name='extension-watcher')
+    
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            changed = self.changed()
+            if changed:
+                await self.reload(changed)
@@ -0,0 +1,110 @@
+def role_custom_id(role_name):
+    """Return the button custom_id used for a role name."""
+    return f"role_{role_name.lower().replace(' ', '_')}"
+
+
+class RoleCache:
+    """Per-guild index of roles by name and by role button custom_id.
+
+    Each guild is indexed once on first lookup and then kept current through
+    the role create/update/delete events, so lookups no longer scan
+    ``guild.roles``. Like ``discord.utils.get``, the lowest role wins when
+    several roles share a name.
+    """
+    
+    def __init__(self):
+        self._by_name = {}       # guild_id -> {role name: Role}
+        self._by_custom_id = {}  # guild_id -> {custom_id: Role}
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+    
+    def _index(self, guild):
+        """Return the name index for a guild, building it if needed."""
+        by_name = self._by_name.get(guild.id)
+        if by_name is None:
+            by_name = {}
+            by_custom_id = {}
+            for role in guild.roles:
+                by_name.setdefault(role.name, role)
+                by_custom_id.setdefault(role_custom_id(role.name), role)
+            self._by_name[guild.id] = by_name
+            self._by_custom_id[guild.id] = by_custom_id
+            self.builds += 1
+        return by_name
+    
+    def _count(self, role):
+        if role is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return role
+    
+    def get(self, guild, name):
+        """Get a role by name."""
+        return self._count(self._index(guild).get(name))
+    
+    def get_by_custom_id(self, guild, custom_id):
+        """Get a role by the custom_id of its selection button."""
+        self._index(guild)
+        return self._count(self._by_custom_id[guild.id].get(custom_id))
+    
+    def add(self, role):
+        """Index a newly created role."""
+        guild_id = role.guild.id
+        if guild_id not in self._by_name:
+            return  # Guild not indexed yet, it will be built on first lookup
+        self._insert(role.guild, role.name)
+    
+    def remove(self, role, name=None):
+        """Drop a deleted (or renamed) role from the index."""
+        guild_id = role.guild.id
+        if guild_id not in self._by_name:
+            return
+        name = name if name is not None else role.name
+        if self._by_name[guild_id].get(name) is role:
+            del self._by_name[guild_id][name]
+        custom_id = role_custom_id(name)
+        if self._by_custom_id[guild_id].get(custom_id) is role:
+            del self._by_custom_id[guild_id][custom_id]
+        # Another role may share the old name, let it take over the slot
+        self._insert(role.guild, name, exclude=role)
+    
+    def update(self, before, after):
+        """Re-index a role whose name or position changed."""
+        if after.guild.id not in self._by_name:
+            return
+        self.remove(after, name=before.name)
+        self._insert(after.guild, after.name)
+    
+    def drop_guild(self, guild_id):
+        """Forget a guild entirely (e.g. when the bot leaves it)."""
+        self._by_name.pop(guild_id, None)
+        self._by_custom_id.pop(guild_id, None)
+    
+    def _insert(self, guild, name, exclude=None):
+        """Point the index slots for ``name`` at the lowest matching role."""
+        custom_id = role_custom_id(name)
+        by_name = self._by_name[guild.id]
+        by_custom_id = self._by_custom_id[guild.id]
+        by_name.pop(name, None)
+        by_custom_id.pop(custom_id, None)
+        for role in guild.roles:
+            if role is exclude:
+                continue
+            if role.name == name and name not in by_name:
+                by_name[name] = role
+            if role_custom_id(role.name) == custom_id and custom_id not in by_custom_id:
+                by_custom_id[custom_id] = role
+    
+    def stats(self):
+        """Return cache counters and size."""
+        lookups = self.hits + self.misses
+        return {
+            'guilds': len(self._by_name),
+            'roles': sum(len(roles) for roles in self._by_name.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'builds': self.builds
+        }
@@ -0,0 +1,135 @@
+import asyncio
+import logging
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Interactions must be answered within 3 seconds; defer once this is at risk
+ACK_DEADLINE = 2.5
+
+
+class PendingToggles:
+    """Role toggles of one member waiting to be applied."""
+    
+    __slots__ = ('member', 'interaction', 'started', 'seen', 'toggles')
+    
+    def __init__(self, member, started):
+        self.member = member
+        self.interaction = None
+        self.started = started  # Loop time of the first click
+        self.seen = started     # Loop time of the latest click
+        self.toggles = []   # (role, roles it excludes) in click order
+
+
+class RoleToggleBuffer:
+    """Coalesces a member's role toggles within ``window`` seconds into one edit.
+    
+    Clicks flip the state left by earlier clicks instead of the cached
+    member roles, so double clicks cancel out without any request. Earlier
+    interactions of a window are acknowledged as soon as a newer click
+    arrives; the latest one receives the report through ``report(interaction,
+    added, removed, error)``. Edits of one member never overlap. Once a
+    window is flushed, ``observe(seconds)`` receives the time from its first
+    click until the edit finished.
+    """
+    
+    def __init__(self, window, report, observe=None):
+        self.window = window
+        self.report = report
+        self.observe = observe
+        self._pending = {}  # (guild_id, member_id) -> PendingToggles
+        self._tasks = {}    # (guild_id, member_id) -> latest flush task
+        self._latest = {}   # (guild_id, member_id) -> member returned by the last edit, while flushes are queued
+    
+    async def toggle(self, interaction, role, excludes=()):
+        """Queue a toggle of ``role``; turning it on also removes the ``excludes`` roles."""
+        member = interaction.user
+        key = (member.guild.id, member.id)
+        loop = asyncio.get_running_loop()
+        
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = PendingToggles(member, loop.time())
+            task = asyncio.create_task(self._flush_later(key, self._tasks.get(key)), name=f"role-toggles-{member.id}")
+            task.add_done_callback(lambda task: self._forget(key, task))
+            self._tasks[key] = task
+        
+        superseded = pending.interaction
+        pending.member = member  # Latest payload, freshest roles
+        pending.interaction = interaction
+        pending.seen = loop.time()
+        pending.toggles.append((role, tuple(excludes)))
+        
+        if superseded is not None:
+            try:
+                await superseded.response.defer()
+            except discord.HTTPException as e:
+                logger.debug(f"Failed to acknowledge role toggle: {e}")
+    
+    def _forget(self, key, task):
+        if self._tasks.get(key) is task:
+            # No flush is queued behind this one, so the next click carries fresh roles
+            del self._tasks[key]
+            self._latest.pop(key, None)
+    
+    async def _flush_later(self, key, previous):
+        await asyncio.sleep(self.window)
+        pending = self._pending.pop(key)
+        loop = asyncio.get_running_loop()
+        
+        work = asyncio.ensure_future(self._apply_logged(key, pending, previous))
+        try:
+            remaining = ACK_DEADLINE - (loop.time() - pending.seen)
+            done, _ = await asyncio.wait({work}, timeout=max(0.0, remaining))
+            if not done:
+                await pending.interaction.response.defer()
+            added, removed, error = await work
+            await self.report(pending.interaction, added, removed, error)
+        except discord.HTTPException as e:
+            logger.warning(f"Failed to answer role toggles of member {key[1]}: {e}")
+        except Exception:
+            logger.exception(f"Failed to answer role toggles of member {key[1]}")
+        finally:
+            # The edit still completes if only the acknowledgement failed
+            await asyncio.wait({work})
+            if self.observe is not None:
+                self.observe(loop.time() - pending.started)
+    
+    async def _apply_logged(self, key, pending, previous):
+        try:
+            return await self._apply(key, pending, previous)
+        except discord.HTTPException as e:
+            return [], [], e
+        except Exception as e:
+            logger.exception(f"Failed to apply role toggles of member {key[1]}")
+            return [], [], e
+    
+    async def _apply(self, key, pending, previous):
+        member = pending.member
+        if previous is not None:
+            # Start from the roles the previous edit of this member left
+            await asyncio.wait({previous})
+            member = self._latest.get(key, member)
+        
+        current = set(member.roles)
+        roles = set(current)
+        for role, excludes in pending.toggles:
+            if role in roles:
+                roles.discard(role)
+            else:
+                roles.add(role)
+                roles.difference_update(excludes)
+        
+        added = list(roles - current)
+        removed = list(current - roles)
+        if not added and not removed:
+            return added, removed, None
+        
+        updated = await member.edit(
+            roles=[role for role in roles if not role.is_default()],
+            reason=f"Role toggle via bot by {member.display_name}"
+        )
+        if updated is not None:
+            self._latest[key] = updated
+        return added, removed, None
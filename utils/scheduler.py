@@ -0,0 +1,168 @@
+import asyncio
+import heapq
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Retries of a failed timer wait RETRY_DELAY seconds, doubling up to RETRY_MAX_DELAY
+RETRY_DELAY = 60
+RETRY_MAX_DELAY = 3600
+
+# Attempts after which a failing timer is dropped
+MAX_ATTEMPTS = 30
+
+
+class Timer:
+    """A pending timed event, e.g. a mute expiry."""
+    
+    __slots__ = ('id', 'event', 'guild_id', 'user_id', 'channel_id', 'expires', 'data')
+    
+    def __init__(self, id, event, guild_id, user_id, channel_id, expires, data=None):
+        self.id = id
+        self.event = event
+        self.guild_id = guild_id
+        self.user_id = user_id
+        self.channel_id = channel_id
+        self.expires = expires
+        self.data = data or {}
+    
+    @property
+    def key(self):
+        return (self.event, self.guild_id, self.user_id)
+
+
+class TimerScheduler:
+    """Fires persisted timers from a single background task.
+    
+    Pending timers live in a SQLite table and in an in-memory heap ordered by
+    expiry. One task sleeps until the earliest expiry and then dispatches
+    ``on_<event>_timer_complete(timer)`` on the bot, so cogs handle expiries
+    with an ordinary listener. Timers survive restarts: they are reloaded on
+    start and overdue ones fire as soon as the bot is ready.
+    
+    A fired timer stays in the database until its handler calls
+    ``complete(timer)``, or ``retry(timer)`` to fire it again after a backoff,
+    so an expiry whose handler failed or never ran fires again.
+    """
+    
+    def __init__(self, bot, db):
+        self.bot = bot
+        self.db = db
+        self._heap = []      # (expires, timer id)
+        self._timers = {}    # timer id -> Timer
+        self._by_key = {}    # (event, guild_id, user_id) -> timer id
+        self._wakeup = asyncio.Event()
+        self._task = None
+    
+    def _track(self, timer):
+        self._timers[timer.id] = timer
+        self._by_key[timer.key] = timer.id
+        heapq.heappush(self._heap, (timer.expires, timer.id))
+    
+    def _untrack(self, timer_id):
+        timer = self._timers.pop(timer_id, None)
+        if timer is not None and self._by_key.get(timer.key) == timer_id:
+            del self._by_key[timer.key]
+        return timer
+    
+    async def _delete(self, timer_ids):
+        await self.db.executemany('DELETE FROM timers WHERE id = ?', [(timer_id,) for timer_id in timer_ids])
+    
+    async def start(self):
+        """Load pending timers and start the background task."""
+        await self.db.execute(
+            'CREATE TABLE IF NOT EXISTS timers ('
+            'id INTEGER PRIMARY KEY AUTOINCREMENT, event TEXT NOT NULL, guild_id INTEGER, '
+            'user_id INTEGER, channel_id INTEGER, expires REAL NOT NULL, data TEXT)'
+        )
+        rows = await self.db.fetchall('SELECT id, event, guild_id, user_id, channel_id, expires, data FROM timers')
+        timers = [Timer(*row[:6], json.loads(row[6]) if row[6] else None) for row in rows]
+        # Several cluster processes may share the database, only take our guilds
+        timers = [timer for timer in timers if self.bot.owns_guild(timer.guild_id)]
+        for timer in timers:
+            self._track(timer)
+        logger.info(f"Loaded {len(timers)} pending timers")
+        self._task = asyncio.create_task(self._run(), name='timer-scheduler')
+    
+    async def close(self):
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    async def schedule(self, event, expires, guild_id, user_id, channel_id=None, **data):
+        """Schedule (or replace) the timer for ``event`` on a guild member."""
+        await self.cancel(event, guild_id, user_id)
+        timer = Timer(None, event, guild_id, user_id, channel_id, expires, data)
+        timer.id = await self.db.execute(
+            'INSERT INTO timers (event, guild_id, user_id, channel_id, expires, data) VALUES (?, ?, ?, ?, ?, ?)',
+            (timer.event, timer.guild_id, timer.user_id, timer.channel_id, timer.expires, json.dumps(timer.data))
+        )
+        self._track(timer)
+        
+        # Wake the task if this timer is now the earliest one
+        if self._heap[0][1] == timer.id:
+            self._wakeup.set()
+        return timer
+    
+    async def cancel(self, event, guild_id, user_id):
+        """Cancel a pending timer. Returns the cancelled Timer or None."""
+        timer_id = self._by_key.get((event, guild_id, user_id))
+        if timer_id is None:
+            return None
+        # The heap entry is skipped lazily once it comes up
+        timer = self._untrack(timer_id)
+        await self._delete([timer_id])
+        return timer
+    
+    async def complete(self, timer):
+        """Remove a fired timer whose handler succeeded (or has nothing left to do)."""
+        await self._delete([timer.id])
+    
+    async def retry(self, timer):
+        """Fire a timer again later with exponential backoff. Returns False once it gives up."""
+        attempts = timer.data.get('attempts', 0) + 1
+        if attempts >= MAX_ATTEMPTS or timer.key in self._by_key:
+            # Out of attempts, or superseded by a timer scheduled since it fired
+            await self._delete([timer.id])
+            return False
+        
+        timer.data['attempts'] = attempts
+        timer.expires = time.time() + min(RETRY_MAX_DELAY, RETRY_DELAY * 2 ** (attempts - 1))
+        await self.db.execute(
+            'UPDATE timers SET expires = ?, data = ? WHERE id = ?',
+            (timer.expires, json.dumps(timer.data), timer.id)
+        )
+        self._track(timer)
+        if self._heap[0][1] == timer.id:
+            self._wakeup.set()
+        return True
+    
+    def get(self, event, guild_id, user_id):
+        """Return the pending timer for a guild member, if any."""
+        timer_id = self._by_key.get((event, guild_id, user_id))
+        return self._timers.get(timer_id)
+    
+    def __len__(self):
+        return len(self._timers)
+    
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._wakeup.clear()
+            now = time.time()
+            
+            # Rows are removed by the handlers, so this loop never waits on the database
+            while self._heap and self._heap[0][0] <= now:
+                _, timer_id = heapq.heappop(self._heap)
+                timer = self._untrack(timer_id)
+                if timer is not None:
+                    self.bot.dispatch(f'{timer.event}_timer_complete', timer)
+            
+            delay = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
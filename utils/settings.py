@@ -0,0 +1,40 @@
+import json
+
+
+class GuildSettings:
+    """Per-guild settings persisted in SQLite and served from memory.
+    
+    All rows are loaded once at startup, so reads never touch the database;
+    writes update memory immediately and are persisted in the background
+    worker thread.
+    """
+    
+    def __init__(self, db):
+        self.db = db
+        self._settings = {}  # guild_id -> {key: value}
+    
+    async def load(self):
+        """Create the table and load every stored setting."""
+        await self.db.execute(
+            'CREATE TABLE IF NOT EXISTS guild_settings ('
+            'guild_id INTEGER NOT NULL, key TEXT NOT NULL, value TEXT, PRIMARY KEY (guild_id, key))'
+        )
+        for guild_id, key, value in await self.db.fetchall('SELECT guild_id, key, value FROM guild_settings'):
+            self._settings.setdefault(guild_id, {})[key] = json.loads(value)
+    
+    def get(self, guild_id, key, default=None):
+        """Return a setting of a guild."""
+        return self._settings.get(guild_id, {}).get(key, default)
+    
+    async def set(self, guild_id, key, value):
+        """Store a setting of a guild."""
+        self._settings.setdefault(guild_id, {})[key] = value
+        await self.db.execute(
+            'INSERT OR REPLACE INTO guild_settings (guild_id, key, value) VALUES (?, ?, ?)',
+            (guild_id, key, json.dumps(value))
+        )
+    
+    async def delete(self, guild_id, key):
+        """Remove a setting of a guild."""
+        self._settings.get(guild_id, {}).pop(key, None)
+        await self.db.execute('DELETE FROM guild_settings WHERE guild_id = ? AND key = ?', (guild_id, key))
@@ -0,0 +1,91 @@
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """Startup timings: extension load times, setup_hook and time to READY.
+    
+    Times are measured from ``started``, a ``time.perf_counter()`` reading
+    taken when the bot module is first imported.
+    """
+    
+    def __init__(self, started):
+        self.started = started
+        self.extensions = {}  # extension -> seconds spent importing it and running setup()
+        self.setup_hook = None
+        self.ready = None     # Seconds from start to the first on_ready
+    
+    def mark_ready(self):
+        """Record the time to READY. Returns False if it was already recorded."""
+        if self.ready is not None:
+            return False
+        self.ready = time.perf_counter() - self.started
+        return True
+    
+    def lines(self):
+        """Return the report as short lines for logs and embeds."""
+        lines = []
+        if self.ready is not None:
+            lines.append(f"Ready in {self.ready:.2f}s")
+        if self.setup_hook is not None:
+            lines.append(f"setup_hook {self.setup_hook * 1000:.0f}ms")
+        if self.extensions:
+            slowest = sorted(self.extensions.items(), key=lambda item: item[1], reverse=True)
+            lines.append(", ".join(f"{name.rpartition('.')[2]} {seconds * 1000:.0f}ms" for name, seconds in slowest))
+        return lines
+
+
+def load_order(extensions):
+    """Group extensions into waves where each wave only depends on earlier ones.
+    
+    ``extensions`` maps an extension name to the names it needs loaded
+    first. Returns ``(waves, unresolved)``; unresolved extensions have an
+    unknown dependency or are part of a cycle.
+    """
+    remaining = {name: set(dependencies) for name, dependencies in extensions.items()}
+    waves = []
+    placed = set()
+    while True:
+        wave = [name for name, dependencies in remaining.items() if dependencies <= placed]
+        if not wave:
+            break
+        for name in wave:
+            del remaining[name]
+        placed.update(wave)
+        waves.append(wave)
+    return waves, sorted(remaining)
+
+
+async def load_extensions(bot, extensions, report):
+    """Load extensions in dependency order, each wave concurrently.
+    
+    Extensions whose dependencies failed to load are skipped. Load times are
+    recorded in ``report``.
+    """
+    waves, unresolved = load_order(extensions)
+    for name in unresolved:
+        logger.error(f"Skipping extension {name}: unknown or circular dependencies {sorted(extensions[name])}")
+    
+    failed = set(unresolved)
+    
+    async def load(name):
+        missing = failed.intersection(extensions[name])
+        if missing:
+            logger.error(f"Skipping extension {name}: {', '.join(sorted(missing))} failed to load")
+            failed.add(name)
+            return
+        start = time.perf_counter()
+        try:
+            await bot.load_extension(name)
+        except Exception as e:
+            logger.error(f"Failed to load extension {name}: {e}")
+            failed.add(name)
+            return
+        report.extensions[name] = time.perf_counter() - start
+        logger.info(f"Loaded extension: {name} ({report.extensions[name] * 1000:.0f}ms)")
+    
+    for wave in waves:
+        await asyncio.gather(*(load(name) for name in wave))
@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class StatsSample:
+    """System and bot health at one point in time."""
+    
+    __slots__ = ('time', 'cpu', 'system_cpu', 'rss', 'memory_percent', 'loop_lag', 'latency')
+    
+    def __init__(self, time, cpu, system_cpu, rss, memory_percent, loop_lag, latency):
+        self.time = time
+        self.cpu = cpu                        # Process CPU % since the previous sample
+        self.system_cpu = system_cpu          # System-wide CPU % since the previous sample
+        self.rss = rss                        # Bytes
+        self.memory_percent = memory_percent  # System memory in use
+        self.loop_lag = loop_lag              # Seconds the sampler woke up late
+        self.latency = latency                # Average gateway heartbeat latency, NaN before connecting
+
+
+class SystemStatsSampler:
+    """Samples CPU, memory, event loop lag and gateway latency in the background.
+    
+    Samples are taken every ``interval`` seconds into a ring buffer covering
+    ``history`` seconds. psutil reads /proc, so it is imported and run on a
+    worker thread; commands only read the cached samples.
+    """
+    
+    FIELDS = ('cpu', 'system_cpu', 'rss', 'memory_percent', 'loop_lag', 'latency')
+    
+    def __init__(self, bot, interval=10, history=3600):
+        self.bot = bot
+        self.interval = interval
+        self.samples = deque(maxlen=max(1, int(history // interval)))
+        self._psutil = None
+        self._process = None
+        self._task = None
+    
+    @property
+    def latest(self):
+        """The most recent sample, or None before the first one."""
+        return self.samples[-1] if self.samples else None
+    
+    def start(self):
+        """Start sampling."""
+        self._task = asyncio.create_task(self._run(), name='system-stats')
+    
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    def _prime(self):
+        # Imported here so startup doesn't wait for psutil
+        import psutil
+        
+        self._psutil = psutil
+        self._process = psutil.Process()
+        # The first cpu_percent calls only set the baseline
+        self._process.cpu_percent(None)
+        psutil.cpu_percent(None)
+    
+    def _read_system(self):
+        return (
+            self._process.cpu_percent(None),
+            self._psutil.cpu_percent(None),
+            self._process.memory_info().rss,
+            self._psutil.virtual_memory().percent
+        )
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.to_thread(self._prime)
+        except Exception as e:
+            logger.error(f"System stats disabled, psutil failed: {e}")
+            return
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            loop_lag = max(0.0, loop.time() - expected)
+            try:
+                cpu, system_cpu, rss, memory_percent = await asyncio.to_thread(self._read_system)
+            except Exception as e:
+                logger.warning(f"Failed to read system stats: {e}")
+                continue
+            self.samples.append(StatsSample(
+                time.time(), cpu, system_cpu, rss, memory_percent, loop_lag, self.bot.latency
+            ))
+    
+    def summary(self, seconds=3600):
+        """Return ``{field: (min, avg, max)}`` over the last ``seconds``, skipping missing values."""
+        since = time.time() - seconds
+        values = {field: [] for field in self.FIELDS}
+        for sample in self.samples:
+            if sample.time < since:
+                continue
+            for field in self.FIELDS:
+                value = getattr(sample, field)
+                if not math.isnan(value) and not math.isinf(value):
+                    values[field].append(value)
+        return {
+            field: (min(items), sum(items) / len(items), max(items))
+            for field, items in values.items() if items
+        }